@@ -0,0 +1,41 @@
+"""
+Strong ETags for orders and order listings, keyed on updated_at.
+
+An order's ETag changes whenever a write stamps a new updated_at, so it can
+be checked against a single indexed column instead of the whole order. A
+listing's ETag covers the (id, updated_at) of every order on the page and
+whether another page follows, which is everything its body and
+X-Next-Cursor header are made of.
+"""
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional
+
+from fastapi import Response, status
+
+from app.domain.entities.order import OrderCursor
+
+
+def order_etag(order_id: int, updated_at: datetime) -> str:
+    return f'"{order_id}-{updated_at:%Y%m%d%H%M%S%f}"'
+
+
+def page_etag(orders: Iterable, next_cursor: Optional[OrderCursor]) -> str:
+    # Accepts OrderDb or OrderSummary entities loaded with updated_at
+    digest = hashlib.blake2b(digest_size=16)
+    for order in orders:
+        digest.update(f"{order.id}-{order.updated_at:%Y%m%d%H%M%S%f};".encode())
+    digest.update(b"more" if next_cursor is not None else b"last")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses the weak comparison: W/ prefixes are ignored
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
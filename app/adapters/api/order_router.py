@@ -1,52 +1,332 @@
+import asyncio
+import inspect
+from collections import Counter
+from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import httpx
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.adapters.http.service_client import ServiceClient
-from app.adapters.models.sql.session import get_db
-from app.adapters.repositories import RepositoryType, get_order_repository, get_order_item_repository
+from app.adapters.api.etags import etag_matches, not_modified, order_etag, page_etag
+from app.adapters.api.serialization import order_response, order_summaries_response, orders_response
+from app.adapters.http.service_client import (
+    ServiceClient, customer_cache, downstreams, get_http_client, product_cache
+)
+from app.adapters.models.sql.session import get_async_db, get_db
+from app.adapters.outbox.worker import wake_outbox_worker
+from app.adapters.repositories import (
+    RepositoryType,
+    get_async_order_item_repository,
+    get_async_order_repository,
+    get_async_outbox_repository,
+    get_async_unit_of_work,
+    get_order_item_repository,
+    get_order_repository,
+    get_outbox_repository,
+    get_unit_of_work,
+)
+from app.application.use_cases.async_order_use_cases import AsyncOrderUseCases
 from app.application.use_cases.order_use_cases import OrderUseCases
-from app.domain.entities.order import Order, OrderDb, OrderStatus, PaymentStatus
+from app.config import settings
+from app.domain.entities.order import (
+    ORDER_SUMMARY_FIELDS,
+    AnalyticsGroup,
+    AnalyticsInterval,
+    InvalidTransitionError,
+    Order,
+    OrderAnalyticsBucket,
+    OrderBatchResult,
+    OrderCursor,
+    OrderDb,
+    OrderPage,
+    OrderStats,
+    OrderStatus,
+    OrderStatusUpdate,
+    OrderStatusUpdateResult,
+    OrderSummary,
+    OrderSummaryPage,
+    PaymentStatus,
+)
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Listing projection: only these fields are read and returned (id always is)
+FIELDS_QUERY = Query(None, description=f"Comma-separated subset of {', '.join(sorted(ORDER_SUMMARY_FIELDS))}")
+INCLUDE_ITEMS_QUERY = Query(True, description="false skips loading the items of the listed orders")
+# Listings are documented as OrderSummary: fields left out by fields= or include_items=false
+# are omitted from the body, not sent as null
+LISTING_DESCRIPTION = "Orders, with only the selected fields under fields= and without items under include_items=false"
+
+# What a page's ETag is computed from
+PAGE_VERSION_FIELDS = frozenset({"updated_at"})
+
+AnyOrderUseCases = Union[OrderUseCases, AsyncOrderUseCases]
+
+
 # Helper function to get order use cases with SQL repositories
-def get_order_use_cases(db: Session = Depends(get_db)) -> OrderUseCases:
+def get_sync_order_use_cases(db: Session = Depends(get_db)) -> OrderUseCases:
     order_repository = get_order_repository(RepositoryType.SQL, db)
     order_item_repository = get_order_item_repository(RepositoryType.SQL, db)
-    return OrderUseCases(order_repository, order_item_repository)
+    unit_of_work = get_unit_of_work(RepositoryType.SQL, db)
+    outbox_repository = get_outbox_repository(RepositoryType.SQL, db) if settings.OUTBOX_ENABLED else None
+    return OrderUseCases(order_repository, order_item_repository, unit_of_work, outbox_repository)
+
+
+# Helper function to get order use cases with async SQL repositories
+def get_async_order_use_cases(db: AsyncSession = Depends(get_async_db)) -> AsyncOrderUseCases:
+    order_repository = get_async_order_repository(RepositoryType.SQL, db)
+    order_item_repository = get_async_order_item_repository(RepositoryType.SQL, db)
+    unit_of_work = get_async_unit_of_work(RepositoryType.SQL, db)
+    outbox_repository = get_async_outbox_repository(RepositoryType.SQL, db) if settings.OUTBOX_ENABLED else None
+    return AsyncOrderUseCases(order_repository, order_item_repository, unit_of_work, outbox_repository)
+
+
+# Chosen once by configuration; this is the dependency to override in tests
+get_order_use_cases = get_async_order_use_cases if settings.SQL_ASYNC else get_sync_order_use_cases
+
 
+async def _run(method: Callable[..., Any], *args: Any) -> Any:
+    # Async use cases are awaited on the event loop; sync ones run in the threadpool
+    # so a blocking database call never stalls other requests
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await run_in_threadpool(method, *args)
 
-@router.get("/", response_model=List[OrderDb])
-def get_all_orders(use_cases: OrderUseCases = Depends(get_order_use_cases)):
-    return use_cases.get_all_orders()
+
+# Helper function to get a service client on the shared application HTTP client
+def get_service_client(http_client: httpx.AsyncClient = Depends(get_http_client)) -> ServiceClient:
+    return ServiceClient(
+        http_client,
+        product_cache=product_cache,
+        customer_cache=customer_cache,
+        downstreams=downstreams
+    )
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[OrderCursor]:
+    if cursor is None:
+        return None
+    try:
+        return OrderCursor.decode(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {cursor}"
+        )
+
+
+def _as_stored_time(value: datetime) -> datetime:
+    # Orders are stamped with naive UTC times; aware bounds are converted to match
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _batch_order_error(
+    order: Order,
+    customers: Dict[int, Dict[str, Any]],
+    products: Dict[int, Dict[str, Any]],
+    stock: Dict[int, int]
+) -> Optional[str]:
+    # Same checks and messages as a single POST /orders, against lookups shared by the batch
+    if order.customer_id and order.customer_id not in customers:
+        return f"Customer with ID {order.customer_id} not found"
+    
+    if not order.items:
+        return "Order must have at least one item"
+    
+    missing_ids = {item.product_id for item in order.items} - set(products.keys())
+    if missing_ids:
+        return f"Products with IDs {missing_ids} not found"
+    
+    quantities = Counter()
+    for item in order.items:
+        quantities[item.product_id] += item.quantity
+    for product_id, quantity in quantities.items():
+        if stock[product_id] < quantity:
+            return f"Not enough stock for product {products[product_id]['name']} (ID: {product_id})"
+    return None
+
+
+def _summary_fields(fields: Optional[str], include_items: bool) -> Optional[FrozenSet[str]]:
+    # None asks for complete orders; anything else is pushed down as a projection
+    if fields is None and include_items:
+        return None
+    if fields is None:
+        requested = ORDER_SUMMARY_FIELDS
+    else:
+        requested = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = requested - ORDER_SUMMARY_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return requested if include_items else requested - {"items"}
+
+
+def _page_response(page: Union[OrderPage, OrderSummaryPage], hidden: FrozenSet[str] = frozenset()) -> Response:
+    # The body stays a plain list; the position of the next page and its ETag travel in headers
+    headers = {"ETag": page_etag(page.items, page.next_cursor)}
+    if page.next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor.encode()
+    if isinstance(page, OrderSummaryPage):
+        return order_summaries_response(page.items, headers, hidden)
+    return orders_response(page.items, headers)
+
+
+async def _list_orders(
+    use_cases: AnyOrderUseCases,
+    if_none_match: Optional[str],
+    limit: int,
+    cursor: Optional[str],
+    fields: Optional[str],
+    include_items: bool,
+    status_name: Optional[OrderStatus] = None,
+    customer_id: Optional[int] = None
+) -> Response:
+    after = _decode_cursor(cursor)
+    projection = _summary_fields(fields, include_items)
+
+    # Conditional polls read the page's versions first; an unchanged page is answered without loading it
+    if if_none_match is not None:
+        versions = await _run(
+            use_cases.get_orders_summary_page, PAGE_VERSION_FIELDS, limit, after, status_name, customer_id
+        )
+        etag = page_etag(versions.items, versions.next_cursor)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    if projection is not None:
+        # updated_at always comes along for the ETag and is only returned when asked for
+        page = await _run(
+            use_cases.get_orders_summary_page, projection | PAGE_VERSION_FIELDS, limit, after, status_name, customer_id
+        )
+        return _page_response(page, PAGE_VERSION_FIELDS - projection)
+    if customer_id is not None:
+        page = await _run(use_cases.get_customer_orders_page, customer_id, limit, after)
+    else:
+        page = await _run(use_cases.get_orders_page, limit, after, status_name)
+    return _page_response(page)
+
+
+@router.get("/", response_model=List[OrderSummary], response_description=LISTING_DESCRIPTION)
+async def get_all_orders(
+    limit: int = Query(settings.ORDERS_PAGE_SIZE, ge=1, le=settings.ORDERS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    include_items: bool = INCLUDE_ITEMS_QUERY,
+    if_none_match: Optional[str] = Header(None),
+    use_cases: AnyOrderUseCases = Depends(get_order_use_cases)
+):
+    return await _list_orders(use_cases, if_none_match, limit, cursor, fields, include_items)
+
+
+@router.get("/analytics", response_model=List[OrderAnalyticsBucket])
+async def get_order_analytics(
+    start: datetime,
+    end: datetime,
+    interval: AnalyticsInterval = AnalyticsInterval.HOUR,
+    group_by: Optional[AnalyticsGroup] = None,
+    use_cases: AnyOrderUseCases = Depends(get_order_use_cases)
+):
+    """
+    Order count, revenue, average ticket and items per order for each interval
+    of [start, end), aggregated by the database so only the buckets are sent.
+    """
+    start, end = _as_stored_time(start), _as_stored_time(end)
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    if (end - start) / interval.length > settings.ORDERS_ANALYTICS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.ORDERS_ANALYTICS_MAX_BUCKETS} {interval.value} intervals per request"
+        )
+    return await _run(use_cases.get_order_analytics, start, end, interval, group_by)
+
+
+@router.get("/stats", response_model=OrderStats)
+async def get_order_stats(use_cases: AnyOrderUseCases = Depends(get_order_use_cases)):
+    """Number of orders in each status, read from counters instead of counting orders"""
+    return await _run(use_cases.get_order_stats)
+
+
+@router.post("/stats/rebuild", response_model=OrderStats)
+async def rebuild_order_stats(use_cases: AnyOrderUseCases = Depends(get_order_use_cases)):
+    """Recount the orders of each status, e.g. after writes made outside the service"""
+    return await _run(use_cases.rebuild_order_stats)
 
 
 @router.get("/{order_id}", response_model=OrderDb)
-def get_order(order_id: int, use_cases: OrderUseCases = Depends(get_order_use_cases)):
-    order = use_cases.get_order_by_id(order_id)
+async def get_order(
+    order_id: int,
+    if_none_match: Optional[str] = Header(None),
+    use_cases: AnyOrderUseCases = Depends(get_order_use_cases)
+):
+    """Polls repeating the returned ETag in If-None-Match get a 304 after reading only updated_at"""
+    if if_none_match is not None:
+        updated_at = await _run(use_cases.get_order_version, order_id)
+        if updated_at is not None:
+            etag = order_etag(order_id, updated_at)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    order = await _run(use_cases.get_order_by_id, order_id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Order with ID {order_id} not found"
         )
-    return order
+    return order_response(order, headers={"ETag": order_etag(order.id, order.updated_at)})
 
 
-@router.get("/status/{status_name}", response_model=List[OrderDb])
-def get_orders_by_status(
-    status_name: OrderStatus, use_cases: OrderUseCases = Depends(get_order_use_cases)
+@router.get(
+    "/status/{status_name}", response_model=List[OrderSummary], response_description=LISTING_DESCRIPTION
+)
+async def get_orders_by_status(
+    status_name: OrderStatus,
+    limit: int = Query(settings.ORDERS_PAGE_SIZE, ge=1, le=settings.ORDERS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    include_items: bool = INCLUDE_ITEMS_QUERY,
+    if_none_match: Optional[str] = Header(None),
+    use_cases: AnyOrderUseCases = Depends(get_order_use_cases)
 ):
-    return use_cases.get_orders_by_status(status_name)
+    return await _list_orders(use_cases, if_none_match, limit, cursor, fields, include_items, status_name)
+
+
+@router.get(
+    "/customer/{customer_id}", response_model=List[OrderSummary], response_description=LISTING_DESCRIPTION
+)
+async def get_customer_orders(
+    customer_id: int,
+    limit: int = Query(settings.ORDERS_PAGE_SIZE, ge=1, le=settings.ORDERS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    include_items: bool = INCLUDE_ITEMS_QUERY,
+    if_none_match: Optional[str] = Header(None),
+    use_cases: AnyOrderUseCases = Depends(get_order_use_cases)
+):
+    """A customer's order history, oldest first, one index range per page"""
+    return await _list_orders(
+        use_cases, if_none_match, limit, cursor, fields, include_items, customer_id=customer_id
+    )
 
 
 @router.post("/", response_model=OrderDb, status_code=status.HTTP_201_CREATED)
-async def create_order(order: Order, use_cases: OrderUseCases = Depends(get_order_use_cases)):
+async def create_order(
+    order: Order,
+    use_cases: AnyOrderUseCases = Depends(get_order_use_cases),
+    service_client: ServiceClient = Depends(get_service_client)
+):
     # Validate customer ID if provided
     if order.customer_id:
-        service_client = ServiceClient()
         customer = await service_client.get_customer(order.customer_id)
         if not customer:
             raise HTTPException(
@@ -61,9 +341,9 @@ async def create_order(order: Order, use_cases: OrderUseCases = Depends(get_orde
             detail="Order must have at least one item"
         )
     
-    service_client = ServiceClient()
     product_ids = [item.product_id for item in order.items]
-    products = await service_client.get_products(product_ids)
+    # Stock is checked below, so cached products must be recent
+    products = await service_client.get_products(product_ids, max_age=settings.PRODUCT_STOCK_MAX_AGE)
     
     if len(products) != len(product_ids):
         missing_ids = set(product_ids) - set(products.keys())
@@ -88,44 +368,134 @@ async def create_order(order: Order, use_cases: OrderUseCases = Depends(get_orde
     }
     
     # Create the order
-    created_order = use_cases.create_order(order, price_map)
+    created_order = await _run(use_cases.create_order, order, price_map)
+    
+    # Stock and payment updates were stored with the order; the outbox worker sends them
+    if use_cases.queues_side_effects:
+        wake_outbox_worker()
+        return order_response(created_order, status.HTTP_201_CREATED)
     
     # Update product quantities
-    for item in order.items:
-        await service_client.update_product_quantity(item.product_id, -item.quantity)
+    await service_client.update_product_quantities(
+        [(item.product_id, -item.quantity) for item in order.items]
+    )
     
     # Notify payment service
     if created_order.total > 0:
         await service_client.notify_payment_service(created_order.id, float(created_order.total))
     
-    return created_order
+    return order_response(created_order, status.HTTP_201_CREATED)
+
+
+@router.post("/batch", response_model=List[OrderBatchResult])
+async def create_orders_batch(
+    orders: List[Order] = Body(..., min_length=1, max_length=settings.ORDERS_BATCH_MAX_SIZE),
+    use_cases: AnyOrderUseCases = Depends(get_order_use_cases),
+    service_client: ServiceClient = Depends(get_service_client)
+):
+    """
+    Create several orders at once. Customers and products are looked up once for
+    the whole batch and the valid orders are inserted in bulk. Results follow the
+    request order, each holding the created order or the reason it was rejected.
+    """
+    customer_ids = [order.customer_id for order in orders if order.customer_id]
+    product_ids = [item.product_id for order in orders for item in order.items]
+    customers, products = await asyncio.gather(
+        service_client.get_customers(customer_ids),
+        service_client.get_products(product_ids, max_age=settings.PRODUCT_STOCK_MAX_AGE)
+    )
+    
+    # Stock still available to the orders validated after the current one
+    stock = {product_id: product["quantity"] for product_id, product in products.items()}
+    results = [OrderBatchResult() for _ in orders]
+    accepted: List[int] = []
+    for index, order in enumerate(orders):
+        error = _batch_order_error(order, customers, products, stock)
+        if error:
+            results[index].error = error
+            continue
+        for item in order.items:
+            stock[item.product_id] -= item.quantity
+        accepted.append(index)
+    
+    if not accepted:
+        return results
+    
+    price_map = {
+        product_id: Decimal(str(product["price"]))
+        for product_id, product in products.items()
+    }
+    created_orders = await _run(use_cases.create_orders, [orders[index] for index in accepted], price_map)
+    for index, created_order in zip(accepted, created_orders):
+        results[index].order = created_order
+    
+    if use_cases.queues_side_effects:
+        wake_outbox_worker()
+        return results
+    
+    # One stock update per product for the whole batch
+    quantity_changes = Counter()
+    for created_order in created_orders:
+        for item in created_order.items:
+            quantity_changes[item.product_id] -= item.quantity
+    await asyncio.gather(
+        service_client.update_product_quantities(list(quantity_changes.items())),
+        service_client.notify_payment_service_many([
+            (created_order.id, float(created_order.total))
+            for created_order in created_orders
+            if created_order.total > 0
+        ])
+    )
+    
+    return results
+
+
+@router.patch("/status/{status_name}", response_model=OrderStatusUpdateResult)
+async def update_orders_status(
+    status_name: OrderStatus,
+    update: OrderStatusUpdate,
+    use_cases: AnyOrderUseCases = Depends(get_order_use_cases)
+):
+    """
+    Move many orders to a status in one set-based write. With expected_status, only
+    orders currently in that status move; the others, and unknown ids, are rejected.
+    """
+    if len(update.order_ids) > settings.ORDERS_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.ORDERS_BATCH_MAX_SIZE} orders can be updated at once"
+        )
+    return await _run(use_cases.update_orders_status, update.order_ids, status_name, update.expected_status)
 
 
 @router.patch("/{order_id}/status/{status_name}", response_model=OrderDb)
-def update_order_status(
+async def update_order_status(
     order_id: int, 
     status_name: OrderStatus, 
-    use_cases: OrderUseCases = Depends(get_order_use_cases)
+    use_cases: AnyOrderUseCases = Depends(get_order_use_cases)
 ):
-    updated_order = use_cases.update_order_status(order_id, status_name)
+    updated_order = await _run(use_cases.update_order_status, order_id, status_name)
     if not updated_order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Order with ID {order_id} not found"
         )
-    return updated_order
+    return order_response(updated_order)
 
 
 @router.patch("/{order_id}/payment-status/{payment_status}", response_model=OrderDb)
-def update_payment_status(
+async def update_payment_status(
     order_id: int, 
     payment_status: PaymentStatus, 
-    use_cases: OrderUseCases = Depends(get_order_use_cases)
+    use_cases: AnyOrderUseCases = Depends(get_order_use_cases)
 ):
-    updated_order = use_cases.update_payment_status(order_id, payment_status)
+    try:
+        updated_order = await _run(use_cases.update_payment_status, order_id, payment_status)
+    except InvalidTransitionError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
     if not updated_order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Order with ID {order_id} not found"
         )
-    return updated_order 
\ No newline at end of file
+    return order_response(updated_order) 
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""
+Order payloads written straight to JSON bytes.
+
+Returning an OrderDb from an endpoint makes FastAPI validate it again
+against the response_model, turn it into plain Python objects and encode
+those with the json module. The repositories already hand out validated
+OrderDb entities, so the endpoints serialize them with pydantic-core in
+one pass and return the bytes; response_model is kept for the OpenAPI schema.
+"""
+from typing import AbstractSet, Dict, List, Optional
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+from app.domain.entities.order import OrderDb, OrderSummary
+
+# Built once: creating a TypeAdapter compiles its serializer
+ORDER_ADAPTER = TypeAdapter(OrderDb)
+ORDER_LIST_ADAPTER = TypeAdapter(List[OrderDb])
+ORDER_SUMMARY_LIST_ADAPTER = TypeAdapter(List[OrderSummary])
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def order_response(
+    order: OrderDb, status_code: int = status.HTTP_200_OK, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    body = ORDER_ADAPTER.dump_json(order)
+    return Response(body, status_code=status_code, headers=headers, media_type=JSON_MEDIA_TYPE)
+
+
+def orders_response(orders: List[OrderDb], headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(ORDER_LIST_ADAPTER.dump_json(orders), headers=headers, media_type=JSON_MEDIA_TYPE)
+
+
+def order_summaries_response(
+    orders: List[OrderSummary],
+    headers: Optional[Dict[str, str]] = None,
+    hidden: AbstractSet[str] = frozenset()
+) -> Response:
+    # Fields that were not loaded are left out rather than sent as null, as are
+    # `hidden` fields loaded for the service's own use
+    exclude = {"__all__": set(hidden)} if hidden else None
+    body = ORDER_SUMMARY_LIST_ADAPTER.dump_json(orders, exclude_unset=True, exclude=exclude)
+    return Response(body, headers=headers, media_type=JSON_MEDIA_TYPE)
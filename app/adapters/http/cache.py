@@ -0,0 +1,130 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: Optional[V]
+    stored_at: float
+    ttl: float
+
+
+class AsyncTTLCache(Generic[V]):
+    """
+    In-process cache for values loaded by coroutines.
+
+    Entries are evicted least-recently-used once `maxsize` is reached and are
+    fresh for `ttl` seconds. For `stale_ttl` seconds after that they are still
+    served while a background refresh runs. Concurrent misses for one key share
+    a single load. `None` results are cached for `negative_ttl` seconds (not at
+    all by default), and loader exceptions are never cached. A load running
+    when its key is invalidated does not store its result.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        negative_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry[V]]" = OrderedDict()
+        self._inflight: Dict[Hashable, "asyncio.Future[Optional[V]]"] = {}
+        # Bumped by invalidate() while a load of the key is in flight
+        self._generations: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Optional[V]]],
+        max_age: Optional[float] = None,
+    ) -> Optional[V]:
+        """
+        Return the cached value for key, loading it when missing or expired.
+        With max_age, entries older than max_age seconds are reloaded and
+        stale entries are never served.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.stored_at
+            fresh_for = entry.ttl if max_age is None else min(entry.ttl, max_age)
+            if age <= fresh_for:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if max_age is None and age <= entry.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._load(key, loader)
+                return entry.value
+        
+        self.misses += 1
+        return await asyncio.shield(self._load(key, loader))
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        # A load already running may have read the value from before the invalidation:
+        # it must not store it, and later callers must not wait for it
+        if self._inflight.pop(key, None) is not None:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    def _load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Optional[V]]]
+    ) -> "asyncio.Future[Optional[V]]":
+        # Single flight: every caller for this key waits on the same task
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._refresh(key, loader))
+            # Background refreshes may fail with nobody awaiting them
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._inflight[key] = future
+        return future
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Optional[V]]]) -> Optional[V]:
+        generation = self._generations.get(key, 0)
+        try:
+            value = await loader()
+            if self._generations.get(key, 0) == generation:
+                self._store(key, value)
+            return value
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+            if key not in self._inflight:
+                self._generations.pop(key, None)
+
+    def _store(self, key: Hashable, value: Optional[V]) -> None:
+        ttl = self.ttl if value is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        
+        self._entries[key] = _Entry(value=value, stored_at=self._clock(), ttl=ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
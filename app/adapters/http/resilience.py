@@ -0,0 +1,199 @@
+import asyncio
+import random
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+# Gateway-style statuses that usually clear up on their own and are worth retrying
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+
+class DownstreamError(Exception):
+    """A downstream service could not give a definitive answer"""
+
+
+class CircuitOpenError(DownstreamError):
+    """The circuit breaker of a downstream service is rejecting calls"""
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker: opens after `failure_threshold` consecutive
+    failures, rejects calls for `reset_timeout` seconds, then lets a single
+    probe through (half-open) whose outcome closes or re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Let another probe through after one ended without an outcome"""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "rejected": self.rejected,
+        }
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries to a fraction of the traffic: every call
+    deposits `ratio` tokens and every retry withdraws one, so a failing
+    dependency sees at most about (1 + ratio) times the original load.
+    """
+
+    def __init__(self, ratio: float, min_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max(min_tokens, 1.0)
+        self._tokens = self.max_tokens
+
+    def deposit(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tokens": round(self._tokens, 2)}
+
+
+class Downstream:
+    """Call policy for one downstream service: timeouts, circuit breaker and retries"""
+
+    def __init__(
+        self,
+        name: str,
+        timeout: httpx.Timeout,
+        breaker: Optional[CircuitBreaker] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        max_retries: int = 0,
+        backoff_base: float = 0.05,
+        backoff_max: float = 1.0,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.breaker = breaker
+        self.retry_budget = retry_budget
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    async def call(
+        self,
+        send: Callable[[httpx.Timeout], Awaitable[httpx.Response]],
+        idempotent: bool = False,
+    ) -> httpx.Response:
+        """
+        Send a request through the breaker. Only idempotent requests are retried,
+        on transport errors and RETRYABLE_STATUS_CODES, while the budget allows.
+        Raises DownstreamError when no response could be obtained.
+        """
+        if self.retry_budget is not None:
+            self.retry_budget.deposit()
+        
+        attempt = 0
+        while True:
+            if self.breaker is not None and not self.breaker.allow_request():
+                raise CircuitOpenError(f"Circuit for {self.name} service is open")
+            
+            error: Optional[httpx.RequestError] = None
+            response: Optional[httpx.Response] = None
+            try:
+                response = await send(self.timeout)
+            except httpx.RequestError as exc:
+                error = exc
+            except asyncio.CancelledError:
+                # Says nothing about the service (client gone, sibling failed, shutdown), but a
+                # half-open probe must not stay in flight and block every later call
+                if self.breaker is not None:
+                    self.breaker.release_probe()
+                raise
+            except Exception:
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                raise
+            
+            failed = error is not None or response.status_code >= 500
+            if self.breaker is not None:
+                if failed:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+            
+            retryable = error is not None or response.status_code in RETRYABLE_STATUS_CODES
+            if not (retryable and idempotent and self._may_retry(attempt)):
+                if error is not None:
+                    raise DownstreamError(f"{self.name} service unreachable: {error}") from error
+                return response
+            
+            attempt += 1
+            # Full jitter keeps retries from synchronising across requests
+            await asyncio.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.stats() if self.breaker is not None else None,
+            "retry_budget": self.retry_budget.stats() if self.retry_budget is not None else None,
+        }
+
+    def _may_retry(self, attempt: int) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return self.retry_budget is None or self.retry_budget.try_withdraw()
@@ -1,75 +1,280 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
 
 import httpx
 
+from app.adapters.http.cache import AsyncTTLCache
+from app.adapters.http.resilience import CircuitBreaker, Downstream, DownstreamError, RetryBudget
 from app.config import settings
 from app.domain.entities.order import Order, OrderItem
 
+T = TypeVar("T")
+
+CUSTOMERS = "customers"
+PRODUCTS = "products"
+PAYMENTS = "payments"
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+product_cache: AsyncTTLCache[Dict[str, Any]] = AsyncTTLCache(
+    maxsize=settings.PRODUCT_CACHE_MAX_SIZE,
+    ttl=settings.PRODUCT_CACHE_TTL,
+    stale_ttl=settings.PRODUCT_CACHE_STALE_TTL,
+)
+
+customer_cache: AsyncTTLCache[Dict[str, Any]] = AsyncTTLCache(
+    maxsize=settings.CUSTOMER_CACHE_MAX_SIZE,
+    ttl=settings.CUSTOMER_CACHE_TTL,
+    negative_ttl=settings.CUSTOMER_CACHE_NEGATIVE_TTL,
+)
+
+
+def _idempotency_headers(idempotency_key: Optional[str]) -> Optional[Dict[str, str]]:
+    # Lets the service recognise a resent request it has already applied
+    return {"Idempotency-Key": idempotency_key} if idempotency_key is not None else None
+
+
+def _downstream_timeouts() -> Dict[str, httpx.Timeout]:
+    return {
+        CUSTOMERS: httpx.Timeout(settings.CUSTOMERS_READ_TIMEOUT, connect=settings.CUSTOMERS_CONNECT_TIMEOUT),
+        PRODUCTS: httpx.Timeout(settings.PRODUCTS_READ_TIMEOUT, connect=settings.PRODUCTS_CONNECT_TIMEOUT),
+        PAYMENTS: httpx.Timeout(settings.PAYMENTS_READ_TIMEOUT, connect=settings.PAYMENTS_CONNECT_TIMEOUT),
+    }
+
+
+def create_downstreams() -> Dict[str, Downstream]:
+    """Call policies with a circuit breaker and retry budget per downstream service"""
+    return {
+        name: Downstream(
+            name,
+            timeout,
+            breaker=CircuitBreaker(
+                name, settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_TIMEOUT
+            ),
+            retry_budget=RetryBudget(settings.RETRY_BUDGET_RATIO, settings.RETRY_BUDGET_MIN_TOKENS),
+            max_retries=settings.RETRY_MAX_ATTEMPTS,
+            backoff_base=settings.RETRY_BACKOFF_BASE,
+            backoff_max=settings.RETRY_BACKOFF_MAX,
+        )
+        for name, timeout in _downstream_timeouts().items()
+    }
+
+
+# Shared so breaker state and retry budgets span every request of the process
+downstreams = create_downstreams()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=settings.HTTP2_ENABLED,
+    )
+
+
+async def start_http_client() -> None:
+    """Create the application-scoped HTTP client; called on startup"""
+    global _http_client
+    if _http_client is None:
+        _http_client = create_http_client()
+
+
+async def close_http_client() -> None:
+    """Close the application-scoped HTTP client and its pooled connections; called on shutdown"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    # Created lazily when used outside the application lifespan (scripts, tests)
+    global _http_client
+    if _http_client is None:
+        _http_client = create_http_client()
+    return _http_client
+
 
 class ServiceClient:
-    def __init__(self):
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        product_cache: Optional[AsyncTTLCache[Dict[str, Any]]] = None,
+        customer_cache: Optional[AsyncTTLCache[Dict[str, Any]]] = None,
+        downstreams: Optional[Dict[str, Downstream]] = None
+    ):
+        self.client = client or get_http_client()
+        self.product_cache = product_cache
+        self.customer_cache = customer_cache
+        # Without shared policies, calls only get the per-service timeouts
+        self.downstreams = downstreams or {
+            name: Downstream(name, timeout) for name, timeout in _downstream_timeouts().items()
+        }
         self.customers_url = settings.CUSTOMERS_SERVICE_URL
         self.products_url = settings.PRODUCTS_SERVICE_URL
         self.payments_url = settings.PAYMENTS_SERVICE_URL
     
     async def get_customer(self, customer_id: int) -> Optional[Dict[str, Any]]:
         """Get customer information from the customers service"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{self.customers_url}/api/v1/customers/{customer_id}")
-                if response.status_code == 200:
-                    return await response.json()
-                return None
-            except httpx.RequestError:
-                return None
+        try:
+            if self.customer_cache is None:
+                return await self._fetch_customer(customer_id)
+            return await self.customer_cache.get(customer_id, lambda: self._fetch_customer(customer_id))
+        except DownstreamError:
+            return None
+    
+    async def get_customers(self, customer_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get multiple customers from the customers service concurrently"""
+        unique_ids = list(dict.fromkeys(customer_ids))
+        customers = await self._gather_limited(
+            [self.get_customer(customer_id) for customer_id in unique_ids]
+        )
+        return {
+            customer_id: customer
+            for customer_id, customer in zip(unique_ids, customers)
+            if customer is not None
+        }
     
-    async def get_product(self, product_id: int) -> Optional[Dict[str, Any]]:
-        """Get product information from the products service"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{self.products_url}/api/v1/products/{product_id}")
-                if response.status_code == 200:
-                    return await response.json()
-                return None
-            except httpx.RequestError:
-                return None
+    async def get_product(self, product_id: int, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get product information from the products service.
+        With a product cache, max_age bounds how old a cached product may be.
+        """
+        if self.product_cache is None:
+            return await self._fetch_product(product_id)
+        return await self.product_cache.get(
+            product_id, lambda: self._fetch_product(product_id), max_age
+        )
     
-    async def get_products(self, product_ids: List[int]) -> Dict[int, Dict[str, Any]]:
-        """Get multiple products information from the products service"""
-        result = {}
-        async with httpx.AsyncClient() as client:
-            for product_id in product_ids:
-                try:
-                    response = await client.get(f"{self.products_url}/api/v1/products/{product_id}")
-                    if response.status_code == 200:
-                        result[product_id] = await response.json()
-                except httpx.RequestError:
-                    continue
-        return result
+    async def get_products(
+        self, product_ids: List[int], max_age: Optional[float] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Get multiple products information from the products service concurrently"""
+        unique_ids = list(dict.fromkeys(product_ids))
+        products = await self._gather_limited(
+            [self.get_product(product_id, max_age) for product_id in unique_ids]
+        )
+        return {
+            product_id: product
+            for product_id, product in zip(unique_ids, products)
+            if product is not None
+        }
     
     async def update_product_quantity(self, product_id: int, quantity_change: int) -> bool:
         """Update product quantity in the products service"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.patch(
-                    f"{self.products_url}/api/v1/products/{product_id}/quantity/{quantity_change}"
-                )
-                return response.status_code == 200
-            except httpx.RequestError:
-                return False
+        return await self._patch_product_quantity(product_id, quantity_change)
+    
+    async def update_product_quantities(self, quantity_changes: List[Tuple[int, int]]) -> List[bool]:
+        """Apply several (product_id, quantity_change) updates concurrently"""
+        return await self._gather_limited([
+            self._patch_product_quantity(product_id, quantity_change)
+            for product_id, quantity_change in quantity_changes
+        ])
     
     async def notify_payment_service(self, order_id: int, total: float) -> Optional[Dict[str, Any]]:
         """Notify the payment service about a new order"""
-        async with httpx.AsyncClient() as client:
-            try:
-                payment_data = {
-                    "order_id": order_id,
-                    "amount": total,
-                    "status": "Pending"
-                }
-                response = await client.post(f"{self.payments_url}/api/v1/payments/", json=payment_data)
-                if response.status_code in (200, 201):
-                    return await response.json()
-                return None
-            except httpx.RequestError:
-                return None 
\ No newline at end of file
+        try:
+            response = await self.send_payment_notification(order_id, total)
+            if response.status_code in (200, 201):
+                return response.json()
+            return None
+        except DownstreamError:
+            return None
+    
+    async def send_payment_notification(
+        self, order_id: int, total: float, idempotency_key: Optional[str] = None
+    ) -> httpx.Response:
+        """
+        POST a payment for an order and return the raw response.
+        Raises DownstreamError when no response could be obtained.
+        """
+        payment_data = {
+            "order_id": order_id,
+            "amount": total,
+            "status": "Pending"
+        }
+        return await self.downstreams[PAYMENTS].call(
+            lambda timeout: self.client.post(
+                f"{self.payments_url}/api/v1/payments/",
+                json=payment_data,
+                headers=_idempotency_headers(idempotency_key),
+                timeout=timeout
+            )
+        )
+    
+    async def notify_payment_service_many(
+        self, payments: List[Tuple[int, float]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Notify the payment service about several (order_id, total) orders concurrently"""
+        return await self._gather_limited([
+            self.notify_payment_service(order_id, total) for order_id, total in payments
+        ])
+    
+    async def _fetch_customer(self, customer_id: int) -> Optional[Dict[str, Any]]:
+        # Only a 404 means the customer does not exist; anything else must not be cached as absent
+        response = await self.downstreams[CUSTOMERS].call(
+            lambda timeout: self.client.get(
+                f"{self.customers_url}/api/v1/customers/{customer_id}", timeout=timeout
+            ),
+            idempotent=True
+        )
+        if response.status_code == 200:
+            return response.json()
+        if response.status_code == 404:
+            return None
+        raise DownstreamError(f"Customers service returned {response.status_code}")
+    
+    async def _fetch_product(self, product_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            response = await self.downstreams[PRODUCTS].call(
+                lambda timeout: self.client.get(
+                    f"{self.products_url}/api/v1/products/{product_id}", timeout=timeout
+                ),
+                idempotent=True
+            )
+            if response.status_code == 200:
+                return response.json()
+            return None
+        except DownstreamError:
+            return None
+    
+    async def send_product_quantity_change(
+        self, product_id: int, quantity_change: int, idempotency_key: Optional[str] = None
+    ) -> httpx.Response:
+        """
+        PATCH a relative stock change and return the raw response.
+        Raises DownstreamError when no response could be obtained.
+        """
+        try:
+            # Relative stock changes are not idempotent, so they are never retried
+            return await self.downstreams[PRODUCTS].call(
+                lambda timeout: self.client.patch(
+                    f"{self.products_url}/api/v1/products/{product_id}/quantity/{quantity_change}",
+                    headers=_idempotency_headers(idempotency_key),
+                    timeout=timeout
+                )
+            )
+        finally:
+            # The cached stock is outdated whether or not the update went through
+            if self.product_cache is not None:
+                self.product_cache.invalidate(product_id)
+    
+    async def _patch_product_quantity(self, product_id: int, quantity_change: int) -> bool:
+        try:
+            response = await self.send_product_quantity_change(product_id, quantity_change)
+            return response.status_code == 200
+        except DownstreamError:
+            return False
+    
+    async def _gather_limited(self, calls: List[Awaitable[T]]) -> List[T]:
+        # Run the calls concurrently, at most DOWNSTREAM_CONCURRENCY_LIMIT at a time
+        semaphore = asyncio.Semaphore(settings.DOWNSTREAM_CONCURRENCY_LIMIT)
+        
+        async def run(call: Awaitable[T]) -> T:
+            async with semaphore:
+                return await call
+        
+        return await asyncio.gather(*(run(call) for call in calls))
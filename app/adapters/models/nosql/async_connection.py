@@ -0,0 +1,27 @@
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from app.adapters.models.nosql.connection import mongo_client_options
+from app.config import settings
+
+# Created on first use so the client attaches to the running event loop
+_mongo_client: Optional[AsyncIOMotorClient] = None
+
+
+def get_async_mongo_client() -> AsyncIOMotorClient:
+    global _mongo_client
+    if _mongo_client is None:
+        _mongo_client = AsyncIOMotorClient(**mongo_client_options())
+    return _mongo_client
+
+
+def get_async_db() -> AsyncIOMotorDatabase:
+    return get_async_mongo_client()[settings.NOSQL_DB]
+
+
+def close_async_mongo_client() -> None:
+    global _mongo_client
+    if _mongo_client is not None:
+        _mongo_client.close()
+        _mongo_client = None
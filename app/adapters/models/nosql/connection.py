@@ -1,13 +1,32 @@
+from typing import Any, Dict
+
 from pymongo import MongoClient
 
 from app.config import settings
 
-mongo_client = MongoClient(
-    host=settings.NOSQL_HOST,
-    port=settings.NOSQL_PORT,
-)
+
+def mongo_client_options() -> Dict[str, Any]:
+    """Connection options shared by the sync and async Mongo clients"""
+    options: Dict[str, Any] = {
+        "host": settings.NOSQL_HOST,
+        "port": settings.NOSQL_PORT,
+        "maxPoolSize": settings.NOSQL_MAX_POOL_SIZE,
+        "minPoolSize": settings.NOSQL_MIN_POOL_SIZE,
+        "connectTimeoutMS": settings.NOSQL_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.NOSQL_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": settings.NOSQL_SOCKET_TIMEOUT_MS,
+    }
+    if settings.NOSQL_COMPRESSORS:
+        options["compressors"] = settings.NOSQL_COMPRESSORS
+    return options
+
+
+mongo_client = MongoClient(**mongo_client_options())
 
 db = mongo_client[settings.NOSQL_DB]
 
 order_collection = db["orders"]
-order_item_collection = db["order_items"] 
\ No newline at end of file
+order_item_collection = db["order_items"]
+counter_collection = db["counters"]
+outbox_collection = db["outbox"]
+order_status_count_collection = db["order_status_counts"]
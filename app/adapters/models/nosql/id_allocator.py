@@ -0,0 +1,163 @@
+import asyncio
+import threading
+from typing import Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from pymongo.collection import Collection
+
+from app.adapters.models.nosql.async_connection import get_async_db
+from app.adapters.models.nosql.connection import (
+    counter_collection, order_collection, order_item_collection, outbox_collection
+)
+from app.config import settings
+
+
+class _IdBlock:
+    """Bookkeeping for the block of ids currently reserved by an allocator"""
+
+    def __init__(self, name: str, block_size: int):
+        self.name = name
+        self.block_size = block_size
+        self._next_id = 1
+        self._last_id = 0
+        self._seeded = False
+
+    def _reservation_size(self, missing: int) -> int:
+        # Zero when the current block still has ids left
+        if self._next_id <= self._last_id:
+            return 0
+        return max(self.block_size, missing)
+
+    def _take(self, missing: int) -> List[int]:
+        take = min(missing, self._last_id - self._next_id + 1)
+        ids = list(range(self._next_id, self._next_id + take))
+        self._next_id += take
+        return ids
+
+    def _set_block(self, last_id: int, size: int) -> None:
+        self._last_id = last_id
+        self._next_id = last_id - size + 1
+
+
+class IdAllocator(_IdBlock):
+    """
+    Hands out auto-increment style ids for a Mongo collection.
+
+    Ids are reserved from a shared counter document in blocks (hi/lo) with a
+    single atomic $inc, so most inserts need no allocation round trip and
+    concurrent workers never receive the same id.
+    """
+
+    def __init__(self, name: str, counters: Collection, target: Collection, block_size: int):
+        super().__init__(name, block_size)
+        self.counters = counters
+        self.target = target
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        return self.allocate(1)[0]
+
+    def allocate(self, count: int) -> List[int]:
+        ids: List[int] = []
+        with self._lock:
+            while len(ids) < count:
+                size = self._reservation_size(count - len(ids))
+                if size:
+                    self._reserve(size)
+                ids.extend(self._take(count - len(ids)))
+        return ids
+
+    def _reserve(self, size: int) -> None:
+        if not self._seeded:
+            self._seed()
+        
+        counter = self.counters.find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"seq": size}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._set_block(counter["seq"], size)
+
+    def _seed(self) -> None:
+        # Move the counter past ids written before it existed; $max keeps this idempotent
+        last_document = self.target.find_one(sort=[("_id", -1)], projection={"_id": 1})
+        if last_document:
+            self.counters.update_one(
+                {"_id": self.name},
+                {"$max": {"seq": last_document["_id"]}},
+                upsert=True
+            )
+        self._seeded = True
+
+
+class AsyncIdAllocator(_IdBlock):
+    """IdAllocator for Motor collections; reservations never block the event loop"""
+
+    def __init__(
+        self, name: str, counters: AsyncIOMotorCollection, target: AsyncIOMotorCollection, block_size: int
+    ):
+        super().__init__(name, block_size)
+        self.counters = counters
+        self.target = target
+        self._lock = asyncio.Lock()
+
+    async def next_id(self) -> int:
+        return (await self.allocate(1))[0]
+
+    async def allocate(self, count: int) -> List[int]:
+        ids: List[int] = []
+        async with self._lock:
+            while len(ids) < count:
+                size = self._reservation_size(count - len(ids))
+                if size:
+                    await self._reserve(size)
+                ids.extend(self._take(count - len(ids)))
+        return ids
+
+    async def _reserve(self, size: int) -> None:
+        if not self._seeded:
+            await self._seed()
+        
+        counter = await self.counters.find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"seq": size}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._set_block(counter["seq"], size)
+
+    async def _seed(self) -> None:
+        last_document = await self.target.find_one(sort=[("_id", -1)], projection={"_id": 1})
+        if last_document:
+            await self.counters.update_one(
+                {"_id": self.name},
+                {"$max": {"seq": last_document["_id"]}},
+                upsert=True
+            )
+        self._seeded = True
+
+
+order_id_allocator = IdAllocator(
+    "orders", counter_collection, order_collection, settings.NOSQL_ID_BLOCK_SIZE
+)
+order_item_id_allocator = IdAllocator(
+    "order_items", counter_collection, order_item_collection, settings.NOSQL_ID_BLOCK_SIZE
+)
+outbox_id_allocator = IdAllocator(
+    "outbox", counter_collection, outbox_collection, settings.NOSQL_ID_BLOCK_SIZE
+)
+
+# Async allocators are bound to the Motor client, which is created lazily
+_async_id_allocators: Dict[str, AsyncIdAllocator] = {}
+
+
+def get_async_id_allocator(name: str) -> AsyncIdAllocator:
+    """Async allocator for the collection `name`, shared per process like the sync ones"""
+    allocator: Optional[AsyncIdAllocator] = _async_id_allocators.get(name)
+    if allocator is None:
+        db = get_async_db()
+        allocator = AsyncIdAllocator(name, db["counters"], db[name], settings.NOSQL_ID_BLOCK_SIZE)
+        _async_id_allocators[name] = allocator
+    return allocator
@@ -0,0 +1,41 @@
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
+from pymongo.database import Database
+
+# Indexes for the queries of the Mongo repositories, mirroring the SQL models
+INDEXES: Dict[str, List[IndexModel]] = {
+    "orders": [
+        IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)], name="created_at_id"),
+        IndexModel(
+            [("status", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)],
+            name="status_created_at_id"
+        ),
+        IndexModel(
+            [("customer_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)],
+            name="customer_id_created_at_id"
+        ),
+    ],
+    "order_items": [
+        IndexModel([("order_id", ASCENDING)], name="order_id"),
+    ],
+    "outbox": [
+        IndexModel(
+            [("status", ASCENDING), ("available_at", ASCENDING), ("_id", ASCENDING)],
+            name="status_available_at_id"
+        ),
+        IndexModel([("claim_id", ASCENDING)], name="claim_id", sparse=True),
+    ],
+}
+
+
+def ensure_indexes(db: Database) -> None:
+    """Create any missing index; createIndexes is a no-op for indexes that already exist"""
+    for collection_name, indexes in INDEXES.items():
+        db[collection_name].create_indexes(indexes)
+
+
+async def ensure_async_indexes(db: AsyncIOMotorDatabase) -> None:
+    for collection_name, indexes in INDEXES.items():
+        await db[collection_name].create_indexes(indexes)
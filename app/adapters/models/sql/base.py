@@ -13,4 +13,13 @@ class BaseModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
-    ) 
\ No newline at end of file
+    ) 
+
+def create_indexes(bind) -> None:
+    """
+    Create the declared indexes missing from existing tables. create_all only
+    indexes the tables it creates; checkfirst makes this safe on every startup.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind, checkfirst=True)
@@ -7,7 +7,7 @@ from app.adapters.models.sql.base import BaseModel
 class OrderItemModel(BaseModel):
     __tablename__ = "order_items"
 
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
     product_id = Column(Integer, nullable=False)
     quantity = Column(Integer, nullable=False)
     
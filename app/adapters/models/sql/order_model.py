@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, Numeric, String
 from sqlalchemy.orm import relationship
 
 from app.adapters.models.sql.base import BaseModel
@@ -13,4 +13,11 @@ class OrderModel(BaseModel):
     total = Column(Numeric(precision=10, scale=2), nullable=False, default=0)
     
     # Relationship with OrderItems
-    items = relationship("OrderItemModel", back_populates="order", cascade="all, delete-orphan") 
\ No newline at end of file
+    items = relationship("OrderItemModel", back_populates="order", cascade="all, delete-orphan")
+
+    # Order pages are keyset-paginated on (created_at, id), optionally within a status or customer
+    __table_args__ = (
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        Index("ix_orders_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_orders_customer_id_created_at_id", "customer_id", "created_at", "id"),
+    ) 
\ No newline at end of file
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, event, insert
+
+from app.adapters.models.sql.base import Base
+from app.domain.entities.order import OrderStatus
+
+
+class OrderStatusCountModel(Base):
+    """Running number of orders per status, changed in the same transaction as the orders"""
+    __tablename__ = "order_status_counts"
+
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+@event.listens_for(OrderStatusCountModel.__table__, "after_create")
+def _insert_zero_counts(table, connection, **kw):
+    # Writes only increment existing rows, so every status starts with one
+    connection.execute(insert(table).values([{"status": status, "count": 0} for status in OrderStatus]))
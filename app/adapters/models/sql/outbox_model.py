@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
+
+from app.adapters.models.sql.base import BaseModel
+
+
+class OutboxModel(BaseModel):
+    __tablename__ = "outbox"
+
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(String, nullable=True)
+
+    # Serves the worker's "pending and due, oldest first" claim query
+    __table_args__ = (Index("ix_outbox_status_available_at_id", "status", "available_at", "id"),)
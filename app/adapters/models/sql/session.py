@@ -1,4 +1,7 @@
+from typing import Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
@@ -6,10 +9,49 @@ from app.config import settings
 engine = create_engine(settings.SQL_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine is created on first use so the async drivers are only needed when SQL_ASYNC is on
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL to its async driver (aiosqlite / asyncpg)"""
+    for prefix, async_prefix in (
+        ("sqlite://", "sqlite+aiosqlite://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+    ):
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        url = settings.SQL_ASYNC_DATABASE_URL or async_database_url(settings.SQL_DATABASE_URL)
+        _async_engine = create_async_engine(url)
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        # Attributes must stay loaded after commit: lazy loads are not possible on AsyncSession
+        _AsyncSessionLocal = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _AsyncSessionLocal
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
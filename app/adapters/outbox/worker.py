@@ -0,0 +1,248 @@
+import asyncio
+import inspect
+import logging
+import random
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, List, Optional, Union
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+from app.adapters.http.resilience import CircuitOpenError, DownstreamError
+from app.adapters.http.service_client import (
+    ServiceClient, customer_cache, downstreams, get_http_client, product_cache
+)
+from app.adapters.models.sql.session import SessionLocal, get_async_sessionmaker
+from app.adapters.repositories.async_sql_outbox_repository import AsyncSQLOutboxRepository
+from app.adapters.repositories.sql_outbox_repository import SQLOutboxRepository
+from app.config import settings
+from app.domain.entities.outbox import OutboxKind, OutboxMessageDb
+from app.domain.interfaces.async_outbox_repository import AsyncOutboxRepository
+from app.domain.interfaces.outbox_repository import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+AnyOutboxRepository = Union[OutboxRepository, AsyncOutboxRepository]
+
+_worker: Optional["OutboxWorker"] = None
+
+
+@dataclass
+class _Failure:
+    error: str
+    # False when the service may have applied the request: resending it could apply it twice
+    retryable: bool
+
+
+def _not_sent(exc: DownstreamError) -> bool:
+    # An open circuit or a connection never made: the request cannot have reached the service
+    return isinstance(exc, CircuitOpenError) or isinstance(
+        exc.__cause__, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+    )
+
+
+def _refused(status_code: int) -> bool:
+    # A 4xx or 503 turns the request away; a 500, 502 or 504 may come after it was applied
+    return 400 <= status_code < 500 or status_code == 503
+
+
+async def _call(method: Callable[..., Any], *args: Any) -> Any:
+    # Sync repositories run in the threadpool so the worker never blocks the event loop
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    call = asyncio.ensure_future(run_in_threadpool(method, *args))
+    try:
+        return await asyncio.shield(call)
+    except asyncio.CancelledError:
+        # A thread cannot be interrupted: let it finish with the session before the
+        # repository scope closes it, then stop
+        await asyncio.wait([call])
+        raise
+
+
+@asynccontextmanager
+async def sql_outbox_repository() -> AsyncIterator[AnyOutboxRepository]:
+    """Outbox repository on its own session, with the driver the API is configured for"""
+    if settings.SQL_ASYNC:
+        async with get_async_sessionmaker()() as db:
+            yield AsyncSQLOutboxRepository(db)
+    else:
+        db = SessionLocal()
+        try:
+            yield SQLOutboxRepository(db)
+        finally:
+            db.close()
+
+
+class OutboxWorker:
+    """
+    Delivers outbox messages to the downstream services in the background.
+
+    Each round claims a batch of due messages, sends their stock updates and
+    payment notifications concurrently, deletes the delivered ones and
+    reschedules those the service certainly did not apply with exponential
+    backoff. Messages with an unknown outcome (a timeout, a 500, 502 or 504)
+    or still failing after max_attempts are marked failed. Delivery is at
+    least once: a worker that stops between sending and deleting leaves its
+    messages to be resent, with the same Idempotency-Key so the services can
+    recognise them.
+    """
+
+    def __init__(
+        self,
+        service_client: ServiceClient,
+        repository_scope: Callable[[], AsyncContextManager[AnyOutboxRepository]] = sql_outbox_repository,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL,
+        lease_seconds: float = settings.OUTBOX_LEASE_SECONDS,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+        backoff_base: float = settings.OUTBOX_BACKOFF_BASE,
+        backoff_max: float = settings.OUTBOX_BACKOFF_MAX
+    ):
+        self.service_client = service_client
+        self.repository_scope = repository_scope
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def wake(self) -> None:
+        """Start the next round now instead of at the end of the poll interval"""
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                claimed = await self.dispatch_once()
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+                claimed = 0
+            # A full batch means more messages are probably due already
+            if claimed < self.batch_size:
+                await self._wait()
+
+    async def dispatch_once(self) -> int:
+        """Claim and deliver one batch; returns the number of messages claimed"""
+        async with self.repository_scope() as repository:
+            messages: List[OutboxMessageDb] = await _call(repository.claim, self.batch_size, self.lease_seconds)
+            if not messages:
+                return 0
+
+            failures = await self._deliver(messages)
+            await _call(repository.delete_many, [
+                message.id for message, failure in zip(messages, failures) if failure is None
+            ])
+
+            now = datetime.utcnow()
+            for message, failure in zip(messages, failures):
+                if failure is None:
+                    continue
+                if not failure.retryable:
+                    logger.error(
+                        "Not resending outbox message %s, the service may have applied it: %s",
+                        message.id, failure.error
+                    )
+                    await _call(repository.mark_failed, message.id, failure.error)
+                elif message.attempts >= self.max_attempts:
+                    logger.error(
+                        "Giving up on outbox message %s after %s attempts: %s",
+                        message.id, message.attempts, failure.error
+                    )
+                    await _call(repository.mark_failed, message.id, failure.error)
+                else:
+                    retry_at = now + timedelta(seconds=self.backoff(message.attempts))
+                    await _call(repository.retry_later, message.id, retry_at, failure.error)
+
+        return len(messages)
+
+    def backoff(self, attempts: int) -> float:
+        # Full jitter spreads the retries of a batch that failed together
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1)))
+
+    async def _deliver(self, messages: List[OutboxMessageDb]) -> List[Optional[_Failure]]:
+        # Returns the delivery failure of each message, None when it went through
+        semaphore = asyncio.Semaphore(settings.DOWNSTREAM_CONCURRENCY_LIMIT)
+
+        async def deliver(message: OutboxMessageDb) -> Optional[_Failure]:
+            async with semaphore:
+                return await self._deliver_one(message)
+
+        return list(await asyncio.gather(*(deliver(message) for message in messages)))
+
+    async def _deliver_one(self, message: OutboxMessageDb) -> Optional[_Failure]:
+        # Failures stay with their message so the rest of the batch is still deleted or rescheduled
+        payload = message.payload
+        idempotency_key = f"outbox-{message.id}"
+        if message.kind == OutboxKind.STOCK_UPDATE:
+            action = f"Stock update for product {payload['product_id']}"
+        else:
+            action = f"Payment notification for order {payload['order_id']}"
+        try:
+            if message.kind == OutboxKind.STOCK_UPDATE:
+                response = await self.service_client.send_product_quantity_change(
+                    payload["product_id"], payload["quantity_change"], idempotency_key
+                )
+                delivered = response.status_code == 200
+            else:
+                response = await self.service_client.send_payment_notification(
+                    payload["order_id"], float(Decimal(payload["total"])), idempotency_key
+                )
+                delivered = response.status_code in (200, 201)
+        except DownstreamError as exc:
+            logger.warning("%s failed: %s", action, exc)
+            return _Failure(f"{action} failed: {exc}", _not_sent(exc))
+        except Exception as exc:
+            logger.warning("%s raised", action, exc_info=True)
+            return _Failure(f"{action} failed: {exc!r}", False)
+        if delivered:
+            return None
+        return _Failure(f"{action} failed: HTTP {response.status_code}", _refused(response.status_code))
+
+    async def _wait(self) -> None:
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+        self._wakeup.clear()
+
+
+async def start_outbox_worker() -> None:
+    """Start the process-wide outbox worker on the shared HTTP client; called on startup"""
+    global _worker
+    if _worker is None:
+        _worker = OutboxWorker(ServiceClient(
+            get_http_client(),
+            product_cache=product_cache,
+            customer_cache=customer_cache,
+            downstreams=downstreams
+        ))
+        _worker.start()
+
+
+async def stop_outbox_worker() -> None:
+    """Stop the outbox worker; undelivered messages stay stored for the next start"""
+    global _worker
+    if _worker is not None:
+        await _worker.stop()
+        _worker = None
+
+
+def wake_outbox_worker() -> None:
+    if _worker is not None:
+        _worker.wake()
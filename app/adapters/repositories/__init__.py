@@ -1,14 +1,31 @@
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.domain.interfaces.async_order_repository import AsyncOrderRepository
+from app.domain.interfaces.async_order_item_repository import AsyncOrderItemRepository
 from app.domain.interfaces.order_repository import OrderRepository
 from app.domain.interfaces.order_item_repository import OrderItemRepository
+from app.domain.interfaces.outbox_repository import OutboxRepository
+from app.domain.interfaces.async_outbox_repository import AsyncOutboxRepository
+from app.domain.interfaces.unit_of_work import AutoCommitUnitOfWork, UnitOfWork
+from app.domain.interfaces.async_unit_of_work import AsyncAutoCommitUnitOfWork, AsyncUnitOfWork
 from .sql_order_repository import SQLOrderRepository
 from .nosql_order_repository import NoSQLOrderRepository
 from .sql_order_item_repository import SQLOrderItemRepository
 from .nosql_order_item_repository import NoSQLOrderItemRepository
+from .async_sql_order_repository import AsyncSQLOrderRepository
+from .async_sql_order_item_repository import AsyncSQLOrderItemRepository
+from .async_nosql_order_repository import AsyncNoSQLOrderRepository
+from .async_nosql_order_item_repository import AsyncNoSQLOrderItemRepository
+from .sql_outbox_repository import SQLOutboxRepository
+from .nosql_outbox_repository import NoSQLOutboxRepository
+from .async_sql_outbox_repository import AsyncSQLOutboxRepository
+from .async_nosql_outbox_repository import AsyncNoSQLOutboxRepository
+from .sql_unit_of_work import SQLUnitOfWork
+from .async_sql_unit_of_work import AsyncSQLUnitOfWork
 
 
 class RepositoryType(str, Enum):
@@ -36,3 +53,70 @@ def get_order_item_repository(
         return SQLOrderItemRepository(db_session)
     else:
         return NoSQLOrderItemRepository()
+
+
+def get_async_order_repository(
+    repository_type: RepositoryType, db_session: Optional[AsyncSession] = None
+) -> AsyncOrderRepository:
+    if repository_type == RepositoryType.SQL:
+        if not db_session:
+            raise ValueError("DB session is required for SQL repository")
+        return AsyncSQLOrderRepository(db_session)
+    else:
+        return AsyncNoSQLOrderRepository()
+
+
+def get_async_order_item_repository(
+    repository_type: RepositoryType, db_session: Optional[AsyncSession] = None
+) -> AsyncOrderItemRepository:
+    if repository_type == RepositoryType.SQL:
+        if not db_session:
+            raise ValueError("DB session is required for SQL repository")
+        return AsyncSQLOrderItemRepository(db_session)
+    else:
+        return AsyncNoSQLOrderItemRepository()
+
+
+def get_outbox_repository(
+    repository_type: RepositoryType, db_session: Optional[Session] = None
+) -> OutboxRepository:
+    if repository_type == RepositoryType.SQL:
+        if not db_session:
+            raise ValueError("DB session is required for SQL repository")
+        return SQLOutboxRepository(db_session)
+    else:
+        return NoSQLOutboxRepository()
+
+
+def get_async_outbox_repository(
+    repository_type: RepositoryType, db_session: Optional[AsyncSession] = None
+) -> AsyncOutboxRepository:
+    if repository_type == RepositoryType.SQL:
+        if not db_session:
+            raise ValueError("DB session is required for SQL repository")
+        return AsyncSQLOutboxRepository(db_session)
+    else:
+        return AsyncNoSQLOutboxRepository()
+
+
+def get_unit_of_work(
+    repository_type: RepositoryType, db_session: Optional[Session] = None
+) -> UnitOfWork:
+    if repository_type == RepositoryType.SQL:
+        if not db_session:
+            raise ValueError("DB session is required for SQL repository")
+        return SQLUnitOfWork(db_session)
+    else:
+        # Multi-document transactions need a replica set; each Mongo write is persisted as it happens
+        return AutoCommitUnitOfWork()
+
+
+def get_async_unit_of_work(
+    repository_type: RepositoryType, db_session: Optional[AsyncSession] = None
+) -> AsyncUnitOfWork:
+    if repository_type == RepositoryType.SQL:
+        if not db_session:
+            raise ValueError("DB session is required for SQL repository")
+        return AsyncSQLUnitOfWork(db_session)
+    else:
+        return AsyncAutoCommitUnitOfWork()
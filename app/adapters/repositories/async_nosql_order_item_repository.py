@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from app.adapters.models.nosql.async_connection import get_async_db
+from app.adapters.models.nosql.id_allocator import AsyncIdAllocator, get_async_id_allocator
+from app.adapters.repositories.nosql_order_item_repository import map_item_document, new_item_document
+from app.domain.entities.order import OrderItem, OrderItemDb
+from app.domain.interfaces.async_order_item_repository import AsyncOrderItemRepository
+
+
+class AsyncNoSQLOrderItemRepository(AsyncOrderItemRepository):
+    def __init__(
+        self,
+        collection: Optional[AsyncIOMotorCollection] = None,
+        id_allocator: Optional[AsyncIdAllocator] = None
+    ):
+        self.collection = collection if collection is not None else get_async_db()["order_items"]
+        self.id_allocator = id_allocator or get_async_id_allocator("order_items")
+
+    async def get_by_order_id(self, order_id: int) -> List[OrderItemDb]:
+        items = await self.collection.find({"order_id": order_id}).to_list(None)
+        return [map_item_document(item) for item in items]
+
+    async def create(self, order_id: int, item: OrderItem) -> OrderItemDb:
+        item_dict = new_item_document(await self.id_allocator.next_id(), order_id, item, datetime.utcnow())
+        await self.collection.insert_one(item_dict)
+        return map_item_document(item_dict)
+
+    async def create_many(self, order_id: int, items: List[OrderItem]) -> List[OrderItemDb]:
+        return await self.create_for_orders([(order_id, items)])
+
+    async def create_for_orders(self, order_items: List[Tuple[int, List[OrderItem]]]) -> List[OrderItemDb]:
+        pairs = [(order_id, item) for order_id, items in order_items for item in items]
+        item_ids = await self.id_allocator.allocate(len(pairs))
+        
+        now = datetime.utcnow()
+        item_dicts = [
+            new_item_document(item_id, order_id, item, now)
+            for item_id, (order_id, item) in zip(item_ids, pairs)
+        ]
+        
+        if item_dicts:
+            await self.collection.insert_many(item_dicts)
+        
+        return [map_item_document(item) for item in item_dicts]
+
+    async def delete(self, item_id: int) -> bool:
+        result = await self.collection.delete_one({"_id": item_id})
+        return result.deleted_count > 0
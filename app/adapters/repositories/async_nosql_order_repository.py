@@ -0,0 +1,268 @@
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from app.adapters.models.nosql.async_connection import get_async_db
+from app.adapters.models.nosql.id_allocator import AsyncIdAllocator, get_async_id_allocator
+from app.adapters.repositories.nosql_order_repository import (
+    ORDER_PAGE_SORT,
+    STATUS_COUNT_PIPELINE,
+    apply_payment_transition,
+    group_items,
+    items_by_order_query,
+    map_order_analytics,
+    map_order_document,
+    map_order_summary_document,
+    map_status_counts,
+    new_order_document,
+    order_analytics_pipeline,
+    order_page_query,
+    order_summary_projection,
+    orders_status_filter,
+    payment_transition_update,
+    split_page,
+    status_count_replacements,
+    status_count_updates,
+    status_write_filter,
+    status_write_update,
+)
+from app.domain.entities.order import (
+    AnalyticsGroup,
+    AnalyticsInterval,
+    Order,
+    OrderAnalyticsBucket,
+    OrderCursor,
+    OrderDb,
+    OrderPage,
+    OrderStatus,
+    OrderSummaryPage,
+    PaymentStatus,
+    status_count_changes,
+)
+from app.domain.interfaces.async_order_repository import AsyncOrderRepository
+
+
+class AsyncNoSQLOrderRepository(AsyncOrderRepository):
+    """NoSQLOrderRepository on Motor; shares its queries and document mapping"""
+
+    def __init__(
+        self,
+        collection: Optional[AsyncIOMotorCollection] = None,
+        item_collection: Optional[AsyncIOMotorCollection] = None,
+        id_allocator: Optional[AsyncIdAllocator] = None,
+        count_collection: Optional[AsyncIOMotorCollection] = None
+    ):
+        # Motor collections do not support truth testing, so compare with None
+        self.collection = collection if collection is not None else get_async_db()["orders"]
+        self.item_collection = (
+            item_collection if item_collection is not None else get_async_db()["order_items"]
+        )
+        self.id_allocator = id_allocator or get_async_id_allocator("orders")
+        self.count_collection = (
+            count_collection if count_collection is not None else get_async_db()["order_status_counts"]
+        )
+
+    async def get_all(self) -> List[OrderDb]:
+        orders = await self.collection.find().to_list(None)
+        return await self._map_many(orders)
+
+    async def get_by_id(self, order_id: int) -> Optional[OrderDb]:
+        order = await self.collection.find_one({"_id": order_id})
+        return await self._map_to_entity(order) if order else None
+
+    async def get_version(self, order_id: int) -> Optional[datetime]:
+        order = await self.collection.find_one({"_id": order_id}, {"updated_at": 1})
+        return order["updated_at"] if order else None
+
+    async def get_by_status(self, status: OrderStatus) -> List[OrderDb]:
+        orders = await self.collection.find({"status": status}).to_list(None)
+        return await self._map_many(orders)
+
+    async def get_page(
+        self, limit: int, cursor: Optional[OrderCursor] = None, status: Optional[OrderStatus] = None
+    ) -> OrderPage:
+        orders = await (
+            self.collection.find(order_page_query(cursor, status))
+            .sort(ORDER_PAGE_SORT)
+            .limit(limit + 1)
+            .to_list(None)
+        )
+        orders, next_cursor = split_page(orders, limit)
+        return OrderPage(items=await self._map_many(orders), next_cursor=next_cursor)
+
+    async def get_by_customer(
+        self, customer_id: int, limit: int, cursor: Optional[OrderCursor] = None
+    ) -> OrderPage:
+        orders = await (
+            self.collection.find(order_page_query(cursor, customer_id=customer_id))
+            .sort(ORDER_PAGE_SORT)
+            .limit(limit + 1)
+            .to_list(None)
+        )
+        orders, next_cursor = split_page(orders, limit)
+        return OrderPage(items=await self._map_many(orders), next_cursor=next_cursor)
+
+    async def get_summary_page(
+        self,
+        fields: FrozenSet[str],
+        limit: int,
+        cursor: Optional[OrderCursor] = None,
+        status: Optional[OrderStatus] = None,
+        customer_id: Optional[int] = None
+    ) -> OrderSummaryPage:
+        orders = await (
+            self.collection.find(order_page_query(cursor, status, customer_id), order_summary_projection(fields))
+            .sort(ORDER_PAGE_SORT)
+            .limit(limit + 1)
+            .to_list(None)
+        )
+        orders, next_cursor = split_page(orders, limit)
+        items_by_order: Dict[int, List[dict]] = defaultdict(list)
+        if "items" in fields and orders:
+            items_by_order = group_items(await self.item_collection.find(items_by_order_query(orders)).to_list(None))
+        summaries = [map_order_summary_document(order, fields, items_by_order[order["_id"]]) for order in orders]
+        return OrderSummaryPage(items=summaries, next_cursor=next_cursor)
+
+    async def create(self, order: Order, total: Decimal = Decimal("0")) -> OrderDb:
+        order_dict = new_order_document(
+            await self.id_allocator.next_id(), order, datetime.utcnow(), total
+        )
+        await self.collection.insert_one(order_dict)
+        await self._change_status_counts({OrderStatus.PLACED: 1})
+        
+        # Return order with empty items list since they'll be added separately
+        return map_order_document(order_dict, [])
+
+    async def create_many(self, orders: List[Order], totals: List[Decimal]) -> List[OrderDb]:
+        order_ids = await self.id_allocator.allocate(len(orders))
+        
+        now = datetime.utcnow()
+        order_dicts = [
+            new_order_document(order_id, order, now, total)
+            for order_id, order, total in zip(order_ids, orders, totals)
+        ]
+        
+        if order_dicts:
+            await self.collection.insert_many(order_dicts)
+            await self._change_status_counts({OrderStatus.PLACED: len(order_dicts)})
+        
+        return [map_order_document(order_dict, []) for order_dict in order_dicts]
+
+    async def update_status(self, order_id: int, status: OrderStatus) -> Optional[OrderDb]:
+        now = datetime.utcnow()
+        previous = await self.collection.find_one_and_update(
+            {"_id": order_id},
+            {"$set": {"status": status, "updated_at": now}},
+            return_document=ReturnDocument.BEFORE
+        )
+        if not previous:
+            return None
+        
+        await self._change_status_counts(status_count_changes([OrderStatus(previous["status"])], status))
+        return await self._map_to_entity({**previous, "status": status, "updated_at": now})
+
+    async def update_status_many(
+        self, order_ids: List[int], status: OrderStatus, expected_status: Optional[OrderStatus] = None
+    ) -> List[int]:
+        now = datetime.utcnow()
+        write_id = ObjectId()
+        if expected_status is not None:
+            previous_ids = {expected_status: order_ids}
+        else:
+            previous_ids = defaultdict(list)
+            current = await self.collection.find(
+                {"_id": {"$in": order_ids}}, projection={"status": 1}
+            ).to_list(None)
+            for order in current:
+                previous_ids[OrderStatus(order["status"])].append(order["_id"])
+        
+        moved: List[OrderStatus] = []
+        for previous_status, ids in previous_ids.items():
+            result = await self.collection.update_many(
+                orders_status_filter(ids, previous_status),
+                status_write_update(status, now, write_id)
+            )
+            moved.extend([previous_status] * result.modified_count)
+        await self._change_status_counts(status_count_changes(moved, status))
+        
+        updated = await self.collection.find(
+            status_write_filter(order_ids, write_id), projection={"_id": 1}
+        ).to_list(None)
+        return [order["_id"] for order in updated]
+
+    async def update_payment_status(self, order_id: int, payment_status: PaymentStatus) -> Optional[OrderDb]:
+        return await self._update(order_id, {"payment_status": payment_status})
+    
+    async def transition_payment_status(
+        self,
+        order_id: int,
+        payment_status: PaymentStatus,
+        from_payment_statuses: List[PaymentStatus],
+        status_change: Optional[Tuple[OrderStatus, OrderStatus]] = None
+    ) -> Optional[OrderDb]:
+        now = datetime.utcnow()
+        previous = await self.collection.find_one_and_update(
+            {"_id": order_id, "payment_status": {"$in": from_payment_statuses}},
+            payment_transition_update(payment_status, status_change, now),
+            return_document=ReturnDocument.BEFORE
+        )
+        if not previous:
+            return None
+        
+        order = apply_payment_transition(previous, payment_status, status_change, now)
+        await self._change_status_counts(
+            status_count_changes([OrderStatus(previous["status"])], OrderStatus(order["status"]))
+        )
+        return await self._map_to_entity(order)
+    
+    async def update_total(self, order_id: int, total: Decimal) -> Optional[OrderDb]:
+        return await self._update(order_id, {"total": float(total)})
+    
+    async def get_analytics(
+        self,
+        start: datetime,
+        end: datetime,
+        interval: AnalyticsInterval,
+        group_by: Optional[AnalyticsGroup] = None
+    ) -> List[OrderAnalyticsBucket]:
+        pipeline = order_analytics_pipeline(start, end, interval, group_by, self.item_collection.name)
+        return map_order_analytics(await self.collection.aggregate(pipeline).to_list(None))
+
+    async def get_status_counts(self) -> Dict[OrderStatus, int]:
+        return map_status_counts(await self.count_collection.find().to_list(None))
+
+    async def rebuild_status_counts(self) -> Dict[OrderStatus, int]:
+        counts = map_status_counts(await self.collection.aggregate(STATUS_COUNT_PIPELINE).to_list(None))
+        await self.count_collection.bulk_write(status_count_replacements(counts))
+        return counts
+    
+    async def _update(self, order_id: int, fields: Dict[str, Any]) -> Optional[OrderDb]:
+        order = await self.collection.find_one_and_update(
+            {"_id": order_id},
+            {"$set": {**fields, "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+        return await self._map_to_entity(order) if order else None
+    
+    async def _change_status_counts(self, changes: Dict[OrderStatus, int]) -> None:
+        updates = status_count_updates(changes)
+        if updates:
+            await self.count_collection.bulk_write(updates)
+    
+    async def _map_many(self, orders: List[dict]) -> List[OrderDb]:
+        # Fetch the items of every order in one $in query and stitch them in memory
+        if not orders:
+            return []
+        
+        items = await self.item_collection.find(items_by_order_query(orders)).to_list(None)
+        items_by_order = group_items(items)
+        return [map_order_document(order, items_by_order[order["_id"]]) for order in orders]
+    
+    async def _map_to_entity(self, data: dict) -> OrderDb:
+        items = await self.item_collection.find({"order_id": data["_id"]}).to_list(None)
+        return map_order_document(data, items)
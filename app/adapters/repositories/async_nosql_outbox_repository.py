@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from app.adapters.models.nosql.async_connection import get_async_db
+from app.adapters.models.nosql.id_allocator import AsyncIdAllocator, get_async_id_allocator
+from app.adapters.repositories.nosql_outbox_repository import (
+    DUE_OUTBOX_SORT, claim_outbox_update, due_outbox_filter, map_outbox_document, new_outbox_document
+)
+from app.domain.entities.outbox import OutboxMessage, OutboxMessageDb, OutboxStatus
+from app.domain.interfaces.async_outbox_repository import AsyncOutboxRepository
+
+
+class AsyncNoSQLOutboxRepository(AsyncOutboxRepository):
+    def __init__(
+        self,
+        collection: Optional[AsyncIOMotorCollection] = None,
+        id_allocator: Optional[AsyncIdAllocator] = None
+    ):
+        self.collection = collection if collection is not None else get_async_db()["outbox"]
+        self.id_allocator = id_allocator or get_async_id_allocator("outbox")
+
+    async def add_many(self, messages: List[OutboxMessage]) -> None:
+        if not messages:
+            return
+
+        now = datetime.utcnow()
+        message_ids = await self.id_allocator.allocate(len(messages))
+        await self.collection.insert_many([
+            new_outbox_document(message_id, message, now)
+            for message_id, message in zip(message_ids, messages)
+        ])
+
+    async def claim(self, limit: int, lease_seconds: float) -> List[OutboxMessageDb]:
+        now = datetime.utcnow()
+        due = await self.collection.find(
+            due_outbox_filter(now), {"_id": 1}
+        ).sort(DUE_OUTBOX_SORT).limit(limit).to_list(None)
+        due_ids = [document["_id"] for document in due]
+        if not due_ids:
+            return []
+
+        claim_id = ObjectId()
+        await self.collection.update_many(
+            {"_id": {"$in": due_ids}, **due_outbox_filter(now)},
+            claim_outbox_update(claim_id, now, lease_seconds)
+        )
+        claimed = await self.collection.find({"claim_id": claim_id}).sort("_id", 1).to_list(None)
+        return [map_outbox_document(document) for document in claimed]
+
+    async def delete_many(self, message_ids: List[int]) -> None:
+        if message_ids:
+            await self.collection.delete_many({"_id": {"$in": message_ids}})
+
+    async def retry_later(self, message_id: int, available_at: datetime, error: str) -> None:
+        await self.collection.update_one(
+            {"_id": message_id},
+            {"$set": {"available_at": available_at, "last_error": error, "updated_at": datetime.utcnow()}}
+        )
+
+    async def mark_failed(self, message_id: int, error: str) -> None:
+        await self.collection.update_one(
+            {"_id": message_id},
+            {"$set": {
+                "status": OutboxStatus.FAILED.value,
+                "last_error": error,
+                "updated_at": datetime.utcnow()
+            }}
+        )
@@ -0,0 +1,57 @@
+from typing import List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters.models.sql.order_item_model import OrderItemModel
+from app.adapters.repositories.async_sql_unit_of_work import commit_unless_in_unit_of_work
+from app.adapters.repositories.sql_order_item_repository import (
+    insert_order_items, map_order_item_model, new_order_item_rows
+)
+from app.domain.entities.order import OrderItem, OrderItemDb
+from app.domain.interfaces.async_order_item_repository import AsyncOrderItemRepository
+
+
+class AsyncSQLOrderItemRepository(AsyncOrderItemRepository):
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def get_by_order_id(self, order_id: int) -> List[OrderItemDb]:
+        items = await self.db_session.scalars(
+            select(OrderItemModel).where(OrderItemModel.order_id == order_id)
+        )
+        return [map_order_item_model(item) for item in items]
+
+    async def create(self, order_id: int, item: OrderItem) -> OrderItemDb:
+        db_item = OrderItemModel(
+            order_id=order_id,
+            product_id=item.product_id,
+            quantity=item.quantity
+        )
+        
+        self.db_session.add(db_item)
+        await self.db_session.flush()
+        
+        created_item = map_order_item_model(db_item)
+        await commit_unless_in_unit_of_work(self.db_session)
+        return created_item
+
+    async def create_many(self, order_id: int, items: List[OrderItem]) -> List[OrderItemDb]:
+        return await self.create_for_orders([(order_id, items)])
+
+    async def create_for_orders(self, order_items: List[Tuple[int, List[OrderItem]]]) -> List[OrderItemDb]:
+        if not any(items for _, items in order_items):
+            return []
+        
+        rows = (await self.db_session.execute(insert_order_items(), new_order_item_rows(order_items))).all()
+        await commit_unless_in_unit_of_work(self.db_session)
+        return [map_order_item_model(row) for row in rows]
+
+    async def delete(self, item_id: int) -> bool:
+        item = await self.db_session.get(OrderItemModel, item_id)
+        if not item:
+            return False
+        
+        await self.db_session.delete(item)
+        await commit_unless_in_unit_of_work(self.db_session)
+        return True
@@ -0,0 +1,211 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters.models.sql.order_model import OrderModel
+from app.adapters.models.sql.order_status_count_model import OrderStatusCountModel
+from app.adapters.repositories.async_sql_unit_of_work import commit_unless_in_unit_of_work
+from app.adapters.repositories.sql_order_repository import (
+    build_order_page,
+    build_order_summary_page,
+    change_status_counts,
+    insert_orders,
+    new_order_rows,
+    insert_status_counts,
+    map_order_analytics,
+    map_order_model,
+    map_status_counts,
+    new_order_model,
+    payment_transition_values,
+    recount_status_counts,
+    select_items_of_orders,
+    select_order_analytics,
+    select_order_items,
+    select_order_page,
+    select_order_summary_page,
+    select_orders,
+    select_statuses_for_update,
+    trim_page,
+    update_order,
+    update_orders_status,
+)
+from app.domain.entities.order import (
+    AnalyticsGroup,
+    AnalyticsInterval,
+    Order,
+    OrderAnalyticsBucket,
+    OrderCursor,
+    OrderDb,
+    OrderPage,
+    OrderStatus,
+    OrderSummaryPage,
+    PaymentStatus,
+    status_count_changes,
+)
+from app.domain.interfaces.async_order_repository import AsyncOrderRepository
+
+
+class AsyncSQLOrderRepository(AsyncOrderRepository):
+    """SQLOrderRepository on AsyncSession; shares its statements and mapping"""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def get_all(self) -> List[OrderDb]:
+        orders = await self.db_session.scalars(select_orders())
+        return [map_order_model(order) for order in orders]
+
+    async def get_by_id(self, order_id: int) -> Optional[OrderDb]:
+        orders = await self.db_session.scalars(select_orders().where(OrderModel.id == order_id))
+        order = orders.first()
+        return map_order_model(order) if order else None
+
+    async def get_version(self, order_id: int) -> Optional[datetime]:
+        return await self.db_session.scalar(select(OrderModel.updated_at).where(OrderModel.id == order_id))
+
+    async def get_by_status(self, status: OrderStatus) -> List[OrderDb]:
+        orders = await self.db_session.scalars(select_orders().where(OrderModel.status == status))
+        return [map_order_model(order) for order in orders]
+
+    async def get_page(
+        self, limit: int, cursor: Optional[OrderCursor] = None, status: Optional[OrderStatus] = None
+    ) -> OrderPage:
+        orders = await self.db_session.scalars(select_order_page(limit, cursor, status))
+        return build_order_page(orders.all(), limit)
+
+    async def get_by_customer(
+        self, customer_id: int, limit: int, cursor: Optional[OrderCursor] = None
+    ) -> OrderPage:
+        orders = await self.db_session.scalars(select_order_page(limit, cursor, customer_id=customer_id))
+        return build_order_page(orders.all(), limit)
+
+    async def get_summary_page(
+        self,
+        fields: FrozenSet[str],
+        limit: int,
+        cursor: Optional[OrderCursor] = None,
+        status: Optional[OrderStatus] = None,
+        customer_id: Optional[int] = None
+    ) -> OrderSummaryPage:
+        statement = select_order_summary_page(fields, limit, cursor, status, customer_id)
+        rows, next_cursor = trim_page((await self.db_session.execute(statement)).all(), limit)
+        items = []
+        if "items" in fields and rows:
+            items = (await self.db_session.scalars(select_items_of_orders([row.id for row in rows]))).all()
+        return build_order_summary_page(rows, fields, items, next_cursor)
+
+    async def create(self, order: Order, total: Decimal = Decimal("0")) -> OrderDb:
+        db_order = new_order_model(order, total)
+        self.db_session.add(db_order)
+        await self.db_session.flush()
+        
+        # Return order with empty items list since they'll be added separately
+        created_order = map_order_model(db_order, items=[])
+        await self._change_status_counts({OrderStatus.PLACED: 1})
+        await commit_unless_in_unit_of_work(self.db_session)
+        return created_order
+
+    async def create_many(self, orders: List[Order], totals: List[Decimal]) -> List[OrderDb]:
+        if not orders:
+            return []
+        
+        rows = (await self.db_session.execute(insert_orders(), new_order_rows(orders, totals))).all()
+        await self._change_status_counts({OrderStatus.PLACED: len(rows)})
+        await commit_unless_in_unit_of_work(self.db_session)
+        return [map_order_model(row, items=[]) for row in rows]
+
+    async def update_status(self, order_id: int, status: OrderStatus) -> Optional[OrderDb]:
+        return await self._update(order_id, track_status=True, status=status)
+
+    async def update_status_many(
+        self, order_ids: List[int], status: OrderStatus, expected_status: Optional[OrderStatus] = None
+    ) -> List[int]:
+        previous_statuses = {}
+        if expected_status is None:
+            previous_statuses = dict(
+                (await self.db_session.execute(select_statuses_for_update(order_ids))).all()
+            )
+        updated_ids = await self.db_session.scalars(update_orders_status(order_ids, status, expected_status))
+        updated_ids = updated_ids.all()
+        await self._change_status_counts(status_count_changes(
+            (expected_status or OrderStatus(previous_statuses[order_id]) for order_id in updated_ids), status
+        ))
+        await commit_unless_in_unit_of_work(self.db_session)
+        return list(updated_ids)
+
+    async def update_payment_status(self, order_id: int, payment_status: PaymentStatus) -> Optional[OrderDb]:
+        return await self._update(order_id, payment_status=payment_status)
+    
+    async def transition_payment_status(
+        self,
+        order_id: int,
+        payment_status: PaymentStatus,
+        from_payment_statuses: List[PaymentStatus],
+        status_change: Optional[Tuple[OrderStatus, OrderStatus]] = None
+    ) -> Optional[OrderDb]:
+        return await self._update(
+            order_id,
+            OrderModel.payment_status.in_(from_payment_statuses),
+            track_status=status_change is not None,
+            **payment_transition_values(payment_status, status_change)
+        )
+    
+    async def update_total(self, order_id: int, total: Decimal) -> Optional[OrderDb]:
+        return await self._update(order_id, total=total)
+    
+    async def get_status_counts(self) -> Dict[OrderStatus, int]:
+        rows = await self.db_session.execute(select(OrderStatusCountModel.status, OrderStatusCountModel.count))
+        return map_status_counts(rows.all())
+
+    async def get_analytics(
+        self,
+        start: datetime,
+        end: datetime,
+        interval: AnalyticsInterval,
+        group_by: Optional[AnalyticsGroup] = None
+    ) -> List[OrderAnalyticsBucket]:
+        dialect_name = self.db_session.get_bind().dialect.name
+        rows = await self.db_session.execute(select_order_analytics(start, end, interval, group_by, dialect_name))
+        return map_order_analytics(rows)
+
+    async def rebuild_status_counts(self) -> Dict[OrderStatus, int]:
+        existing = set(await self.db_session.scalars(select(OrderStatusCountModel.status)))
+        missing = [status for status in OrderStatus if status.value not in existing]
+        if missing:
+            await self.db_session.execute(insert_status_counts(missing))
+        await self.db_session.execute(recount_status_counts())
+        counts = await self.get_status_counts()
+        await commit_unless_in_unit_of_work(self.db_session)
+        return counts
+    
+    async def _update(
+        self, order_id: int, *conditions: ColumnElement[bool], track_status: bool = False, **values: Any
+    ) -> Optional[OrderDb]:
+        previous_status = None
+        if track_status:
+            locked = (
+                await self.db_session.execute(select_statuses_for_update([order_id], *conditions))
+            ).first()
+            if locked is None:
+                return None
+            previous_status = OrderStatus(locked.status)
+        
+        row = (await self.db_session.execute(update_order(order_id, *conditions, **values))).first()
+        if row is None:
+            return None
+        
+        items = (await self.db_session.scalars(select_order_items(order_id))).all()
+        # Map before a commit expires the loaded items
+        updated_order = map_order_model(row, items)
+        if track_status:
+            await self._change_status_counts(status_count_changes([previous_status], updated_order.status))
+        await commit_unless_in_unit_of_work(self.db_session)
+        return updated_order
+    
+    async def _change_status_counts(self, changes: Dict[OrderStatus, int]) -> None:
+        statement = change_status_counts(changes)
+        if statement is not None:
+            await self.db_session.execute(statement)
@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters.models.sql.outbox_model import OutboxModel
+from app.adapters.repositories.async_sql_unit_of_work import commit_unless_in_unit_of_work
+from app.adapters.repositories.sql_outbox_repository import (
+    claim_outbox_messages, insert_outbox_messages, map_outbox_model, update_outbox_message
+)
+from app.domain.entities.outbox import OutboxMessage, OutboxMessageDb, OutboxStatus
+from app.domain.interfaces.async_outbox_repository import AsyncOutboxRepository
+
+
+class AsyncSQLOutboxRepository(AsyncOutboxRepository):
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def add_many(self, messages: List[OutboxMessage]) -> None:
+        if not messages:
+            return
+
+        await self.db_session.execute(insert_outbox_messages(messages))
+        await commit_unless_in_unit_of_work(self.db_session)
+
+    async def claim(self, limit: int, lease_seconds: float) -> List[OutboxMessageDb]:
+        rows = (await self.db_session.execute(claim_outbox_messages(limit, lease_seconds))).all()
+        await commit_unless_in_unit_of_work(self.db_session)
+        return sorted((map_outbox_model(row) for row in rows), key=lambda message: message.id)
+
+    async def delete_many(self, message_ids: List[int]) -> None:
+        if not message_ids:
+            return
+
+        await self.db_session.execute(delete(OutboxModel).where(OutboxModel.id.in_(message_ids)))
+        await commit_unless_in_unit_of_work(self.db_session)
+
+    async def retry_later(self, message_id: int, available_at: datetime, error: str) -> None:
+        await self.db_session.execute(
+            update_outbox_message(message_id, available_at=available_at, last_error=error)
+        )
+        await commit_unless_in_unit_of_work(self.db_session)
+
+    async def mark_failed(self, message_id: int, error: str) -> None:
+        await self.db_session.execute(
+            update_outbox_message(message_id, status=OutboxStatus.FAILED, last_error=error)
+        )
+        await commit_unless_in_unit_of_work(self.db_session)
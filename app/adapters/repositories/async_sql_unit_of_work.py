@@ -0,0 +1,33 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters.repositories.sql_unit_of_work import UNIT_OF_WORK_KEY, in_unit_of_work
+from app.domain.interfaces.async_unit_of_work import AsyncUnitOfWork
+
+
+async def commit_unless_in_unit_of_work(db_session: AsyncSession) -> None:
+    """Commit a repository write, or only flush it when a unit of work commits later"""
+    if in_unit_of_work(db_session):
+        await db_session.flush()
+    else:
+        await db_session.commit()
+
+
+class AsyncSQLUnitOfWork(AsyncUnitOfWork):
+    """Runs the writes of every async SQL repository on `db_session` in one transaction"""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def __aenter__(self) -> "AsyncSQLUnitOfWork":
+        self.db_session.info[UNIT_OF_WORK_KEY] = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.db_session.info.pop(UNIT_OF_WORK_KEY, None)
+        await super().__aexit__(exc_type, exc, tb)
+
+    async def commit(self) -> None:
+        await self.db_session.commit()
+
+    async def rollback(self) -> None:
+        await self.db_session.rollback()
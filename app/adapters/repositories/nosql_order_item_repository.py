@@ -1,73 +1,74 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pymongo.collection import Collection
 
 from app.adapters.models.nosql.connection import order_item_collection
+from app.adapters.models.nosql.id_allocator import IdAllocator, order_item_id_allocator
 from app.domain.entities.order import OrderItem, OrderItemDb
 from app.domain.interfaces.order_item_repository import OrderItemRepository
 
 
+# Document helpers shared with AsyncNoSQLOrderItemRepository
+
+def new_item_document(item_id: int, order_id: int, item: OrderItem, now: datetime) -> Dict[str, Any]:
+    return {
+        "_id": item_id,
+        "order_id": order_id,
+        "product_id": item.product_id,
+        "quantity": item.quantity,
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+def map_item_document(data: dict) -> OrderItemDb:
+    return OrderItemDb(
+        id=data["_id"],
+        order_id=data["order_id"],
+        product_id=data["product_id"],
+        quantity=data["quantity"],
+        created_at=data["created_at"],
+        updated_at=data["updated_at"]
+    )
+
+
 class NoSQLOrderItemRepository(OrderItemRepository):
-    def __init__(self, collection: Collection = order_item_collection):
+    def __init__(
+        self,
+        collection: Collection = order_item_collection,
+        id_allocator: IdAllocator = order_item_id_allocator
+    ):
         self.collection = collection
+        self.id_allocator = id_allocator
 
     def get_by_order_id(self, order_id: int) -> List[OrderItemDb]:
         items = list(self.collection.find({"order_id": order_id}))
-        return [self._map_to_entity(item) for item in items]
+        return [map_item_document(item) for item in items]
 
     def create(self, order_id: int, item: OrderItem) -> OrderItemDb:
-        # Find the highest id to simulate auto-increment
-        last_item = self.collection.find_one(sort=[("_id", -1)])
-        next_id = 1 if not last_item else last_item["_id"] + 1
-        
-        now = datetime.utcnow()
-        item_dict = {
-            "_id": next_id,
-            "order_id": order_id,
-            "product_id": item.product_id,
-            "quantity": item.quantity,
-            "created_at": now,
-            "updated_at": now
-        }
-        
+        item_dict = new_item_document(self.id_allocator.next_id(), order_id, item, datetime.utcnow())
         self.collection.insert_one(item_dict)
-        return self._map_to_entity(item_dict)
+        return map_item_document(item_dict)
 
     def create_many(self, order_id: int, items: List[OrderItem]) -> List[OrderItemDb]:
-        # Find the highest id to simulate auto-increment
-        last_item = self.collection.find_one(sort=[("_id", -1)])
-        next_id = 1 if not last_item else last_item["_id"] + 1
+        return self.create_for_orders([(order_id, items)])
+
+    def create_for_orders(self, order_items: List[Tuple[int, List[OrderItem]]]) -> List[OrderItemDb]:
+        pairs = [(order_id, item) for order_id, items in order_items for item in items]
+        item_ids = self.id_allocator.allocate(len(pairs))
         
         now = datetime.utcnow()
-        item_dicts = []
-        
-        for i, item in enumerate(items):
-            item_dict = {
-                "_id": next_id + i,
-                "order_id": order_id,
-                "product_id": item.product_id,
-                "quantity": item.quantity,
-                "created_at": now,
-                "updated_at": now
-            }
-            item_dicts.append(item_dict)
+        item_dicts = [
+            new_item_document(item_id, order_id, item, now)
+            for item_id, (order_id, item) in zip(item_ids, pairs)
+        ]
         
         if item_dicts:
             self.collection.insert_many(item_dicts)
         
-        return [self._map_to_entity(item) for item in item_dicts]
+        return [map_item_document(item) for item in item_dicts]
 
     def delete(self, item_id: int) -> bool:
         result = self.collection.delete_one({"_id": item_id})
         return result.deleted_count > 0
-    
-    def _map_to_entity(self, data: dict) -> OrderItemDb:
-        return OrderItemDb(
-            id=data["_id"],
-            order_id=data["order_id"],
-            product_id=data["product_id"],
-            quantity=data["quantity"],
-            created_at=data["created_at"],
-            updated_at=data["updated_at"]
-        ) 
\ No newline at end of file
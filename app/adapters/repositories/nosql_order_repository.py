@@ -1,119 +1,440 @@
+from collections import defaultdict
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from pymongo.collection import Collection
 
-from app.adapters.models.nosql.connection import order_collection, order_item_collection
-from app.domain.entities.order import Order, OrderDb, OrderItemDb, OrderStatus, PaymentStatus
+from app.adapters.models.nosql.connection import (
+    order_collection, order_item_collection, order_status_count_collection
+)
+from app.adapters.models.nosql.id_allocator import IdAllocator, order_id_allocator
+from app.adapters.repositories.nosql_order_item_repository import map_item_document
+from app.domain.entities.order import (
+    AnalyticsGroup,
+    AnalyticsInterval,
+    Order,
+    OrderAnalyticsBucket,
+    OrderCursor,
+    OrderDb,
+    OrderItemDb,
+    OrderPage,
+    OrderStatus,
+    OrderSummary,
+    OrderSummaryPage,
+    PaymentStatus,
+    status_count_changes,
+)
 from app.domain.interfaces.order_repository import OrderRepository
 
 
+# Queries and mapping shared with AsyncNoSQLOrderRepository
+
+ORDER_PAGE_SORT = [("created_at", 1), ("_id", 1)]
+
+STATUS_COUNT_PIPELINE = [{"$group": {"_id": "$status", "count": {"$sum": 1}}}]
+
+
+def order_page_query(
+    cursor: Optional[OrderCursor] = None,
+    status: Optional[OrderStatus] = None,
+    customer_id: Optional[int] = None
+) -> Dict[str, Any]:
+    query: Dict[str, Any] = {}
+    if status is not None:
+        query["status"] = status
+    if customer_id is not None:
+        query["customer_id"] = customer_id
+    if cursor is not None:
+        query["$or"] = [
+            {"created_at": {"$gt": cursor.created_at}},
+            {"created_at": cursor.created_at, "_id": {"$gt": cursor.id}},
+        ]
+    return query
+
+
+def split_page(orders: List[dict], limit: int) -> Tuple[List[dict], Optional[OrderCursor]]:
+    # Pages are fetched with limit + 1 documents to know whether another page exists
+    if len(orders) <= limit:
+        return orders, None
+    orders = orders[:limit]
+    return orders, OrderCursor(created_at=orders[-1]["created_at"], id=orders[-1]["_id"])
+
+
+def items_by_order_query(orders: List[dict]) -> Dict[str, Any]:
+    return {"order_id": {"$in": [order["_id"] for order in orders]}}
+
+
+def group_items(items: Iterable[dict]) -> Dict[int, List[dict]]:
+    items_by_order: Dict[int, List[dict]] = defaultdict(list)
+    for item in items:
+        items_by_order[item["order_id"]].append(item)
+    return items_by_order
+
+
+def new_order_document(
+    order_id: int, order: Order, now: datetime, total: Decimal = Decimal("0")
+) -> Dict[str, Any]:
+    return {
+        "_id": order_id,
+        "customer_id": order.customer_id,
+        "status": OrderStatus.PLACED,
+        "payment_status": PaymentStatus.PENDING,
+        "total": float(total),
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+def orders_status_filter(order_ids: List[int], expected_status: Optional[OrderStatus]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"_id": {"$in": order_ids}}
+    if expected_status is not None:
+        query["status"] = expected_status
+    return query
+
+
+def status_write_update(status: OrderStatus, now: datetime, write_id: ObjectId) -> Dict[str, Any]:
+    # update_many does not report which documents it changed, so each bulk write tags
+    # them with its own id; an updated_at stamp could be shared by a concurrent write
+    return {"$set": {"status": status, "updated_at": now, "status_write_id": write_id}}
+
+
+def status_write_filter(order_ids: List[int], write_id: ObjectId) -> Dict[str, Any]:
+    return {"_id": {"$in": order_ids}, "status_write_id": write_id}
+
+
+def payment_transition_update(
+    payment_status: PaymentStatus, status_change: Optional[Tuple[OrderStatus, OrderStatus]], now: datetime
+) -> List[Dict[str, Any]]:
+    fields: Dict[str, Any] = {"payment_status": payment_status, "updated_at": now}
+    if status_change is not None:
+        from_status, to_status = status_change
+        # Pipeline update: the status is decided against the stored document in the same write
+        fields["status"] = {"$cond": [{"$eq": ["$status", from_status]}, to_status, "$status"]}
+    return [{"$set": fields}]
+
+
+def apply_payment_transition(
+    previous: Dict[str, Any],
+    payment_status: PaymentStatus,
+    status_change: Optional[Tuple[OrderStatus, OrderStatus]],
+    now: datetime
+) -> Dict[str, Any]:
+    """The document payment_transition_update turns `previous` into"""
+    order = {**previous, "payment_status": payment_status, "updated_at": now}
+    if status_change is not None and previous["status"] == status_change[0]:
+        order["status"] = status_change[1]
+    return order
+
+
+def status_count_updates(changes: Dict[OrderStatus, int]) -> List[UpdateOne]:
+    # Counter documents are keyed by status and created by the first change
+    return [
+        UpdateOne({"_id": status.value}, {"$inc": {"count": change}}, upsert=True)
+        for status, change in changes.items()
+        if change
+    ]
+
+
+def map_status_counts(documents: Iterable[dict]) -> Dict[OrderStatus, int]:
+    # Accepts counter documents or STATUS_COUNT_PIPELINE results, both {_id: status, count}
+    counts = {status: 0 for status in OrderStatus}
+    for document in documents:
+        counts[OrderStatus(document["_id"])] = document["count"]
+    return counts
+
+
+def order_analytics_pipeline(
+    start: datetime,
+    end: datetime,
+    interval: AnalyticsInterval,
+    group_by: Optional[AnalyticsGroup],
+    item_collection_name: str
+) -> List[Dict[str, Any]]:
+    """Same aggregates as the SQL GROUP BY, computed by the server over the created_at index range"""
+    key: Dict[str, Any] = {"bucket_start": {"$dateTrunc": {"date": "$created_at", "unit": interval.value}}}
+    if group_by is not None:
+        key["group"] = f"${group_by.value}"
+    return [
+        {"$match": {"created_at": {"$gte": start, "$lt": end}}},
+        {"$lookup": {
+            "from": item_collection_name,
+            "localField": "_id",
+            "foreignField": "order_id",
+            "pipeline": [{"$project": {"_id": 0, "quantity": 1}}],
+            "as": "items",
+        }},
+        {"$group": {
+            "_id": key,
+            "order_count": {"$sum": 1},
+            "revenue": {"$sum": "$total"},
+            "item_count": {"$sum": {"$sum": "$items.quantity"}},
+        }},
+        {"$sort": {"_id.bucket_start": 1, "_id.group": 1}},
+    ]
+
+
+def map_order_analytics(documents: Iterable[dict]) -> List[OrderAnalyticsBucket]:
+    return [
+        OrderAnalyticsBucket.from_totals(
+            document["_id"]["bucket_start"],
+            document["_id"].get("group"),
+            document["order_count"],
+            document["revenue"],
+            document["item_count"]
+        )
+        for document in documents
+    ]
+
+
+def status_count_replacements(counts: Dict[OrderStatus, int]) -> List[UpdateOne]:
+    return [
+        UpdateOne({"_id": status.value}, {"$set": {"count": count}}, upsert=True)
+        for status, count in counts.items()
+    ]
+
+
+def order_summary_projection(fields: FrozenSet[str]) -> Dict[str, int]:
+    # _id is always returned; created_at is kept for the next cursor
+    projection = {name: 1 for name in fields if name not in ("id", "items")}
+    projection["created_at"] = 1
+    return projection
+
+
+def map_order_summary_document(data: dict, fields: FrozenSet[str], items_data: Iterable[dict]) -> OrderSummary:
+    values: Dict[str, Any] = {name: data.get(name) for name in fields if name not in ("id", "items")}
+    if "total" in values:
+        values["total"] = Decimal(str(values["total"]))
+    if "items" in fields:
+        values["items"] = [map_item_document(item) for item in items_data]
+    return OrderSummary(id=data["_id"], **values)
+
+
+def map_order_document(data: dict, items_data: Iterable[dict]) -> OrderDb:
+    items = [
+        OrderItemDb(
+            id=item["_id"],
+            order_id=item["order_id"],
+            product_id=item["product_id"],
+            quantity=item["quantity"],
+            created_at=item["created_at"],
+            updated_at=item["updated_at"]
+        )
+        for item in items_data
+    ]
+    
+    return OrderDb(
+        id=data["_id"],
+        customer_id=data.get("customer_id"),
+        status=OrderStatus(data["status"]),
+        payment_status=PaymentStatus(data["payment_status"]),
+        items=items,
+        total=Decimal(str(data["total"])),
+        created_at=data["created_at"],
+        updated_at=data["updated_at"]
+    )
+
+
 class NoSQLOrderRepository(OrderRepository):
-    def __init__(self, collection: Collection = order_collection):
+    def __init__(
+        self,
+        collection: Collection = order_collection,
+        item_collection: Collection = order_item_collection,
+        id_allocator: IdAllocator = order_id_allocator,
+        count_collection: Collection = order_status_count_collection
+    ):
         self.collection = collection
-        self.item_collection = order_item_collection
+        self.item_collection = item_collection
+        self.id_allocator = id_allocator
+        # Without transactions the counters follow each order write; rebuild_status_counts repairs drift
+        self.count_collection = count_collection
 
     def get_all(self) -> List[OrderDb]:
         orders = list(self.collection.find())
-        return [self._map_to_entity(order) for order in orders]
+        return self._map_many(orders)
 
     def get_by_id(self, order_id: int) -> Optional[OrderDb]:
         order = self.collection.find_one({"_id": order_id})
         return self._map_to_entity(order) if order else None
 
+    def get_version(self, order_id: int) -> Optional[datetime]:
+        order = self.collection.find_one({"_id": order_id}, {"updated_at": 1})
+        return order["updated_at"] if order else None
+
     def get_by_status(self, status: OrderStatus) -> List[OrderDb]:
         orders = list(self.collection.find({"status": status}))
-        return [self._map_to_entity(order) for order in orders]
+        return self._map_many(orders)
 
-    def create(self, order: Order) -> OrderDb:
-        # Find the highest id to simulate auto-increment
-        last_order = self.collection.find_one(sort=[("_id", -1)])
-        next_id = 1 if not last_order else last_order["_id"] + 1
+    def get_page(
+        self, limit: int, cursor: Optional[OrderCursor] = None, status: Optional[OrderStatus] = None
+    ) -> OrderPage:
+        orders = list(
+            self.collection.find(order_page_query(cursor, status)).sort(ORDER_PAGE_SORT).limit(limit + 1)
+        )
+        orders, next_cursor = split_page(orders, limit)
+        return OrderPage(items=self._map_many(orders), next_cursor=next_cursor)
+
+    def get_by_customer(self, customer_id: int, limit: int, cursor: Optional[OrderCursor] = None) -> OrderPage:
+        orders = list(
+            self.collection.find(order_page_query(cursor, customer_id=customer_id))
+            .sort(ORDER_PAGE_SORT)
+            .limit(limit + 1)
+        )
+        orders, next_cursor = split_page(orders, limit)
+        return OrderPage(items=self._map_many(orders), next_cursor=next_cursor)
+
+    def get_summary_page(
+        self,
+        fields: FrozenSet[str],
+        limit: int,
+        cursor: Optional[OrderCursor] = None,
+        status: Optional[OrderStatus] = None,
+        customer_id: Optional[int] = None
+    ) -> OrderSummaryPage:
+        orders = list(
+            self.collection.find(order_page_query(cursor, status, customer_id), order_summary_projection(fields))
+            .sort(ORDER_PAGE_SORT)
+            .limit(limit + 1)
+        )
+        orders, next_cursor = split_page(orders, limit)
+        items_by_order: Dict[int, List[dict]] = defaultdict(list)
+        if "items" in fields and orders:
+            items_by_order = group_items(self.item_collection.find(items_by_order_query(orders)))
+        summaries = [map_order_summary_document(order, fields, items_by_order[order["_id"]]) for order in orders]
+        return OrderSummaryPage(items=summaries, next_cursor=next_cursor)
+
+    def create(self, order: Order, total: Decimal = Decimal("0")) -> OrderDb:
+        order_dict = new_order_document(self.id_allocator.next_id(), order, datetime.utcnow(), total)
+        self.collection.insert_one(order_dict)
+        self._change_status_counts({OrderStatus.PLACED: 1})
+        
+        # Return order with empty items list since they'll be added separately
+        return map_order_document(order_dict, [])
+
+    def create_many(self, orders: List[Order], totals: List[Decimal]) -> List[OrderDb]:
+        order_ids = self.id_allocator.allocate(len(orders))
         
         now = datetime.utcnow()
-        order_dict = {
-            "_id": next_id,
-            "customer_id": order.customer_id,
-            "status": OrderStatus.PLACED,
-            "payment_status": PaymentStatus.PENDING,
-            "total": 0,
-            "created_at": now,
-            "updated_at": now
-        }
+        order_dicts = [
+            new_order_document(order_id, order, now, total)
+            for order_id, order, total in zip(order_ids, orders, totals)
+        ]
         
-        self.collection.insert_one(order_dict)
+        if order_dicts:
+            self.collection.insert_many(order_dicts)
+            self._change_status_counts({OrderStatus.PLACED: len(order_dicts)})
         
-        # Return order with empty items list since they'll be added separately
-        return OrderDb(
-            id=next_id,
-            customer_id=order.customer_id,
-            status=OrderStatus.PLACED,
-            payment_status=PaymentStatus.PENDING,
-            items=[],
-            total=Decimal("0"),
-            created_at=now,
-            updated_at=now
-        )
+        return [map_order_document(order_dict, []) for order_dict in order_dicts]
 
     def update_status(self, order_id: int, status: OrderStatus) -> Optional[OrderDb]:
+        # The document before the write tells which counter to decrement
         now = datetime.utcnow()
-        result = self.collection.update_one(
+        previous = self.collection.find_one_and_update(
             {"_id": order_id},
-            {"$set": {"status": status, "updated_at": now}}
+            {"$set": {"status": status, "updated_at": now}},
+            return_document=ReturnDocument.BEFORE
         )
-        
-        if result.modified_count == 0:
+        if not previous:
             return None
-            
-        return self.get_by_id(order_id)
+        
+        self._change_status_counts(status_count_changes([OrderStatus(previous["status"])], status))
+        return self._map_to_entity({**previous, "status": status, "updated_at": now})
+
+    def update_status_many(
+        self, order_ids: List[int], status: OrderStatus, expected_status: Optional[OrderStatus] = None
+    ) -> List[int]:
+        now = datetime.utcnow()
+        write_id = ObjectId()
+        if expected_status is not None:
+            previous_ids = {expected_status: order_ids}
+        else:
+            previous_ids = defaultdict(list)
+            for order in self.collection.find({"_id": {"$in": order_ids}}, projection={"status": 1}):
+                previous_ids[OrderStatus(order["status"])].append(order["_id"])
+        
+        moved: List[OrderStatus] = []
+        for previous_status, ids in previous_ids.items():
+            # Pinning the previous status makes modified_count exact for the counters
+            result = self.collection.update_many(
+                orders_status_filter(ids, previous_status),
+                status_write_update(status, now, write_id)
+            )
+            moved.extend([previous_status] * result.modified_count)
+        self._change_status_counts(status_count_changes(moved, status))
+        
+        updated = self.collection.find(status_write_filter(order_ids, write_id), projection={"_id": 1})
+        return [order["_id"] for order in updated]
 
     def update_payment_status(self, order_id: int, payment_status: PaymentStatus) -> Optional[OrderDb]:
+        return self._update(order_id, {"payment_status": payment_status})
+    
+    def transition_payment_status(
+        self,
+        order_id: int,
+        payment_status: PaymentStatus,
+        from_payment_statuses: List[PaymentStatus],
+        status_change: Optional[Tuple[OrderStatus, OrderStatus]] = None
+    ) -> Optional[OrderDb]:
         now = datetime.utcnow()
-        result = self.collection.update_one(
-            {"_id": order_id},
-            {"$set": {"payment_status": payment_status, "updated_at": now}}
+        previous = self.collection.find_one_and_update(
+            {"_id": order_id, "payment_status": {"$in": from_payment_statuses}},
+            payment_transition_update(payment_status, status_change, now),
+            return_document=ReturnDocument.BEFORE
         )
-        
-        if result.modified_count == 0:
+        if not previous:
             return None
-            
-        return self.get_by_id(order_id)
+        
+        order = apply_payment_transition(previous, payment_status, status_change, now)
+        self._change_status_counts(
+            status_count_changes([OrderStatus(previous["status"])], OrderStatus(order["status"]))
+        )
+        return self._map_to_entity(order)
     
     def update_total(self, order_id: int, total: Decimal) -> Optional[OrderDb]:
-        now = datetime.utcnow()
-        result = self.collection.update_one(
+        return self._update(order_id, {"total": float(total)})
+    
+    def get_analytics(
+        self,
+        start: datetime,
+        end: datetime,
+        interval: AnalyticsInterval,
+        group_by: Optional[AnalyticsGroup] = None
+    ) -> List[OrderAnalyticsBucket]:
+        pipeline = order_analytics_pipeline(start, end, interval, group_by, self.item_collection.name)
+        return map_order_analytics(self.collection.aggregate(pipeline))
+
+    def get_status_counts(self) -> Dict[OrderStatus, int]:
+        return map_status_counts(self.count_collection.find())
+
+    def rebuild_status_counts(self) -> Dict[OrderStatus, int]:
+        counts = map_status_counts(self.collection.aggregate(STATUS_COUNT_PIPELINE))
+        self.count_collection.bulk_write(status_count_replacements(counts))
+        return counts
+    
+    def _update(self, order_id: int, fields: Dict[str, Any]) -> Optional[OrderDb]:
+        # The updated document comes back from the write itself
+        order = self.collection.find_one_and_update(
             {"_id": order_id},
-            {"$set": {"total": float(total), "updated_at": now}}
+            {"$set": {**fields, "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
         )
+        return self._map_to_entity(order) if order else None
+    
+    def _change_status_counts(self, changes: Dict[OrderStatus, int]) -> None:
+        updates = status_count_updates(changes)
+        if updates:
+            self.count_collection.bulk_write(updates)
+    
+    def _map_many(self, orders: List[dict]) -> List[OrderDb]:
+        # Fetch the items of every order in one $in query and stitch them in memory
+        if not orders:
+            return []
         
-        if result.modified_count == 0:
-            return None
-            
-        return self.get_by_id(order_id)
+        items_by_order = group_items(self.item_collection.find(items_by_order_query(orders)))
+        return [map_order_document(order, items_by_order[order["_id"]]) for order in orders]
     
     def _map_to_entity(self, data: dict) -> OrderDb:
-        # Get all items for this order
-        items_data = list(self.item_collection.find({"order_id": data["_id"]}))
-        items = [
-            OrderItemDb(
-                id=item["_id"],
-                order_id=item["order_id"],
-                product_id=item["product_id"],
-                quantity=item["quantity"],
-                created_at=item["created_at"],
-                updated_at=item["updated_at"]
-            )
-            for item in items_data
-        ]
-        
-        return OrderDb(
-            id=data["_id"],
-            customer_id=data.get("customer_id"),
-            status=OrderStatus(data["status"]),
-            payment_status=PaymentStatus(data["payment_status"]),
-            items=items,
-            total=Decimal(str(data["total"])),
-            created_at=data["created_at"],
-            updated_at=data["updated_at"]
-        ) 
\ No newline at end of file
+        # Single lookups fetch their own items
+        return map_order_document(data, self.item_collection.find({"order_id": data["_id"]}))
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pymongo.collection import Collection
+
+from app.adapters.models.nosql.connection import outbox_collection
+from app.adapters.models.nosql.id_allocator import IdAllocator, outbox_id_allocator
+from app.domain.entities.outbox import OutboxMessage, OutboxMessageDb, OutboxStatus
+from app.domain.interfaces.outbox_repository import OutboxRepository
+
+
+# Document helpers shared with AsyncNoSQLOutboxRepository
+
+DUE_OUTBOX_SORT = [("available_at", 1), ("_id", 1)]
+
+
+def new_outbox_document(message_id: int, message: OutboxMessage, now: datetime) -> Dict[str, Any]:
+    return {
+        "_id": message_id,
+        "kind": message.kind.value,
+        "payload": message.payload,
+        "status": OutboxStatus.PENDING.value,
+        "attempts": 0,
+        "available_at": now,
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+def due_outbox_filter(now: datetime) -> Dict[str, Any]:
+    return {"status": OutboxStatus.PENDING.value, "available_at": {"$lte": now}}
+
+
+def claim_outbox_update(claim_id: ObjectId, now: datetime, lease_seconds: float) -> Dict[str, Any]:
+    # The claim id tags this worker's documents so they can be read back after update_many
+    return {
+        "$set": {
+            "claim_id": claim_id,
+            "available_at": now + timedelta(seconds=lease_seconds),
+            "updated_at": now
+        },
+        "$inc": {"attempts": 1}
+    }
+
+
+def map_outbox_document(data: dict) -> OutboxMessageDb:
+    return OutboxMessageDb(
+        id=data["_id"],
+        kind=data["kind"],
+        payload=data["payload"],
+        status=data["status"],
+        attempts=data["attempts"],
+        available_at=data["available_at"],
+        created_at=data["created_at"]
+    )
+
+
+class NoSQLOutboxRepository(OutboxRepository):
+    def __init__(
+        self,
+        collection: Collection = outbox_collection,
+        id_allocator: IdAllocator = outbox_id_allocator
+    ):
+        self.collection = collection
+        self.id_allocator = id_allocator
+
+    def add_many(self, messages: List[OutboxMessage]) -> None:
+        if not messages:
+            return
+
+        now = datetime.utcnow()
+        message_ids = self.id_allocator.allocate(len(messages))
+        self.collection.insert_many([
+            new_outbox_document(message_id, message, now)
+            for message_id, message in zip(message_ids, messages)
+        ])
+
+    def claim(self, limit: int, lease_seconds: float) -> List[OutboxMessageDb]:
+        now = datetime.utcnow()
+        due = self.collection.find(due_outbox_filter(now), {"_id": 1}).sort(DUE_OUTBOX_SORT).limit(limit)
+        due_ids = [document["_id"] for document in due]
+        if not due_ids:
+            return []
+
+        # Re-checking the due filter skips documents another worker claimed in between
+        claim_id = ObjectId()
+        self.collection.update_many(
+            {"_id": {"$in": due_ids}, **due_outbox_filter(now)},
+            claim_outbox_update(claim_id, now, lease_seconds)
+        )
+        claimed = self.collection.find({"claim_id": claim_id}).sort("_id", 1)
+        return [map_outbox_document(document) for document in claimed]
+
+    def delete_many(self, message_ids: List[int]) -> None:
+        if message_ids:
+            self.collection.delete_many({"_id": {"$in": message_ids}})
+
+    def retry_later(self, message_id: int, available_at: datetime, error: str) -> None:
+        self.collection.update_one(
+            {"_id": message_id},
+            {"$set": {"available_at": available_at, "last_error": error, "updated_at": datetime.utcnow()}}
+        )
+
+    def mark_failed(self, message_id: int, error: str) -> None:
+        self.collection.update_one(
+            {"_id": message_id},
+            {"$set": {
+                "status": OutboxStatus.FAILED.value,
+                "last_error": error,
+                "updated_at": datetime.utcnow()
+            }}
+        )
@@ -1,19 +1,59 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy import Insert, insert
 from sqlalchemy.orm import Session
 
 from app.adapters.models.sql.order_item_model import OrderItemModel
+from app.adapters.repositories.sql_unit_of_work import commit_unless_in_unit_of_work
 from app.domain.entities.order import OrderItem, OrderItemDb
 from app.domain.interfaces.order_item_repository import OrderItemRepository
 
 
+# Statement builders and mapping shared with AsyncSQLOrderItemRepository
+
+def insert_order_items() -> Insert:
+    """
+    Batched INSERT ... RETURNING for new_order_item_rows(). Rows come back in parameter
+    order: as one statement where the dialect can guarantee it, else row by row
+    """
+    return insert(OrderItemModel).returning(*OrderItemModel.__table__.columns, sort_by_parameter_order=True)
+
+
+def new_order_item_rows(order_items: List[Tuple[int, List[OrderItem]]]) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    return [
+        {
+            "order_id": order_id,
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for order_id, items in order_items
+        for item in items
+    ]
+
+
+def map_order_item_model(model) -> OrderItemDb:
+    # Accepts an OrderItemModel or a row RETURNING its columns
+    return OrderItemDb(
+        id=model.id,
+        order_id=model.order_id,
+        product_id=model.product_id,
+        quantity=model.quantity,
+        created_at=model.created_at,
+        updated_at=model.updated_at
+    )
+
+
 class SQLOrderItemRepository(OrderItemRepository):
     def __init__(self, db_session: Session):
         self.db_session = db_session
 
     def get_by_order_id(self, order_id: int) -> List[OrderItemDb]:
         items = self.db_session.query(OrderItemModel).filter(OrderItemModel.order_id == order_id).all()
-        return [self._map_to_entity(item) for item in items]
+        return [map_order_item_model(item) for item in items]
 
     def create(self, order_id: int, item: OrderItem) -> OrderItemDb:
         db_item = OrderItemModel(
@@ -23,30 +63,22 @@ class SQLOrderItemRepository(OrderItemRepository):
         )
         
         self.db_session.add(db_item)
-        self.db_session.commit()
-        self.db_session.refresh(db_item)
+        self.db_session.flush()
         
-        return self._map_to_entity(db_item)
+        created_item = map_order_item_model(db_item)
+        commit_unless_in_unit_of_work(self.db_session)
+        return created_item
 
     def create_many(self, order_id: int, items: List[OrderItem]) -> List[OrderItemDb]:
-        db_items = []
-        
-        for item in items:
-            db_item = OrderItemModel(
-                order_id=order_id,
-                product_id=item.product_id,
-                quantity=item.quantity
-            )
-            self.db_session.add(db_item)
-            db_items.append(db_item)
-        
-        self.db_session.commit()
-        
-        # Refresh all items to get their generated IDs
-        for item in db_items:
-            self.db_session.refresh(item)
+        return self.create_for_orders([(order_id, items)])
+
+    def create_for_orders(self, order_items: List[Tuple[int, List[OrderItem]]]) -> List[OrderItemDb]:
+        if not any(items for _, items in order_items):
+            return []
         
-        return [self._map_to_entity(item) for item in db_items]
+        rows = self.db_session.execute(insert_order_items(), new_order_item_rows(order_items)).all()
+        commit_unless_in_unit_of_work(self.db_session)
+        return [map_order_item_model(row) for row in rows]
 
     def delete(self, item_id: int) -> bool:
         item = self.db_session.query(OrderItemModel).filter(OrderItemModel.id == item_id).first()
@@ -54,15 +86,5 @@ class SQLOrderItemRepository(OrderItemRepository):
             return False
         
         self.db_session.delete(item)
-        self.db_session.commit()
+        commit_unless_in_unit_of_work(self.db_session)
         return True
-    
-    def _map_to_entity(self, model: OrderItemModel) -> OrderItemDb:
-        return OrderItemDb(
-            id=model.id,
-            order_id=model.order_id,
-            product_id=model.product_id,
-            quantity=model.quantity,
-            created_at=model.created_at,
-            updated_at=model.updated_at
-        ) 
\ No newline at end of file
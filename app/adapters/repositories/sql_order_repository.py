@@ -1,90 +1,475 @@
+from collections import defaultdict
+from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, Insert, Row, Select, Update, case, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session, selectinload
 
+from app.adapters.models.sql.order_item_model import OrderItemModel
 from app.adapters.models.sql.order_model import OrderModel
-from app.domain.entities.order import Order, OrderDb, OrderStatus, PaymentStatus
+from app.adapters.models.sql.order_status_count_model import OrderStatusCountModel
+from app.adapters.repositories.sql_order_item_repository import map_order_item_model
+from app.adapters.repositories.sql_unit_of_work import commit_unless_in_unit_of_work
+from app.domain.entities.order import (
+    AnalyticsGroup,
+    AnalyticsInterval,
+    Order,
+    OrderAnalyticsBucket,
+    OrderCursor,
+    OrderDb,
+    OrderPage,
+    OrderStatus,
+    OrderSummary,
+    OrderSummaryPage,
+    PaymentStatus,
+    status_count_changes,
+)
 from app.domain.interfaces.order_repository import OrderRepository
 
 
+# Statement builders and mapping shared with AsyncSQLOrderRepository
+
+def select_orders() -> Select:
+    # Load the items of every order in the result with a single SELECT ... IN
+    # instead of one lazy SELECT per order when the entities are mapped
+    return select(OrderModel).options(selectinload(OrderModel.items))
+
+
+def paginate_orders(
+    statement: Select,
+    limit: int,
+    cursor: Optional[OrderCursor] = None,
+    status: Optional[OrderStatus] = None,
+    customer_id: Optional[int] = None
+) -> Select:
+    if status is not None:
+        statement = statement.where(OrderModel.status == status)
+    if customer_id is not None:
+        statement = statement.where(OrderModel.customer_id == customer_id)
+    if cursor is not None:
+        statement = statement.where(
+            tuple_(OrderModel.created_at, OrderModel.id) > tuple_(cursor.created_at, cursor.id)
+        )
+    # Fetch one extra row to know whether another page exists
+    return statement.order_by(OrderModel.created_at, OrderModel.id).limit(limit + 1)
+
+
+def select_order_page(
+    limit: int,
+    cursor: Optional[OrderCursor] = None,
+    status: Optional[OrderStatus] = None,
+    customer_id: Optional[int] = None
+) -> Select:
+    return paginate_orders(select_orders(), limit, cursor, status, customer_id)
+
+
+def select_order_summary_page(
+    fields: FrozenSet[str],
+    limit: int,
+    cursor: Optional[OrderCursor] = None,
+    status: Optional[OrderStatus] = None,
+    customer_id: Optional[int] = None
+) -> Select:
+    # Only the requested columns, plus the keyset columns the next cursor is built from;
+    # items are left to select_items_of_orders
+    names = {"id", "created_at"} | fields
+    columns = [column for column in OrderModel.__table__.columns if column.name in names]
+    return paginate_orders(select(*columns), limit, cursor, status, customer_id)
+
+
+def select_items_of_orders(order_ids: List[int]) -> Select:
+    return (
+        select(OrderItemModel)
+        .where(OrderItemModel.order_id.in_(order_ids))
+        .order_by(OrderItemModel.order_id, OrderItemModel.id)
+    )
+
+
+def trim_page(rows: Sequence[Any], limit: int) -> Tuple[Sequence[Any], Optional[OrderCursor]]:
+    # Pages are fetched with limit + 1 rows to know whether another page exists
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, OrderCursor(created_at=rows[-1].created_at, id=rows[-1].id)
+
+
+def build_order_summary_page(
+    rows: Sequence[Row],
+    fields: FrozenSet[str],
+    items: Sequence[OrderItemModel],
+    next_cursor: Optional[OrderCursor]
+) -> OrderSummaryPage:
+    items_by_order: Dict[int, List[OrderItemModel]] = defaultdict(list)
+    for item in items:
+        items_by_order[item.order_id].append(item)
+
+    summaries = []
+    for row in rows:
+        values = {name: row._mapping[name] for name in fields if name != "items"}
+        if "items" in fields:
+            values["items"] = [map_order_item_model(item) for item in items_by_order[row.id]]
+        summaries.append(OrderSummary(**{**values, "id": row.id}))
+    return OrderSummaryPage(items=summaries, next_cursor=next_cursor)
+
+
+def build_order_page(orders: Sequence[OrderModel], limit: int) -> OrderPage:
+    orders, next_cursor = trim_page(orders, limit)
+    return OrderPage(items=[map_order_model(order) for order in orders], next_cursor=next_cursor)
+
+
+def update_order(order_id: int, *conditions: ColumnElement[bool], **values: Any) -> Update:
+    # The changed row comes back from the UPDATE itself, no SELECT to reload it
+    return (
+        update(OrderModel)
+        .where(OrderModel.id == order_id, *conditions)
+        .values(**values)
+        .returning(*OrderModel.__table__.columns)
+    )
+
+
+def update_orders_status(
+    order_ids: List[int], status: OrderStatus, expected_status: Optional[OrderStatus] = None
+) -> Update:
+    """One set-based UPDATE for many orders, RETURNING the ids it changed"""
+    statement = update(OrderModel).where(OrderModel.id.in_(order_ids))
+    if expected_status is not None:
+        statement = statement.where(OrderModel.status == expected_status)
+    return statement.values(status=status).returning(OrderModel.id)
+
+
+def payment_transition_values(
+    payment_status: PaymentStatus, status_change: Optional[Tuple[OrderStatus, OrderStatus]]
+) -> dict:
+    values: dict = {"payment_status": payment_status}
+    if status_change is not None:
+        from_status, to_status = status_change
+        # Evaluated against the row being updated, so both columns change atomically
+        values["status"] = case((OrderModel.status == from_status, to_status), else_=OrderModel.status)
+    return values
+
+
+def select_order_items(order_id: int) -> Select:
+    return select(OrderItemModel).where(OrderItemModel.order_id == order_id).order_by(OrderItemModel.id)
+
+
+def select_statuses_for_update(order_ids: List[int], *conditions: ColumnElement[bool]) -> Select:
+    """
+    (id, status) of the orders about to change, locked until commit so no change escapes the counters.
+    Pass the conditions of the write so rows it will not change are neither returned nor locked.
+    """
+    return (
+        select(OrderModel.id, OrderModel.status)
+        .where(OrderModel.id.in_(order_ids), *conditions)
+        .with_for_update()
+    )
+
+
+def change_status_counts(changes: Dict[OrderStatus, int]) -> Optional[Update]:
+    """One UPDATE applying the non-zero changes to the status counters, None when there are none"""
+    changes = {status: change for status, change in changes.items() if change}
+    if not changes:
+        return None
+    return (
+        update(OrderStatusCountModel)
+        .where(OrderStatusCountModel.status.in_(list(changes)))
+        .values(count=OrderStatusCountModel.count + case(changes, value=OrderStatusCountModel.status))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def insert_status_counts(statuses: Iterable[OrderStatus]) -> Insert:
+    return insert(OrderStatusCountModel).values([{"status": status, "count": 0} for status in statuses])
+
+
+def recount_status_counts() -> Update:
+    # Counted in place, so increments from transactions running meanwhile wait on the row locks
+    # and are applied on top of the recount instead of being lost
+    return (
+        update(OrderStatusCountModel)
+        .values(
+            count=select(func.count())
+            .where(OrderModel.status == OrderStatusCountModel.status)
+            .scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def map_status_counts(rows: Iterable[Tuple[str, int]]) -> Dict[OrderStatus, int]:
+    counts = {status: 0 for status in OrderStatus}
+    for status, count in rows:
+        counts[OrderStatus(status)] = count
+    return counts
+
+
+ANALYTICS_GROUP_COLUMNS = {
+    AnalyticsGroup.STATUS: OrderModel.status,
+    AnalyticsGroup.PAYMENT_STATUS: OrderModel.payment_status,
+}
+
+# SQLite has no date_trunc; formatting the timestamp down to the interval does the same
+SQLITE_INTERVAL_FORMATS = {
+    AnalyticsInterval.HOUR: "%Y-%m-%d %H:00:00",
+    AnalyticsInterval.DAY: "%Y-%m-%d 00:00:00",
+}
+
+
+def truncate_timestamp(column: ColumnElement, interval: AnalyticsInterval, dialect_name: str) -> ColumnElement:
+    if dialect_name == "sqlite":
+        return func.strftime(SQLITE_INTERVAL_FORMATS[interval], column)
+    return func.date_trunc(interval.value, column)
+
+
+def select_order_analytics(
+    start: datetime,
+    end: datetime,
+    interval: AnalyticsInterval,
+    group_by: Optional[AnalyticsGroup],
+    dialect_name: str
+) -> Select:
+    """
+    Count, revenue and item quantity per interval (and group) of the orders
+    created in [start, end), aggregated by the database with one GROUP BY
+    over the created_at index range.
+    """
+    item_count = (
+        select(func.sum(OrderItemModel.quantity))
+        .where(OrderItemModel.order_id == OrderModel.id)
+        .scalar_subquery()
+    )
+    keys = [truncate_timestamp(OrderModel.created_at, interval, dialect_name).label("bucket_start")]
+    if group_by is not None:
+        keys.append(ANALYTICS_GROUP_COLUMNS[group_by].label("group"))
+    return (
+        select(
+            *keys,
+            func.count().label("order_count"),
+            func.sum(OrderModel.total).label("revenue"),
+            func.sum(item_count).label("item_count"),
+        )
+        .where(OrderModel.created_at >= start, OrderModel.created_at < end)
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+
+
+def map_order_analytics(rows: Iterable[Row]) -> List[OrderAnalyticsBucket]:
+    return [
+        OrderAnalyticsBucket.from_totals(
+            row.bucket_start, row._mapping.get("group"), row.order_count, row.revenue, row.item_count
+        )
+        for row in rows
+    ]
+
+
+def new_order_model(order: Order, total: Decimal = Decimal("0")) -> OrderModel:
+    return OrderModel(
+        customer_id=order.customer_id,
+        status=OrderStatus.PLACED,
+        payment_status=PaymentStatus.PENDING,
+        total=total
+    )
+
+
+def insert_orders() -> Insert:
+    """
+    Batched INSERT ... RETURNING for new_order_rows(). Rows come back in parameter
+    order: as one statement where the dialect can guarantee it, else row by row
+    """
+    return insert(OrderModel).returning(*OrderModel.__table__.columns, sort_by_parameter_order=True)
+
+
+def new_order_rows(orders: List[Order], totals: List[Decimal]) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    return [
+        {
+            "customer_id": order.customer_id,
+            "status": OrderStatus.PLACED,
+            "payment_status": PaymentStatus.PENDING,
+            "total": total,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for order, total in zip(orders, totals)
+    ]
+
+
+def map_order_model(model: OrderModel, items: Optional[Sequence[OrderItemModel]] = None) -> OrderDb:
+    # Accepts an OrderModel or a row RETURNING its columns; items default to the loaded relationship
+    return OrderDb(
+        id=model.id,
+        customer_id=model.customer_id,
+        status=OrderStatus(model.status),
+        payment_status=PaymentStatus(model.payment_status),
+        items=model.items if items is None else items,
+        total=model.total,
+        created_at=model.created_at,
+        updated_at=model.updated_at
+    )
+
+
 class SQLOrderRepository(OrderRepository):
     def __init__(self, db_session: Session):
         self.db_session = db_session
 
     def get_all(self) -> List[OrderDb]:
-        orders = self.db_session.query(OrderModel).all()
-        return [self._map_to_entity(order) for order in orders]
+        orders = self.db_session.scalars(select_orders()).all()
+        return [map_order_model(order) for order in orders]
 
     def get_by_id(self, order_id: int) -> Optional[OrderDb]:
-        order = self.db_session.query(OrderModel).filter(OrderModel.id == order_id).first()
-        return self._map_to_entity(order) if order else None
+        order = self.db_session.scalars(select_orders().where(OrderModel.id == order_id)).first()
+        return map_order_model(order) if order else None
+
+    def get_version(self, order_id: int) -> Optional[datetime]:
+        return self.db_session.scalar(select(OrderModel.updated_at).where(OrderModel.id == order_id))
 
     def get_by_status(self, status: OrderStatus) -> List[OrderDb]:
-        orders = self.db_session.query(OrderModel).filter(OrderModel.status == status).all()
-        return [self._map_to_entity(order) for order in orders]
-
-    def create(self, order: Order) -> OrderDb:
-        db_order = OrderModel(
-            customer_id=order.customer_id,
-            status=OrderStatus.PLACED,
-            payment_status=PaymentStatus.PENDING,
-            total=Decimal("0.00")  # Initial total, will be updated after items are added
-        )
+        orders = self.db_session.scalars(select_orders().where(OrderModel.status == status)).all()
+        return [map_order_model(order) for order in orders]
+
+    def get_page(
+        self, limit: int, cursor: Optional[OrderCursor] = None, status: Optional[OrderStatus] = None
+    ) -> OrderPage:
+        orders = self.db_session.scalars(select_order_page(limit, cursor, status)).all()
+        return build_order_page(orders, limit)
+
+    def get_by_customer(self, customer_id: int, limit: int, cursor: Optional[OrderCursor] = None) -> OrderPage:
+        orders = self.db_session.scalars(select_order_page(limit, cursor, customer_id=customer_id)).all()
+        return build_order_page(orders, limit)
+
+    def get_summary_page(
+        self,
+        fields: FrozenSet[str],
+        limit: int,
+        cursor: Optional[OrderCursor] = None,
+        status: Optional[OrderStatus] = None,
+        customer_id: Optional[int] = None
+    ) -> OrderSummaryPage:
+        statement = select_order_summary_page(fields, limit, cursor, status, customer_id)
+        rows, next_cursor = trim_page(self.db_session.execute(statement).all(), limit)
+        items = []
+        if "items" in fields and rows:
+            items = self.db_session.scalars(select_items_of_orders([row.id for row in rows])).all()
+        return build_order_summary_page(rows, fields, items, next_cursor)
+
+    def create(self, order: Order, total: Decimal = Decimal("0")) -> OrderDb:
+        db_order = new_order_model(order, total)
         self.db_session.add(db_order)
-        self.db_session.commit()
-        self.db_session.refresh(db_order)
+        self.db_session.flush()
         
+        # Map while the flushed values are loaded, a commit expires them.
         # Return order with empty items list since they'll be added separately
-        return OrderDb(
-            id=db_order.id,
-            customer_id=db_order.customer_id,
-            status=OrderStatus(db_order.status),
-            payment_status=PaymentStatus(db_order.payment_status),
-            items=[],
-            total=db_order.total,
-            created_at=db_order.created_at,
-            updated_at=db_order.updated_at
-        )
+        created_order = map_order_model(db_order, items=[])
+        self._change_status_counts({OrderStatus.PLACED: 1})
+        commit_unless_in_unit_of_work(self.db_session)
+        return created_order
 
-    def update_status(self, order_id: int, status: OrderStatus) -> Optional[OrderDb]:
-        db_order = self.db_session.query(OrderModel).filter(OrderModel.id == order_id).first()
-        if not db_order:
-            return None
+    def create_many(self, orders: List[Order], totals: List[Decimal]) -> List[OrderDb]:
+        if not orders:
+            return []
         
-        db_order.status = status
-        self.db_session.commit()
-        self.db_session.refresh(db_order)
-        return self._map_to_entity(db_order)
+        rows = self.db_session.execute(insert_orders(), new_order_rows(orders, totals)).all()
+        self._change_status_counts({OrderStatus.PLACED: len(rows)})
+        commit_unless_in_unit_of_work(self.db_session)
+        return [map_order_model(row, items=[]) for row in rows]
+
+    def update_status(self, order_id: int, status: OrderStatus) -> Optional[OrderDb]:
+        return self._update(order_id, track_status=True, status=status)
+
+    def update_status_many(
+        self, order_ids: List[int], status: OrderStatus, expected_status: Optional[OrderStatus] = None
+    ) -> List[int]:
+        # With an expected status the UPDATE itself pins the previous status of every row
+        previous_statuses = {}
+        if expected_status is None:
+            previous_statuses = dict(self.db_session.execute(select_statuses_for_update(order_ids)).all())
+        updated_ids = self.db_session.scalars(update_orders_status(order_ids, status, expected_status)).all()
+        self._change_status_counts(status_count_changes(
+            (expected_status or OrderStatus(previous_statuses[order_id]) for order_id in updated_ids), status
+        ))
+        commit_unless_in_unit_of_work(self.db_session)
+        return list(updated_ids)
 
     def update_payment_status(self, order_id: int, payment_status: PaymentStatus) -> Optional[OrderDb]:
-        db_order = self.db_session.query(OrderModel).filter(OrderModel.id == order_id).first()
-        if not db_order:
-            return None
-        
-        db_order.payment_status = payment_status
-        self.db_session.commit()
-        self.db_session.refresh(db_order)
-        return self._map_to_entity(db_order)
+        return self._update(order_id, payment_status=payment_status)
+    
+    def transition_payment_status(
+        self,
+        order_id: int,
+        payment_status: PaymentStatus,
+        from_payment_statuses: List[PaymentStatus],
+        status_change: Optional[Tuple[OrderStatus, OrderStatus]] = None
+    ) -> Optional[OrderDb]:
+        return self._update(
+            order_id,
+            OrderModel.payment_status.in_(from_payment_statuses),
+            # Only a transition that can move the order status needs the counters
+            track_status=status_change is not None,
+            **payment_transition_values(payment_status, status_change)
+        )
     
     def update_total(self, order_id: int, total: Decimal) -> Optional[OrderDb]:
-        db_order = self.db_session.query(OrderModel).filter(OrderModel.id == order_id).first()
-        if not db_order:
+        return self._update(order_id, total=total)
+    
+    def get_status_counts(self) -> Dict[OrderStatus, int]:
+        rows = self.db_session.execute(select(OrderStatusCountModel.status, OrderStatusCountModel.count)).all()
+        return map_status_counts(rows)
+
+    def get_analytics(
+        self,
+        start: datetime,
+        end: datetime,
+        interval: AnalyticsInterval,
+        group_by: Optional[AnalyticsGroup] = None
+    ) -> List[OrderAnalyticsBucket]:
+        dialect_name = self.db_session.get_bind().dialect.name
+        rows = self.db_session.execute(select_order_analytics(start, end, interval, group_by, dialect_name))
+        return map_order_analytics(rows)
+
+    def rebuild_status_counts(self) -> Dict[OrderStatus, int]:
+        existing = set(self.db_session.scalars(select(OrderStatusCountModel.status)))
+        missing = [status for status in OrderStatus if status.value not in existing]
+        if missing:
+            self.db_session.execute(insert_status_counts(missing))
+        self.db_session.execute(recount_status_counts())
+        counts = self.get_status_counts()
+        commit_unless_in_unit_of_work(self.db_session)
+        return counts
+    
+    def _update(
+        self, order_id: int, *conditions: ColumnElement[bool], track_status: bool = False, **values: Any
+    ) -> Optional[OrderDb]:
+        # UPDATE ... RETURNING and the items: two statements. Only writes that can move the
+        # status (track_status) add a locking SELECT before and a status counters UPDATE after.
+        # The SELECT carries the write's conditions: a guarded write that will not apply locks nothing
+        previous_status = None
+        if track_status:
+            locked = self.db_session.execute(select_statuses_for_update([order_id], *conditions)).first()
+            if locked is None:
+                return None
+            previous_status = OrderStatus(locked.status)
+        
+        row = self.db_session.execute(update_order(order_id, *conditions, **values)).first()
+        if row is None:
             return None
         
-        db_order.total = total
-        self.db_session.commit()
-        self.db_session.refresh(db_order)
-        return self._map_to_entity(db_order)
+        items = self.db_session.scalars(select_order_items(order_id)).all()
+        # Map before a commit expires the loaded items
+        updated_order = map_order_model(row, items)
+        if track_status:
+            self._change_status_counts(status_count_changes([previous_status], updated_order.status))
+        commit_unless_in_unit_of_work(self.db_session)
+        return updated_order
     
-    def _map_to_entity(self, model: OrderModel) -> OrderDb:
-        return OrderDb(
-            id=model.id,
-            customer_id=model.customer_id,
-            status=OrderStatus(model.status),
-            payment_status=PaymentStatus(model.payment_status),
-            items=model.items,  # This will already contain the loaded items due to relationship
-            total=model.total,
-            created_at=model.created_at,
-            updated_at=model.updated_at
-        ) 
\ No newline at end of file
+    def _change_status_counts(self, changes: Dict[OrderStatus, int]) -> None:
+        statement = change_status_counts(changes)
+        if statement is not None:
+            self.db_session.execute(statement)
+
+
+def init_status_counts(db_session: Session) -> None:
+    """Count orders stored before the counters existed, which start at zero when the table is created"""
+    counted = db_session.scalar(select(func.sum(OrderStatusCountModel.count)))
+    if not counted and db_session.scalar(select(OrderModel.id).limit(1)) is not None:
+        SQLOrderRepository(db_session).rebuild_status_counts()
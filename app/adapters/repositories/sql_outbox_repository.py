@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import Insert, Update, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.adapters.models.sql.outbox_model import OutboxModel
+from app.adapters.repositories.sql_unit_of_work import commit_unless_in_unit_of_work
+from app.domain.entities.outbox import OutboxMessage, OutboxMessageDb, OutboxStatus
+from app.domain.interfaces.outbox_repository import OutboxRepository
+
+
+# Statement builders and mapping shared with AsyncSQLOutboxRepository
+
+def insert_outbox_messages(messages: List[OutboxMessage]) -> Insert:
+    now = datetime.utcnow()
+    return insert(OutboxModel).values([
+        {
+            "kind": message.kind,
+            "payload": message.payload,
+            "status": OutboxStatus.PENDING,
+            "attempts": 0,
+            "available_at": now,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for message in messages
+    ])
+
+
+def claim_outbox_messages(limit: int, lease_seconds: float) -> Update:
+    """Lease the oldest due messages with one UPDATE ... RETURNING"""
+    now = datetime.utcnow()
+    # SKIP LOCKED lets concurrent workers claim disjoint batches (ignored by SQLite)
+    due_ids = (
+        select(OutboxModel.id)
+        .where(OutboxModel.status == OutboxStatus.PENDING, OutboxModel.available_at <= now)
+        .order_by(OutboxModel.available_at, OutboxModel.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(OutboxModel)
+        .where(OutboxModel.id.in_(due_ids))
+        .values(
+            attempts=OutboxModel.attempts + 1,
+            available_at=now + timedelta(seconds=lease_seconds),
+            updated_at=now,
+        )
+        .returning(*OutboxModel.__table__.columns)
+    )
+
+
+def update_outbox_message(message_id: int, **values) -> Update:
+    return update(OutboxModel).where(OutboxModel.id == message_id).values(updated_at=datetime.utcnow(), **values)
+
+
+def map_outbox_model(model) -> OutboxMessageDb:
+    # Accepts an OutboxModel or a row RETURNING its columns
+    return OutboxMessageDb(
+        id=model.id,
+        kind=model.kind,
+        payload=model.payload,
+        status=model.status,
+        attempts=model.attempts,
+        available_at=model.available_at,
+        created_at=model.created_at
+    )
+
+
+class SQLOutboxRepository(OutboxRepository):
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    def add_many(self, messages: List[OutboxMessage]) -> None:
+        if not messages:
+            return
+
+        self.db_session.execute(insert_outbox_messages(messages))
+        commit_unless_in_unit_of_work(self.db_session)
+
+    def claim(self, limit: int, lease_seconds: float) -> List[OutboxMessageDb]:
+        rows = self.db_session.execute(claim_outbox_messages(limit, lease_seconds)).all()
+        commit_unless_in_unit_of_work(self.db_session)
+        return sorted((map_outbox_model(row) for row in rows), key=lambda message: message.id)
+
+    def delete_many(self, message_ids: List[int]) -> None:
+        if not message_ids:
+            return
+
+        self.db_session.execute(delete(OutboxModel).where(OutboxModel.id.in_(message_ids)))
+        commit_unless_in_unit_of_work(self.db_session)
+
+    def retry_later(self, message_id: int, available_at: datetime, error: str) -> None:
+        self.db_session.execute(update_outbox_message(message_id, available_at=available_at, last_error=error))
+        commit_unless_in_unit_of_work(self.db_session)
+
+    def mark_failed(self, message_id: int, error: str) -> None:
+        self.db_session.execute(
+            update_outbox_message(message_id, status=OutboxStatus.FAILED, last_error=error)
+        )
+        commit_unless_in_unit_of_work(self.db_session)
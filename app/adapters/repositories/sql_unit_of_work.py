@@ -0,0 +1,39 @@
+from sqlalchemy.orm import Session
+
+from app.domain.interfaces.unit_of_work import UnitOfWork
+
+# Session.info key marking that a unit of work owns the session's transaction
+UNIT_OF_WORK_KEY = "unit_of_work"
+
+
+def in_unit_of_work(db_session) -> bool:
+    return db_session.info.get(UNIT_OF_WORK_KEY, False)
+
+
+def commit_unless_in_unit_of_work(db_session: Session) -> None:
+    """Commit a repository write, or only flush it when a unit of work commits later"""
+    if in_unit_of_work(db_session):
+        db_session.flush()
+    else:
+        db_session.commit()
+
+
+class SQLUnitOfWork(UnitOfWork):
+    """Runs the writes of every SQL repository on `db_session` in one transaction"""
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    def __enter__(self) -> "SQLUnitOfWork":
+        self.db_session.info[UNIT_OF_WORK_KEY] = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.db_session.info.pop(UNIT_OF_WORK_KEY, None)
+        super().__exit__(exc_type, exc, tb)
+
+    def commit(self) -> None:
+        self.db_session.commit()
+
+    def rollback(self) -> None:
+        self.db_session.rollback()
@@ -0,0 +1,193 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, FrozenSet, List, Optional
+
+from app.application.use_cases.order_use_cases import (
+    attach_items, build_order_stats, calculate_total, order_side_effects
+)
+from app.domain.entities.order import (
+    PAYMENT_ORDER_STATUS_TRANSITIONS,
+    AnalyticsGroup,
+    AnalyticsInterval,
+    InvalidTransitionError,
+    Order,
+    OrderAnalyticsBucket,
+    OrderCursor,
+    OrderDb,
+    OrderItem,
+    OrderPage,
+    OrderStats,
+    OrderStatus,
+    OrderStatusUpdateResult,
+    OrderSummaryPage,
+    PaymentStatus,
+    payment_statuses_allowing,
+)
+from app.domain.interfaces.async_order_repository import AsyncOrderRepository
+from app.domain.interfaces.async_order_item_repository import AsyncOrderItemRepository
+from app.domain.interfaces.async_outbox_repository import AsyncOutboxRepository
+from app.domain.interfaces.async_unit_of_work import AsyncAutoCommitUnitOfWork, AsyncUnitOfWork
+
+
+class AsyncOrderUseCases:
+    """OrderUseCases for async repositories; same rules, awaited end to end"""
+
+    def __init__(
+        self, 
+        order_repository: AsyncOrderRepository,
+        order_item_repository: AsyncOrderItemRepository,
+        unit_of_work: Optional[AsyncUnitOfWork] = None,
+        outbox_repository: Optional[AsyncOutboxRepository] = None
+    ):
+        self.order_repository = order_repository
+        self.order_item_repository = order_item_repository
+        self.unit_of_work = unit_of_work or AsyncAutoCommitUnitOfWork()
+        self.outbox_repository = outbox_repository
+
+    @property
+    def queues_side_effects(self) -> bool:
+        return self.outbox_repository is not None
+
+    async def get_all_orders(self) -> List[OrderDb]:
+        return await self.order_repository.get_all()
+
+    async def get_order_by_id(self, order_id: int) -> Optional[OrderDb]:
+        return await self.order_repository.get_by_id(order_id)
+
+    async def get_order_version(self, order_id: int) -> Optional[datetime]:
+        return await self.order_repository.get_version(order_id)
+
+    async def get_orders_by_status(self, status: OrderStatus) -> List[OrderDb]:
+        return await self.order_repository.get_by_status(status)
+
+    async def get_orders_page(
+        self, limit: int, cursor: Optional[OrderCursor] = None, status: Optional[OrderStatus] = None
+    ) -> OrderPage:
+        return await self.order_repository.get_page(limit, cursor, status)
+
+    async def get_customer_orders_page(
+        self, customer_id: int, limit: int, cursor: Optional[OrderCursor] = None
+    ) -> OrderPage:
+        return await self.order_repository.get_by_customer(customer_id, limit, cursor)
+
+    async def get_orders_summary_page(
+        self,
+        fields: FrozenSet[str],
+        limit: int,
+        cursor: Optional[OrderCursor] = None,
+        status: Optional[OrderStatus] = None,
+        customer_id: Optional[int] = None
+    ) -> OrderSummaryPage:
+        return await self.order_repository.get_summary_page(fields, limit, cursor, status, customer_id)
+
+    async def get_order_analytics(
+        self,
+        start: datetime,
+        end: datetime,
+        interval: AnalyticsInterval,
+        group_by: Optional[AnalyticsGroup] = None
+    ) -> List[OrderAnalyticsBucket]:
+        return await self.order_repository.get_analytics(start, end, interval, group_by)
+
+    async def get_order_stats(self) -> OrderStats:
+        return build_order_stats(await self.order_repository.get_status_counts())
+
+    async def rebuild_order_stats(self) -> OrderStats:
+        return build_order_stats(await self.order_repository.rebuild_status_counts())
+
+    async def create_order(self, order: Order, product_prices: Dict[int, Decimal] = None) -> OrderDb:
+        """
+        Create a new order with items.
+        If product_prices is provided, it will be used to calculate the order total.
+        The order, its items and its total are written in a single transaction,
+        together with the outbox messages for its stock and payment updates.
+        """
+        total = calculate_total(order.items, product_prices) if product_prices else Decimal("0")
+        
+        async with self.unit_of_work:
+            created_order = await self.order_repository.create(order, total)
+            
+            if order.items:
+                created_order.items = await self.order_item_repository.create_many(
+                    created_order.id, order.items
+                )
+            
+            if self.outbox_repository is not None:
+                await self.outbox_repository.add_many(order_side_effects([created_order]))
+            
+            await self.unit_of_work.commit()
+        
+        return created_order
+
+    async def create_orders(self, orders: List[Order], product_prices: Dict[int, Decimal]) -> List[OrderDb]:
+        """Create a batch of orders with their items in a single transaction"""
+        totals = [calculate_total(order.items, product_prices) for order in orders]
+        
+        async with self.unit_of_work:
+            created_orders = await self.order_repository.create_many(orders, totals)
+            created_items = await self.order_item_repository.create_for_orders([
+                (created_order.id, order.items)
+                for created_order, order in zip(created_orders, orders)
+            ])
+            attach_items(created_orders, created_items)
+            
+            if self.outbox_repository is not None:
+                await self.outbox_repository.add_many(order_side_effects(created_orders))
+            
+            await self.unit_of_work.commit()
+        
+        return created_orders
+
+    async def update_order_status(self, order_id: int, status: OrderStatus) -> Optional[OrderDb]:
+        return await self.order_repository.update_status(order_id, status)
+
+    async def update_orders_status(
+        self, order_ids: List[int], status: OrderStatus, expected_status: Optional[OrderStatus] = None
+    ) -> OrderStatusUpdateResult:
+        """Move many orders to `status` at once, reporting which ids were not updated"""
+        order_ids = list(dict.fromkeys(order_ids))
+        transitioned = set(await self.order_repository.update_status_many(order_ids, status, expected_status))
+        return OrderStatusUpdateResult(
+            transitioned=[order_id for order_id in order_ids if order_id in transitioned],
+            rejected=[order_id for order_id in order_ids if order_id not in transitioned]
+        )
+
+    async def update_payment_status(self, order_id: int, payment_status: PaymentStatus) -> Optional[OrderDb]:
+        updated_order = await self.order_repository.transition_payment_status(
+            order_id,
+            payment_status,
+            payment_statuses_allowing(payment_status),
+            PAYMENT_ORDER_STATUS_TRANSITIONS.get(payment_status)
+        )
+        if updated_order:
+            return updated_order
+        
+        order = await self.order_repository.get_by_id(order_id)
+        if not order:
+            return None
+        raise InvalidTransitionError(
+            f"Cannot change payment status of order {order_id} "
+            f"from {order.payment_status.value} to {payment_status.value}"
+        )
+    
+    async def add_item_to_order(
+        self, order_id: int, item: OrderItem, product_price: Optional[Decimal] = None
+    ) -> Optional[OrderDb]:
+        """Add an item to an existing order and optionally update the total"""
+        order = await self.order_repository.get_by_id(order_id)
+        if not order:
+            return None
+            
+        if order.status != OrderStatus.PLACED:
+            raise ValueError("Cannot modify an order that is not in PLACED status")
+            
+        async with self.unit_of_work:
+            await self.order_item_repository.create(order_id, item)
+            
+            if product_price is not None:
+                new_total = order.total + (product_price * Decimal(str(item.quantity)))
+                await self.order_repository.update_total(order_id, new_total)
+            
+            await self.unit_of_work.commit()
+            
+        return await self.get_order_by_id(order_id)
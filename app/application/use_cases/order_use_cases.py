@@ -1,19 +1,103 @@
+from collections import Counter, defaultdict
+from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional
 
-from app.domain.entities.order import Order, OrderDb, OrderItem, OrderStatus, PaymentStatus
+from app.domain.entities.order import (
+    PAYMENT_ORDER_STATUS_TRANSITIONS,
+    AnalyticsGroup,
+    AnalyticsInterval,
+    InvalidTransitionError,
+    Order,
+    OrderAnalyticsBucket,
+    OrderCursor,
+    OrderDb,
+    OrderItem,
+    OrderItemDb,
+    OrderPage,
+    OrderStats,
+    OrderStatus,
+    OrderStatusUpdateResult,
+    OrderSummaryPage,
+    PaymentStatus,
+    payment_statuses_allowing,
+)
+from app.domain.entities.outbox import OutboxKind, OutboxMessage
 from app.domain.interfaces.order_repository import OrderRepository
 from app.domain.interfaces.order_item_repository import OrderItemRepository
+from app.domain.interfaces.outbox_repository import OutboxRepository
+from app.domain.interfaces.unit_of_work import AutoCommitUnitOfWork, UnitOfWork
+
+
+def calculate_total(items: List[OrderItem], product_prices: Dict[int, Decimal]) -> Decimal:
+    """Sum price * quantity over the items whose product has a known price"""
+    total = Decimal("0")
+    for item in items:
+        if item.product_id in product_prices:
+            total += product_prices[item.product_id] * item.quantity
+    return total
+
+
+def attach_items(orders: List[OrderDb], items: List[OrderItemDb]) -> List[OrderDb]:
+    """Assign bulk-inserted items to the orders they belong to"""
+    items_by_order: Dict[int, List[OrderItemDb]] = defaultdict(list)
+    for item in items:
+        items_by_order[item.order_id].append(item)
+    for order in orders:
+        order.items = items_by_order[order.id]
+    return orders
+
+
+def build_order_stats(counts: Dict[OrderStatus, int]) -> OrderStats:
+    return OrderStats(counts=counts, total=sum(counts.values()))
+
+
+def order_side_effects(orders: List[OrderDb]) -> List[OutboxMessage]:
+    """
+    Downstream updates owed for newly created orders: one stock decrement per
+    product across all of them, and a payment notification per order with a total.
+    """
+    quantity_changes: Dict[int, int] = Counter()
+    for order in orders:
+        for item in order.items:
+            quantity_changes[item.product_id] -= item.quantity
+    
+    messages = [
+        OutboxMessage(
+            kind=OutboxKind.STOCK_UPDATE,
+            payload={"product_id": product_id, "quantity_change": quantity_change}
+        )
+        for product_id, quantity_change in quantity_changes.items()
+    ]
+    messages.extend(
+        # The total is kept as a string so the payload round-trips through JSON exactly
+        OutboxMessage(
+            kind=OutboxKind.PAYMENT_NOTIFICATION,
+            payload={"order_id": order.id, "total": str(order.total)}
+        )
+        for order in orders
+        if order.total > 0
+    )
+    return messages
 
 
 class OrderUseCases:
     def __init__(
         self, 
         order_repository: OrderRepository,
-        order_item_repository: OrderItemRepository
+        order_item_repository: OrderItemRepository,
+        unit_of_work: Optional[UnitOfWork] = None,
+        outbox_repository: Optional[OutboxRepository] = None
     ):
         self.order_repository = order_repository
         self.order_item_repository = order_item_repository
+        self.unit_of_work = unit_of_work or AutoCommitUnitOfWork()
+        # Without an outbox, the caller applies the side effects of new orders itself
+        self.outbox_repository = outbox_repository
+
+    @property
+    def queues_side_effects(self) -> bool:
+        return self.outbox_repository is not None
 
     def get_all_orders(self) -> List[OrderDb]:
         return self.order_repository.get_all()
@@ -21,52 +105,131 @@ class OrderUseCases:
     def get_order_by_id(self, order_id: int) -> Optional[OrderDb]:
         return self.order_repository.get_by_id(order_id)
 
+    def get_order_version(self, order_id: int) -> Optional[datetime]:
+        return self.order_repository.get_version(order_id)
+
     def get_orders_by_status(self, status: OrderStatus) -> List[OrderDb]:
         return self.order_repository.get_by_status(status)
 
+    def get_orders_page(
+        self, limit: int, cursor: Optional[OrderCursor] = None, status: Optional[OrderStatus] = None
+    ) -> OrderPage:
+        return self.order_repository.get_page(limit, cursor, status)
+
+    def get_customer_orders_page(
+        self, customer_id: int, limit: int, cursor: Optional[OrderCursor] = None
+    ) -> OrderPage:
+        return self.order_repository.get_by_customer(customer_id, limit, cursor)
+
+    def get_orders_summary_page(
+        self,
+        fields: FrozenSet[str],
+        limit: int,
+        cursor: Optional[OrderCursor] = None,
+        status: Optional[OrderStatus] = None,
+        customer_id: Optional[int] = None
+    ) -> OrderSummaryPage:
+        return self.order_repository.get_summary_page(fields, limit, cursor, status, customer_id)
+
+    def get_order_analytics(
+        self,
+        start: datetime,
+        end: datetime,
+        interval: AnalyticsInterval,
+        group_by: Optional[AnalyticsGroup] = None
+    ) -> List[OrderAnalyticsBucket]:
+        return self.order_repository.get_analytics(start, end, interval, group_by)
+
+    def get_order_stats(self) -> OrderStats:
+        """Order counts per status, kept up to date by every status change"""
+        return build_order_stats(self.order_repository.get_status_counts())
+
+    def rebuild_order_stats(self) -> OrderStats:
+        return build_order_stats(self.order_repository.rebuild_status_counts())
+
     def create_order(self, order: Order, product_prices: Dict[int, Decimal] = None) -> OrderDb:
         """
         Create a new order with items.
         If product_prices is provided, it will be used to calculate the order total.
+        The order, its items and its total are written in a single transaction,
+        together with the outbox messages for its stock and payment updates.
         """
-        created_order = self.order_repository.create(order)
+        # The total is known before insert, so the order is never stored with a zero total
+        total = calculate_total(order.items, product_prices) if product_prices else Decimal("0")
         
-        # Add items to the order
-        if order.items:
-            created_items = self.order_item_repository.create_many(created_order.id, order.items)
+        with self.unit_of_work:
+            created_order = self.order_repository.create(order, total)
             
-            # Update the created order with the items
-            created_order.items = created_items
+            # Add items to the order
+            if order.items:
+                created_order.items = self.order_item_repository.create_many(created_order.id, order.items)
             
-            # Calculate and update the total if product prices are provided
-            if product_prices:
-                total = Decimal("0")
-                for item in created_items:
-                    if item.product_id in product_prices:
-                        item_price = product_prices[item.product_id] * item.quantity
-                        total += item_price
-                
-                # Update the order with the calculated total
-                updated_order = self.order_repository.update_total(created_order.id, total)
-                if updated_order:
-                    created_order.total = total
+            if self.outbox_repository is not None:
+                self.outbox_repository.add_many(order_side_effects([created_order]))
+            
+            self.unit_of_work.commit()
         
         return created_order
 
+    def create_orders(self, orders: List[Order], product_prices: Dict[int, Decimal]) -> List[OrderDb]:
+        """
+        Create a batch of orders with their items in a single transaction,
+        using one bulk insert for the orders and one for all of their items.
+        """
+        totals = [calculate_total(order.items, product_prices) for order in orders]
+        
+        with self.unit_of_work:
+            created_orders = self.order_repository.create_many(orders, totals)
+            created_items = self.order_item_repository.create_for_orders([
+                (created_order.id, order.items)
+                for created_order, order in zip(created_orders, orders)
+            ])
+            attach_items(created_orders, created_items)
+            
+            if self.outbox_repository is not None:
+                self.outbox_repository.add_many(order_side_effects(created_orders))
+            
+            self.unit_of_work.commit()
+        
+        return created_orders
+
     def update_order_status(self, order_id: int, status: OrderStatus) -> Optional[OrderDb]:
         return self.order_repository.update_status(order_id, status)
 
+    def update_orders_status(
+        self, order_ids: List[int], status: OrderStatus, expected_status: Optional[OrderStatus] = None
+    ) -> OrderStatusUpdateResult:
+        """Move many orders to `status` at once, reporting which ids were not updated"""
+        order_ids = list(dict.fromkeys(order_ids))
+        transitioned = set(self.order_repository.update_status_many(order_ids, status, expected_status))
+        return OrderStatusUpdateResult(
+            transitioned=[order_id for order_id in order_ids if order_id in transitioned],
+            rejected=[order_id for order_id in order_ids if order_id not in transitioned]
+        )
+
     def update_payment_status(self, order_id: int, payment_status: PaymentStatus) -> Optional[OrderDb]:
+        """
+        Apply a payment status in one conditional write, together with the order
+        status change it implies (an approved payment confirms a placed order).
+        Raises InvalidTransitionError when the current payment status does not allow it.
+        """
+        updated_order = self.order_repository.transition_payment_status(
+            order_id,
+            payment_status,
+            payment_statuses_allowing(payment_status),
+            PAYMENT_ORDER_STATUS_TRANSITIONS.get(payment_status)
+        )
+        if updated_order:
+            return updated_order
+        
+        # Only a rejected write pays for a read, to tell a missing order from a conflict
         order = self.order_repository.get_by_id(order_id)
         if not order:
             return None
-            
-        # If payment is approved and order is in PLACED status, change to CONFIRMED
-        if payment_status == PaymentStatus.APPROVED and order.status == OrderStatus.PLACED:
-            self.order_repository.update_status(order_id, OrderStatus.CONFIRMED)
-            
-        # Update payment status
-        return self.order_repository.update_payment_status(order_id, payment_status)
+        raise InvalidTransitionError(
+            f"Cannot change payment status of order {order_id} "
+            f"from {order.payment_status.value} to {payment_status.value}"
+        )
     
     def add_item_to_order(self, order_id: int, item: OrderItem, product_price: Optional[Decimal] = None) -> Optional[OrderDb]:
         """Add an item to an existing order and optionally update the total"""
@@ -78,13 +241,16 @@ class OrderUseCases:
         if order.status != OrderStatus.PLACED:
             raise ValueError("Cannot modify an order that is not in PLACED status")
             
-        # Add the item
-        created_item = self.order_item_repository.create(order_id, item)
-        
-        # Update the total if price is provided
-        if product_price is not None:
-            new_total = order.total + (product_price * Decimal(str(item.quantity)))
-            self.order_repository.update_total(order_id, new_total)
+        with self.unit_of_work:
+            # Add the item
+            self.order_item_repository.create(order_id, item)
+            
+            # Update the total if price is provided
+            if product_price is not None:
+                new_total = order.total + (product_price * Decimal(str(item.quantity)))
+                self.order_repository.update_total(order_id, new_total)
+            
+            self.unit_of_work.commit()
             
         # Return the updated order
         return self.get_order_by_id(order_id) 
\ No newline at end of file
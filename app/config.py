@@ -5,19 +5,85 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # SQL Database settings
     SQL_DATABASE_URL: str = os.getenv("SQL_DATABASE_URL", "sqlite:///./orders_service.db")
+    # Serve requests through AsyncSession; the async URL defaults to SQL_DATABASE_URL on aiosqlite/asyncpg
+    SQL_ASYNC: bool = os.getenv("SQL_ASYNC", "false").lower() == "true"
+    SQL_ASYNC_DATABASE_URL: str = os.getenv("SQL_ASYNC_DATABASE_URL", "")
     
     # NoSQL Database settings (MongoDB)
     NOSQL_HOST: str = os.getenv("NOSQL_HOST", "localhost")
     NOSQL_PORT: int = int(os.getenv("NOSQL_PORT", "27017"))
     NOSQL_DB: str = os.getenv("NOSQL_DB", "orders_service")
+    NOSQL_ID_BLOCK_SIZE: int = int(os.getenv("NOSQL_ID_BLOCK_SIZE", "100"))
+    NOSQL_MAX_POOL_SIZE: int = int(os.getenv("NOSQL_MAX_POOL_SIZE", "100"))
+    NOSQL_MIN_POOL_SIZE: int = int(os.getenv("NOSQL_MIN_POOL_SIZE", "0"))
+    NOSQL_CONNECT_TIMEOUT_MS: int = int(os.getenv("NOSQL_CONNECT_TIMEOUT_MS", "5000"))
+    NOSQL_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("NOSQL_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    NOSQL_SOCKET_TIMEOUT_MS: int = int(os.getenv("NOSQL_SOCKET_TIMEOUT_MS", "10000"))
+    # Comma-separated wire compressors, e.g. "zstd,snappy,zlib"; empty disables compression
+    NOSQL_COMPRESSORS: str = os.getenv("NOSQL_COMPRESSORS", "")
+    # Create the Mongo indexes on startup; off by default so SQL-only deployments need no Mongo server
+    NOSQL_ENSURE_INDEXES: bool = os.getenv("NOSQL_ENSURE_INDEXES", "false").lower() == "true"
     
     # API settings
     API_PREFIX: str = "/api/v1"
     
+    # Pagination settings
+    ORDERS_PAGE_SIZE: int = int(os.getenv("ORDERS_PAGE_SIZE", "50"))
+    ORDERS_MAX_PAGE_SIZE: int = int(os.getenv("ORDERS_MAX_PAGE_SIZE", "200"))
+    ORDERS_BATCH_MAX_SIZE: int = int(os.getenv("ORDERS_BATCH_MAX_SIZE", "100"))
+    # Longest analytics range, in intervals (e.g. 31 days of hourly buckets)
+    ORDERS_ANALYTICS_MAX_BUCKETS: int = int(os.getenv("ORDERS_ANALYTICS_MAX_BUCKETS", "744"))
+    
+    # Shared HTTP client settings (HTTP/2 requires the h2 package: pip install httpx[http2])
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30.0"))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+    
     # External services
     CUSTOMERS_SERVICE_URL: str = os.getenv("CUSTOMERS_SERVICE_URL", "http://localhost:8001")
     PRODUCTS_SERVICE_URL: str = os.getenv("PRODUCTS_SERVICE_URL", "http://localhost:8002")
     PAYMENTS_SERVICE_URL: str = os.getenv("PAYMENTS_SERVICE_URL", "http://localhost:8004")
+    # Calls in flight at once per fan-out (product lookups, stock updates, customers, payments)
+    DOWNSTREAM_CONCURRENCY_LIMIT: int = int(os.getenv("DOWNSTREAM_CONCURRENCY_LIMIT", "10"))
+    
+    # Product catalog cache (seconds); stock checks only accept entries younger than PRODUCT_STOCK_MAX_AGE
+    PRODUCT_CACHE_MAX_SIZE: int = int(os.getenv("PRODUCT_CACHE_MAX_SIZE", "1000"))
+    PRODUCT_CACHE_TTL: float = float(os.getenv("PRODUCT_CACHE_TTL", "60"))
+    PRODUCT_CACHE_STALE_TTL: float = float(os.getenv("PRODUCT_CACHE_STALE_TTL", "30"))
+    PRODUCT_STOCK_MAX_AGE: float = float(os.getenv("PRODUCT_STOCK_MAX_AGE", "2"))
+    
+    # Customer existence cache (seconds); unknown customers are remembered for CUSTOMER_CACHE_NEGATIVE_TTL
+    CUSTOMER_CACHE_MAX_SIZE: int = int(os.getenv("CUSTOMER_CACHE_MAX_SIZE", "10000"))
+    CUSTOMER_CACHE_TTL: float = float(os.getenv("CUSTOMER_CACHE_TTL", "300"))
+    CUSTOMER_CACHE_NEGATIVE_TTL: float = float(os.getenv("CUSTOMER_CACHE_NEGATIVE_TTL", "30"))
+    
+    # Downstream timeouts per service (seconds)
+    CUSTOMERS_CONNECT_TIMEOUT: float = float(os.getenv("CUSTOMERS_CONNECT_TIMEOUT", "1.0"))
+    CUSTOMERS_READ_TIMEOUT: float = float(os.getenv("CUSTOMERS_READ_TIMEOUT", "2.0"))
+    PRODUCTS_CONNECT_TIMEOUT: float = float(os.getenv("PRODUCTS_CONNECT_TIMEOUT", "1.0"))
+    PRODUCTS_READ_TIMEOUT: float = float(os.getenv("PRODUCTS_READ_TIMEOUT", "2.0"))
+    PAYMENTS_CONNECT_TIMEOUT: float = float(os.getenv("PAYMENTS_CONNECT_TIMEOUT", "1.0"))
+    PAYMENTS_READ_TIMEOUT: float = float(os.getenv("PAYMENTS_READ_TIMEOUT", "5.0"))
+    
+    # Circuit breaker and retry policy, applied to each downstream service separately
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv("RETRY_MAX_ATTEMPTS", "2"))
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+    RETRY_BUDGET_MIN_TOKENS: float = float(os.getenv("RETRY_BUDGET_MIN_TOKENS", "10"))
+    RETRY_BACKOFF_BASE: float = float(os.getenv("RETRY_BACKOFF_BASE", "0.05"))
+    RETRY_BACKOFF_MAX: float = float(os.getenv("RETRY_BACKOFF_MAX", "1.0"))
+    
+    # Transactional outbox: stock and payment updates of new orders are delivered by a background worker
+    OUTBOX_ENABLED: bool = os.getenv("OUTBOX_ENABLED", "true").lower() == "true"
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+    OUTBOX_POLL_INTERVAL: float = float(os.getenv("OUTBOX_POLL_INTERVAL", "1.0"))
+    # A claimed message is handed out again if its worker has not settled it within the lease
+    OUTBOX_LEASE_SECONDS: float = float(os.getenv("OUTBOX_LEASE_SECONDS", "60"))
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+    OUTBOX_BACKOFF_BASE: float = float(os.getenv("OUTBOX_BACKOFF_BASE", "1.0"))
+    OUTBOX_BACKOFF_MAX: float = float(os.getenv("OUTBOX_BACKOFF_MAX", "300"))
 
 
 settings = Settings() 
\ No newline at end of file
@@ -1,9 +1,11 @@
-from datetime import datetime
+import base64
+import binascii
+from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class OrderStatus(str, Enum):
@@ -26,6 +28,44 @@ class PaymentStatus(str, Enum):
     UNKNOWN = "Unknown"
 
 
+# Payment statuses an order may move to from each payment status. Repeating the
+# current status is accepted so a redelivered payment webhook is not a conflict.
+PAYMENT_STATUS_TRANSITIONS: Dict[PaymentStatus, FrozenSet[PaymentStatus]] = {
+    PaymentStatus.PENDING: frozenset(PaymentStatus),
+    PaymentStatus.UNKNOWN: frozenset(PaymentStatus) - {PaymentStatus.PENDING},
+    PaymentStatus.APPROVED: frozenset({PaymentStatus.APPROVED}),
+    PaymentStatus.DENIED: frozenset({PaymentStatus.DENIED}),
+    PaymentStatus.REJECTED: frozenset({PaymentStatus.REJECTED}),
+}
+
+# Order status change applied together with a payment status: (from status, to status)
+PAYMENT_ORDER_STATUS_TRANSITIONS: Dict[PaymentStatus, Tuple[OrderStatus, OrderStatus]] = {
+    PaymentStatus.APPROVED: (OrderStatus.PLACED, OrderStatus.CONFIRMED),
+}
+
+
+def payment_statuses_allowing(payment_status: PaymentStatus) -> List[PaymentStatus]:
+    """Current payment statuses from which an order may move to `payment_status`"""
+    return [
+        current for current, targets in PAYMENT_STATUS_TRANSITIONS.items()
+        if payment_status in targets
+    ]
+
+
+def status_count_changes(previous_statuses: Iterable[OrderStatus], status: OrderStatus) -> Dict[OrderStatus, int]:
+    """Changes to the per-status order counts when orders in previous_statuses move to `status`"""
+    changes: Dict[OrderStatus, int] = {}
+    for previous_status in previous_statuses:
+        if previous_status != status:
+            changes[previous_status] = changes.get(previous_status, 0) - 1
+            changes[status] = changes.get(status, 0) + 1
+    return changes
+
+
+class InvalidTransitionError(ValueError):
+    """The order is not in a state that allows the requested change"""
+
+
 class OrderItem(BaseModel):
     product_id: int
     quantity: int
@@ -56,4 +96,114 @@ class OrderDb(Order):
     total: Decimal
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+
+class OrderBatchResult(BaseModel):
+    """Outcome of one order of a batch: the created order, or why it was rejected"""
+    order: Optional[OrderDb] = None
+    error: Optional[str] = None
+
+
+class OrderStatusUpdate(BaseModel):
+    """Orders to move to a new status, optionally only from an expected current status"""
+    order_ids: List[int] = Field(..., min_length=1)
+    expected_status: Optional[OrderStatus] = None
+
+
+class OrderStatusUpdateResult(BaseModel):
+    transitioned: List[int]
+    rejected: List[int]
+
+
+class OrderStats(BaseModel):
+    """Number of orders in each status"""
+    counts: Dict[OrderStatus, int]
+    total: int
+
+
+class AnalyticsInterval(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+    @property
+    def length(self) -> timedelta:
+        return timedelta(hours=1) if self is AnalyticsInterval.HOUR else timedelta(days=1)
+
+
+class AnalyticsGroup(str, Enum):
+    STATUS = "status"
+    PAYMENT_STATUS = "payment_status"
+
+
+class OrderAnalyticsBucket(BaseModel):
+    """Aggregates of the orders created in one interval, optionally split by status or payment status"""
+    bucket_start: datetime
+    group: Optional[str] = None
+    order_count: int
+    revenue: Decimal
+    average_ticket: Decimal
+    items_per_order: float
+
+    @classmethod
+    def from_totals(
+        cls, bucket_start: datetime, group: Optional[str], order_count: int, revenue, item_count
+    ) -> "OrderAnalyticsBucket":
+        # Sums arrive as Decimal from SQL and as float from Mongo
+        revenue = Decimal(str(revenue or 0)).quantize(Decimal("0.01"))
+        return cls(
+            bucket_start=bucket_start,
+            group=group,
+            order_count=order_count,
+            revenue=revenue,
+            average_ticket=(revenue / order_count).quantize(Decimal("0.01")),
+            items_per_order=round(int(item_count or 0) / order_count, 2)
+        )
+
+
+class OrderCursor(BaseModel):
+    """Keyset position in the (created_at, id) ordering of orders"""
+    created_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        raw = f"{self.created_at.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @classmethod
+    def decode(cls, token: str) -> "OrderCursor":
+        try:
+            created_at, order_id = base64.urlsafe_b64decode(token.encode()).decode().split("|")
+            return cls(created_at=datetime.fromisoformat(created_at), id=int(order_id))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+            raise ValueError(f"Invalid cursor: {token}") from exc
+
+
+class OrderPage(BaseModel):
+    items: List[OrderDb]
+    next_cursor: Optional[OrderCursor] = None
+
+
+class OrderSummary(BaseModel):
+    """
+    Projection of an order on the requested fields. Only the fields that were
+    loaded are set, and listings serialize with exclude_unset so the others
+    are left out instead of showing up as null.
+    """
+    id: int
+    customer_id: Optional[int] = None
+    status: Optional[OrderStatus] = None
+    payment_status: Optional[PaymentStatus] = None
+    total: Optional[Decimal] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    items: Optional[List[OrderItemDb]] = None
+
+
+# Fields a listing can be projected on; "items" costs a second query
+ORDER_SUMMARY_FIELDS: FrozenSet[str] = frozenset(OrderSummary.model_fields)
+
+
+class OrderSummaryPage(BaseModel):
+    items: List[OrderSummary]
+    next_cursor: Optional[OrderCursor] = None
@@ -0,0 +1,34 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict
+
+from pydantic import BaseModel
+
+
+class OutboxKind(str, Enum):
+    STOCK_UPDATE = "stock_update"
+    PAYMENT_NOTIFICATION = "payment_notification"
+
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    # Gave up after OUTBOX_MAX_ATTEMPTS or an unknown outcome; kept for inspection and manual replay
+    FAILED = "failed"
+
+
+class OutboxMessage(BaseModel):
+    """A side effect of an order write, stored with it and delivered later"""
+    kind: OutboxKind
+    payload: Dict[str, Any]
+
+
+class OutboxMessageDb(OutboxMessage):
+    id: int
+    status: OutboxStatus
+    # Deliveries started so far, including the one of the current claim
+    attempts: int
+    available_at: datetime
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
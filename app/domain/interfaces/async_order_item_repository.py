@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+from app.domain.entities.order import OrderItem, OrderItemDb
+
+
+class AsyncOrderItemRepository(ABC):
+    """Awaitable counterpart of OrderItemRepository for async database drivers"""
+
+    @abstractmethod
+    async def get_by_order_id(self, order_id: int) -> List[OrderItemDb]:
+        pass
+
+    @abstractmethod
+    async def create(self, order_id: int, item: OrderItem) -> OrderItemDb:
+        pass
+
+    @abstractmethod
+    async def create_many(self, order_id: int, items: List[OrderItem]) -> List[OrderItemDb]:
+        pass
+
+    @abstractmethod
+    async def create_for_orders(self, order_items: List[Tuple[int, List[OrderItem]]]) -> List[OrderItemDb]:
+        """Insert the items of several orders, given as (order_id, items) pairs, in one write"""
+        pass
+
+    @abstractmethod
+    async def delete(self, item_id: int) -> bool:
+        pass
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List
+
+from app.domain.entities.outbox import OutboxMessage, OutboxMessageDb
+
+
+class AsyncOutboxRepository(ABC):
+    """Awaitable counterpart of OutboxRepository for async database drivers"""
+
+    @abstractmethod
+    async def add_many(self, messages: List[OutboxMessage]) -> None:
+        pass
+
+    @abstractmethod
+    async def claim(self, limit: int, lease_seconds: float) -> List[OutboxMessageDb]:
+        pass
+
+    @abstractmethod
+    async def delete_many(self, message_ids: List[int]) -> None:
+        pass
+
+    @abstractmethod
+    async def retry_later(self, message_id: int, available_at: datetime, error: str) -> None:
+        pass
+
+    @abstractmethod
+    async def mark_failed(self, message_id: int, error: str) -> None:
+        pass
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+
+
+class AsyncUnitOfWork(ABC):
+    """Awaitable counterpart of UnitOfWork, used with ``async with``"""
+
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.rollback()
+
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        pass
+
+
+class AsyncAutoCommitUnitOfWork(AsyncUnitOfWork):
+    """For async repositories that persist every write on their own"""
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from app.domain.entities.order import OrderItem, OrderItemDb
 
@@ -17,6 +17,11 @@ class OrderItemRepository(ABC):
     def create_many(self, order_id: int, items: List[OrderItem]) -> List[OrderItemDb]:
         pass
 
+    @abstractmethod
+    def create_for_orders(self, order_items: List[Tuple[int, List[OrderItem]]]) -> List[OrderItemDb]:
+        """Insert the items of several orders, given as (order_id, items) pairs, in one write"""
+        pass
+
     @abstractmethod
     def delete(self, item_id: int) -> bool:
         pass 
\ No newline at end of file
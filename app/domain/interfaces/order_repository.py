@@ -1,8 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from decimal import Decimal
 
-from app.domain.entities.order import Order, OrderDb, OrderStatus, PaymentStatus
+from app.domain.entities.order import (
+    AnalyticsGroup,
+    AnalyticsInterval,
+    Order,
+    OrderAnalyticsBucket,
+    OrderCursor,
+    OrderDb,
+    OrderPage,
+    OrderStatus,
+    OrderSummaryPage,
+    PaymentStatus,
+)
 
 
 class OrderRepository(ABC):
@@ -14,22 +26,108 @@ class OrderRepository(ABC):
     def get_by_id(self, order_id: int) -> Optional[OrderDb]:
         pass
 
+    @abstractmethod
+    def get_version(self, order_id: int) -> Optional[datetime]:
+        """Return the order's updated_at without loading the order or its items"""
+        pass
+
     @abstractmethod
     def get_by_status(self, status: OrderStatus) -> List[OrderDb]:
         pass
 
     @abstractmethod
-    def create(self, order: Order) -> OrderDb:
+    def get_page(
+        self, limit: int, cursor: Optional[OrderCursor] = None, status: Optional[OrderStatus] = None
+    ) -> OrderPage:
+        """Return up to `limit` orders after `cursor` in (created_at, id) order"""
+        pass
+
+    @abstractmethod
+    def get_by_customer(
+        self, customer_id: int, limit: int, cursor: Optional[OrderCursor] = None
+    ) -> OrderPage:
+        """Return a page of one customer's orders, oldest first, like `get_page`"""
+        pass
+
+    @abstractmethod
+    def get_summary_page(
+        self,
+        fields: FrozenSet[str],
+        limit: int,
+        cursor: Optional[OrderCursor] = None,
+        status: Optional[OrderStatus] = None,
+        customer_id: Optional[int] = None
+    ) -> OrderSummaryPage:
+        """Like `get_page`, loading only `fields` of ORDER_SUMMARY_FIELDS; items only when listed"""
+        pass
+
+    @abstractmethod
+    def create(self, order: Order, total: Decimal = Decimal("0")) -> OrderDb:
+        """Insert the order with its precomputed total; items are added separately"""
+        pass
+
+    @abstractmethod
+    def create_many(self, orders: List[Order], totals: List[Decimal]) -> List[OrderDb]:
+        """Insert several orders in one write; results follow the order of `orders`"""
         pass
 
     @abstractmethod
     def update_status(self, order_id: int, status: OrderStatus) -> Optional[OrderDb]:
         pass
 
+    @abstractmethod
+    def update_status_many(
+        self, order_ids: List[int], status: OrderStatus, expected_status: Optional[OrderStatus] = None
+    ) -> List[int]:
+        """
+        Set the status of every listed order in one set-based write, only for orders
+        currently in expected_status when given. Returns the ids that were updated.
+        """
+        pass
+
     @abstractmethod
     def update_payment_status(self, order_id: int, payment_status: PaymentStatus) -> Optional[OrderDb]:
         pass
 
+    @abstractmethod
+    def transition_payment_status(
+        self,
+        order_id: int,
+        payment_status: PaymentStatus,
+        from_payment_statuses: List[PaymentStatus],
+        status_change: Optional[Tuple[OrderStatus, OrderStatus]] = None
+    ) -> Optional[OrderDb]:
+        """
+        Set payment_status only while the current one is in from_payment_statuses,
+        moving status from status_change[0] to status_change[1] in the same atomic
+        write. Returns None when no order matched.
+        """
+        pass
+
     @abstractmethod
     def update_total(self, order_id: int, total: Decimal) -> Optional[OrderDb]:
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_analytics(
+        self,
+        start: datetime,
+        end: datetime,
+        interval: AnalyticsInterval,
+        group_by: Optional[AnalyticsGroup] = None
+    ) -> List[OrderAnalyticsBucket]:
+        """Aggregate the orders created in [start, end) per interval, and per group if given"""
+        pass
+
+    @abstractmethod
+    def get_status_counts(self) -> Dict[OrderStatus, int]:
+        """
+        Number of orders in each status, read from counters that every write
+        changing a status keeps up to date
+        """
+        pass
+
+    @abstractmethod
+    def rebuild_status_counts(self) -> Dict[OrderStatus, int]:
+        """Recount the orders of each status from scratch and store the counters"""
+        pass
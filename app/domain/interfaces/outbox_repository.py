@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List
+
+from app.domain.entities.outbox import OutboxMessage, OutboxMessageDb
+
+
+class OutboxRepository(ABC):
+    @abstractmethod
+    def add_many(self, messages: List[OutboxMessage]) -> None:
+        """Store messages in the same transaction as the surrounding unit of work"""
+        pass
+
+    @abstractmethod
+    def claim(self, limit: int, lease_seconds: float) -> List[OutboxMessageDb]:
+        """
+        Lease up to `limit` due messages, oldest first, counting a delivery attempt.
+        A leased message is not claimed again until the lease runs out, so a worker
+        that dies mid-delivery only delays its messages.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, message_ids: List[int]) -> None:
+        """Drop delivered messages"""
+        pass
+
+    @abstractmethod
+    def retry_later(self, message_id: int, available_at: datetime, error: str) -> None:
+        pass
+
+    @abstractmethod
+    def mark_failed(self, message_id: int, error: str) -> None:
+        pass
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+
+
+class UnitOfWork(ABC):
+    """
+    Transaction scope shared by the repositories of one request.
+
+    Repository writes made inside ``with unit_of_work:`` are persisted
+    together by commit(); leaving the block without committing rolls them back.
+    """
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # A no-op after commit(); otherwise discards the uncommitted writes
+        self.rollback()
+
+    @abstractmethod
+    def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    def rollback(self) -> None:
+        pass
+
+
+class AutoCommitUnitOfWork(UnitOfWork):
+    """For repositories that persist every write on their own"""
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
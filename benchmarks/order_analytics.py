@@ -0,0 +1,126 @@
+"""
+Hourly revenue and volume over a month of orders: GET /orders/analytics
+(GROUP BY in the database) versus walking every page of orders and
+aggregating client-side, on a seeded SQLite file.
+
+Usage: python -m benchmarks.order_analytics [--orders 1000000] [--days 30] [--skip-client-side]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.api.order_router import router
+from app.adapters.models.sql.base import Base
+from app.adapters.models.sql.order_item_model import OrderItemModel
+from app.adapters.models.sql.order_model import OrderModel
+from app.adapters.models.sql.session import get_db
+from app.adapters.repositories.sql_order_repository import SQLOrderRepository
+from app.config import settings
+from app.domain.entities.order import OrderStatus, PaymentStatus
+
+START = datetime(2024, 1, 1)
+CHUNK = 10_000
+
+
+def seed(engine, count: int, days: int) -> None:
+    rng = random.Random(42)
+    span = days * 24 * 3600
+    statuses = list(OrderStatus)
+    with engine.begin() as connection:
+        for first_id in range(1, count + 1, CHUNK):
+            order_ids = range(first_id, min(first_id + CHUNK, count + 1))
+            orders, items = [], []
+            for order_id in order_ids:
+                created_at = START + timedelta(seconds=span * (order_id - 1) // count)
+                quantities = [rng.randint(1, 3) for _ in range(rng.randint(1, 3))]
+                orders.append({
+                    "id": order_id,
+                    "customer_id": rng.randint(1, 1000),
+                    "status": rng.choice(statuses),
+                    "payment_status": PaymentStatus.APPROVED,
+                    "total": Decimal(sum(quantities) * 990) / 100,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+                items.extend(
+                    {"order_id": order_id, "product_id": product_id, "quantity": quantity,
+                     "created_at": created_at, "updated_at": created_at}
+                    for product_id, quantity in enumerate(quantities, start=1)
+                )
+            connection.execute(insert(OrderModel), orders)
+            connection.execute(insert(OrderItemModel), items)
+
+
+def aggregate_client_side(session_factory) -> int:
+    """What the nightly export did: fetch every order with its items, then bucket in Python"""
+    buckets = defaultdict(lambda: [0, Decimal("0"), 0])
+    with session_factory() as db:
+        repository = SQLOrderRepository(db)
+        cursor = None
+        while True:
+            page = repository.get_page(settings.ORDERS_MAX_PAGE_SIZE, cursor)
+            for order in page.items:
+                bucket = buckets[order.created_at.replace(minute=0, second=0, microsecond=0)]
+                bucket[0] += 1
+                bucket[1] += order.total
+                bucket[2] += sum(item.quantity for item in order.items)
+            if page.next_cursor is None:
+                return len(buckets)
+            cursor = page.next_cursor
+
+
+async def aggregate_in_database(session_factory, days: int) -> int:
+    def get_bench_db():
+        with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(router, prefix="/orders")
+    app.dependency_overrides[get_db] = get_bench_db
+    params = {"start": START.isoformat(), "end": (START + timedelta(days=days)).isoformat(), "interval": "hour"}
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        response = await client.get("/orders/analytics", params=params)
+        response.raise_for_status()
+        return len(response.json())
+
+
+def run(orders: int, days: int, client_side: bool) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autoflush=False, bind=engine)
+
+    started = time.perf_counter()
+    seed(engine, orders, days)
+    print(f"seeded {orders} orders over {days} days in {time.perf_counter() - started:.1f} s")
+
+    started = time.perf_counter()
+    buckets = asyncio.run(aggregate_in_database(SessionLocal, days))
+    print(f"{'database':<12} {time.perf_counter() - started:8.2f} s {buckets:6d} hourly buckets")
+
+    if client_side:
+        started = time.perf_counter()
+        buckets = aggregate_client_side(SessionLocal)
+        print(f"{'client-side':<12} {time.perf_counter() - started:8.2f} s {buckets:6d} hourly buckets")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--skip-client-side", action="store_true")
+    args = parser.parse_args()
+    run(args.orders, args.days, not args.skip_client_side)
@@ -0,0 +1,127 @@
+"""
+Orders/sec for N single POST /orders calls versus POST /orders/batch, on a
+SQLite file with downstream services simulated by a fixed per-call latency.
+
+Usage: python -m benchmarks.order_batch [--orders 500] [--batch-size 100] [--latency-ms 5]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.api.order_router import get_service_client, router
+from app.adapters.models.sql.base import Base
+from app.adapters.models.sql.session import get_db
+
+PRODUCTS = {
+    product_id: {"id": product_id, "name": f"Product {product_id}", "price": 9.9, "quantity": 10 ** 9}
+    for product_id in range(1, 21)
+}
+
+
+class SimulatedServiceClient:
+    """ServiceClient stand-in where every downstream request costs `latency` seconds"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def _call(self) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+
+    async def _many(self, count: int) -> None:
+        await asyncio.gather(*(self._call() for _ in range(count)))
+
+    async def get_customer(self, customer_id: int) -> Dict[str, Any]:
+        await self._call()
+        return {"id": customer_id}
+
+    async def get_customers(self, customer_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        unique_ids = set(customer_ids)
+        await self._many(len(unique_ids))
+        return {customer_id: {"id": customer_id} for customer_id in unique_ids}
+
+    async def get_products(self, product_ids: List[int], max_age=None) -> Dict[int, Dict[str, Any]]:
+        unique_ids = set(product_ids)
+        await self._many(len(unique_ids))
+        return {product_id: PRODUCTS[product_id] for product_id in unique_ids}
+
+    async def update_product_quantities(self, quantity_changes: List[Tuple[int, int]]) -> List[bool]:
+        await self._many(len(quantity_changes))
+        return [True] * len(quantity_changes)
+
+    async def notify_payment_service(self, order_id: int, total: float) -> Dict[str, Any]:
+        await self._call()
+        return {}
+
+    async def notify_payment_service_many(self, payments: List[Tuple[int, float]]) -> List[Dict[str, Any]]:
+        await self._many(len(payments))
+        return [{}] * len(payments)
+
+
+def make_orders(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "customer_id": i % 10 + 1,
+            "items": [
+                {"product_id": (i + offset) % len(PRODUCTS) + 1, "quantity": 1}
+                for offset in range(3)
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def build_app(session_factory, service_client: SimulatedServiceClient) -> FastAPI:
+    def get_bench_db():
+        with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(router, prefix="/orders")
+    app.dependency_overrides[get_db] = get_bench_db
+    app.dependency_overrides[get_service_client] = lambda: service_client
+    return app
+
+
+async def run(orders: int, batch_size: int, latency: float) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autoflush=False, bind=engine)
+    payloads = make_orders(orders)
+
+    print(f"{orders} orders, batch size {batch_size}, {latency * 1000:.1f} ms per downstream call")
+    for label in ("single", "batch"):
+        service_client = SimulatedServiceClient(latency)
+        app = build_app(SessionLocal, service_client)
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+            started = time.perf_counter()
+            if label == "single":
+                for payload in payloads:
+                    (await client.post("/orders/", json=payload)).raise_for_status()
+            else:
+                for start in range(0, orders, batch_size):
+                    chunk = payloads[start:start + batch_size]
+                    (await client.post("/orders/batch", json=chunk)).raise_for_status()
+            elapsed = time.perf_counter() - started
+        print(f"{label:<7} {orders / elapsed:10.1f} orders/s {service_client.calls:8d} downstream calls")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.orders, args.batch_size, args.latency_ms / 1000))
@@ -0,0 +1,112 @@
+"""
+Cost of writing the items of one order: the previous per-row path (add,
+commit, refresh each item) versus the batched INSERT ... RETURNING used by
+SQLOrderItemRepository.create_many, over orders of 1 to 100 items.
+
+With --mongo, also compares one insert_one per item against a single
+insert_many with pre-allocated ids on the configured Mongo server.
+
+Usage: python -m benchmarks.order_items_insert [--orders 200] [--mongo]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.adapters.models.sql.base import Base
+from app.adapters.models.sql.order_item_model import OrderItemModel
+from app.adapters.models.sql.order_model import OrderModel
+from app.adapters.repositories.sql_order_item_repository import SQLOrderItemRepository
+from app.domain.entities.order import OrderItem
+
+ITEM_COUNTS = (1, 5, 10, 20, 50, 100)
+
+
+def per_row_insert(db: Session, order_id: int, items: List[OrderItem]) -> None:
+    db_items = [
+        OrderItemModel(order_id=order_id, product_id=item.product_id, quantity=item.quantity)
+        for item in items
+    ]
+    db.add_all(db_items)
+    db.commit()
+    for db_item in db_items:
+        db.refresh(db_item)
+
+
+def bulk_insert(db: Session, order_id: int, items: List[OrderItem]) -> None:
+    SQLOrderItemRepository(db).create_many(order_id, items)
+
+
+def time_sql(session_factory, insert: Callable, orders: int, item_count: int) -> float:
+    items = [OrderItem(product_id=i, quantity=1) for i in range(1, item_count + 1)]
+    with session_factory() as db:
+        order = OrderModel(status="Order placed", payment_status="Pending")
+        db.add(order)
+        db.commit()
+        
+        started = time.perf_counter()
+        for _ in range(orders):
+            insert(db, order.id, items)
+        return (time.perf_counter() - started) / orders * 1000
+
+
+def run_sql(orders: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autoflush=False, bind=engine)
+
+    print(f"SQLite, {orders} orders per size (ms per order)")
+    print(f"{'items':>6} {'per-row':>10} {'bulk':>10} {'speedup':>8}")
+    for item_count in ITEM_COUNTS:
+        per_row = time_sql(SessionLocal, per_row_insert, orders, item_count)
+        bulk = time_sql(SessionLocal, bulk_insert, orders, item_count)
+        print(f"{item_count:>6} {per_row:>10.3f} {bulk:>10.3f} {per_row / bulk:>7.1f}x")
+    engine.dispose()
+
+
+def run_mongo(orders: int) -> None:
+    from datetime import datetime
+    
+    from app.adapters.models.nosql.connection import db
+    from app.adapters.repositories.nosql_order_item_repository import new_item_document
+    
+    collection = db["bench_order_items"]
+    collection.drop()
+    next_id = 1
+
+    print(f"Mongo, {orders} orders per size (ms per order)")
+    print(f"{'items':>6} {'insert_one':>10} {'insert_many':>11} {'speedup':>8}")
+    for item_count in ITEM_COUNTS:
+        items = [OrderItem(product_id=i, quantity=1) for i in range(1, item_count + 1)]
+        timings = []
+        for many in (False, True):
+            started = time.perf_counter()
+            for _ in range(orders):
+                documents = [
+                    new_item_document(next_id + offset, 1, item, datetime.utcnow())
+                    for offset, item in enumerate(items)
+                ]
+                next_id += item_count
+                if many:
+                    collection.insert_many(documents)
+                else:
+                    for document in documents:
+                        collection.insert_one(document)
+            timings.append((time.perf_counter() - started) / orders * 1000)
+        print(f"{item_count:>6} {timings[0]:>10.3f} {timings[1]:>11.3f} {timings[0] / timings[1]:>7.1f}x")
+    collection.drop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--mongo", action="store_true")
+    args = parser.parse_args()
+    run_sql(args.orders)
+    if args.mongo:
+        run_mongo(args.orders)
@@ -0,0 +1,108 @@
+"""
+CPU time to turn a 10k-order listing into a response body: FastAPI's
+default path (re-validation against response_model, jsonable_encoder,
+json.dumps) versus one pydantic-core dump to JSON bytes, with the entities
+built by validation as the repositories do or by unvalidated model_construct.
+
+Usage: python -m benchmarks.order_serialization [--orders 10000] [--items 3] [--repeat 10]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.adapters.api.serialization import ORDER_LIST_ADAPTER
+from app.adapters.models.sql.order_item_model import OrderItemModel
+from app.adapters.models.sql.order_model import OrderModel
+from app.adapters.repositories.sql_order_repository import map_order_model
+from app.domain.entities.order import OrderDb, OrderItemDb, OrderStatus, PaymentStatus
+
+RESPONSE_FIELD = create_response_field(name="response", type_=List[OrderDb])
+
+
+def make_models(count: int, items: int) -> List[OrderModel]:
+    start = datetime(2024, 1, 1)
+    models = []
+    for order_id in range(1, count + 1):
+        created_at = start + timedelta(seconds=order_id)
+        model = OrderModel(
+            id=order_id, customer_id=order_id % 100, status=OrderStatus.PLACED.value,
+            payment_status=PaymentStatus.PENDING.value, total=Decimal("29.70"),
+            created_at=created_at, updated_at=created_at,
+        )
+        model.items = [
+            OrderItemModel(
+                id=order_id * items + i, order_id=order_id, product_id=i + 1, quantity=1,
+                created_at=created_at, updated_at=created_at,
+            )
+            for i in range(items)
+        ]
+        models.append(model)
+    return models
+
+
+def construct_order(model: OrderModel) -> OrderDb:
+    # Same fields as map_order_model, without validation
+    return OrderDb.model_construct(
+        id=model.id,
+        customer_id=model.customer_id,
+        status=OrderStatus(model.status),
+        payment_status=PaymentStatus(model.payment_status),
+        items=[OrderItemDb.model_construct(
+            id=item.id, order_id=item.order_id, product_id=item.product_id, quantity=item.quantity,
+            created_at=item.created_at, updated_at=item.updated_at
+        ) for item in model.items],
+        total=model.total,
+        created_at=model.created_at,
+        updated_at=model.updated_at
+    )
+
+
+def default_encoding(models: List[OrderModel]) -> bytes:
+    orders = [map_order_model(model) for model in models]
+    content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=orders, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def dump_json(models: List[OrderModel]) -> bytes:
+    return ORDER_LIST_ADAPTER.dump_json([map_order_model(model) for model in models])
+
+
+def construct_dump_json(models: List[OrderModel]) -> bytes:
+    return ORDER_LIST_ADAPTER.dump_json([construct_order(model) for model in models])
+
+
+def measure(label: str, render: Callable[[List[OrderModel]], bytes], models: List[OrderModel], repeat: int) -> float:
+    render(models)
+    cpu = []
+    for _ in range(repeat):
+        started = time.process_time()
+        body = render(models)
+        cpu.append(time.process_time() - started)
+    best = min(cpu)
+    print(f"{label:<22} {best * 1000:9.1f} ms CPU per request {len(body) / 1024:9.0f} KiB")
+    return best
+
+
+def run(orders: int, items: int, repeat: int) -> None:
+    models = make_models(orders, items)
+    print(f"{orders} orders with {items} items each, best of {repeat}")
+    before = measure("default encoding", default_encoding, models, repeat)
+    after = measure("dump_json", dump_json, models, repeat)
+    measure("model_construct + dump", construct_dump_json, models, repeat)
+    print(f"{'speedup':<22} {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    run(args.orders, args.items, args.repeat)
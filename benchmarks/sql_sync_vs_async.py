@@ -0,0 +1,112 @@
+"""
+Requests/sec of the order endpoints on the sync SQL path (Session in the
+threadpool) versus the async path (AsyncSession on the event loop).
+
+Usage: python -m benchmarks.sql_sync_vs_async [--orders 2000] [--requests 2000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from decimal import Decimal
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.api.order_router import get_order_use_cases, router
+from app.adapters.models.sql.base import Base
+from app.adapters.repositories import (
+    RepositoryType,
+    get_async_order_item_repository,
+    get_async_order_repository,
+    get_order_item_repository,
+    get_order_repository,
+    get_unit_of_work,
+)
+from app.application.use_cases.async_order_use_cases import AsyncOrderUseCases
+from app.application.use_cases.order_use_cases import OrderUseCases
+from app.domain.entities.order import Order, OrderItem
+
+
+def seed(session_factory, count: int) -> None:
+    with session_factory() as db:
+        use_cases = OrderUseCases(
+            get_order_repository(RepositoryType.SQL, db),
+            get_order_item_repository(RepositoryType.SQL, db),
+            get_unit_of_work(RepositoryType.SQL, db)
+        )
+        order = Order(customer_id=1, items=[OrderItem(product_id=1, quantity=1), OrderItem(product_id=2, quantity=2)])
+        for _ in range(count):
+            use_cases.create_order(order, {1: Decimal("9.90"), 2: Decimal("4.50")})
+
+
+def build_app(use_cases_dependency) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router, prefix="/orders")
+    app.dependency_overrides[get_order_use_cases] = use_cases_dependency
+    return app
+
+
+async def measure(app: FastAPI, paths, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        async def hit(i: int) -> None:
+            async with semaphore:
+                response = await client.get(paths[i % len(paths)])
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(hit(i) for i in range(requests)))
+        return requests / (time.perf_counter() - started)
+
+
+async def main(orders: int, requests: int, concurrency: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autoflush=False, bind=engine)
+    seed(SessionLocal, orders)
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def sync_use_cases():
+        with SessionLocal() as db:
+            yield OrderUseCases(
+                get_order_repository(RepositoryType.SQL, db),
+                get_order_item_repository(RepositoryType.SQL, db)
+            )
+
+    async def async_use_cases():
+        async with AsyncSessionLocal() as db:
+            yield AsyncOrderUseCases(
+                get_async_order_repository(RepositoryType.SQL, db),
+                get_async_order_item_repository(RepositoryType.SQL, db)
+            )
+
+    workloads = {
+        "GET /orders/{id}": [f"/orders/{order_id}" for order_id in range(1, orders + 1)],
+        "GET /orders?limit=50": ["/orders/?limit=50"],
+    }
+    print(f"{orders} orders, {requests} requests, concurrency {concurrency}")
+    for name, paths in workloads.items():
+        for label, dependency in (("sync", sync_use_cases), ("async", async_use_cases)):
+            rate = await measure(build_app(dependency), paths, requests, concurrency)
+            print(f"{name:<22} {label:<6} {rate:10.1f} req/s")
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.requests, args.concurrency))
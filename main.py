@@ -1,15 +1,42 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.adapters.api.order_router import router as order_router
-from app.adapters.models.sql.base import Base
-from app.adapters.models.sql.session import engine
+from app.adapters.api.order_router import NEXT_CURSOR_HEADER, router as order_router
+from app.adapters.http.service_client import (
+    close_http_client, customer_cache, downstreams, product_cache, start_http_client
+)
+from app.adapters.models.nosql.async_connection import close_async_mongo_client, get_async_db
+from app.adapters.models.nosql.indexes import ensure_async_indexes
+from app.adapters.models.sql.base import Base, create_indexes
+from app.adapters.outbox.worker import start_outbox_worker, stop_outbox_worker
+from app.adapters.repositories.sql_order_repository import init_status_counts
+from app.adapters.models.sql.session import SessionLocal, engine
 from app.config import settings
 
-# Create database tables
+# Create database tables, and the indexes missing from tables created before them
 Base.metadata.create_all(bind=engine)
+create_indexes(engine)
+with SessionLocal() as db:
+    init_status_counts(db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client is shared by every downstream call
+    await start_http_client()
+    if settings.NOSQL_ENSURE_INDEXES:
+        await ensure_async_indexes(get_async_db())
+    if settings.OUTBOX_ENABLED:
+        await start_outbox_worker()
+    yield
+    await stop_outbox_worker()
+    await close_http_client()
+    close_async_mongo_client()
 
-app = FastAPI(title="Orders Service API")
+
+app = FastAPI(title="Orders Service API", lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -18,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Include routers
@@ -30,4 +58,13 @@ app.include_router(
 
 @app.get("/", tags=["health"])
 def health_check():
-    return {"status": "ok", "service": "orders-service"} 
\ No newline at end of file
+    return {"status": "ok", "service": "orders-service"}
+
+
+@app.get("/metrics", tags=["health"])
+def metrics():
+    return {
+        "product_cache": product_cache.stats(),
+        "customer_cache": customer_cache.stats(),
+        "downstreams": {name: downstream.stats() for name, downstream in downstreams.items()},
+    }
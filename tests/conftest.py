@@ -0,0 +1,117 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.adapters.api.order_router import router
+from app.adapters.models.sql.base import Base
+from app.adapters.models.sql.order_model import OrderModel
+from app.adapters.models.sql.order_item_model import OrderItemModel
+from app.adapters.models.sql.session import get_db
+from app.domain.entities.order import OrderStatus, PaymentStatus
+
+
+@pytest.fixture
+def sql_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(sql_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=sql_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def sql_app(db_session):
+    """The order API on the test database; override it in a module to replace more dependencies"""
+    app = FastAPI()
+    app.include_router(router, prefix="/orders", tags=["orders"])
+    app.dependency_overrides[get_db] = lambda: db_session
+    return app
+
+
+@pytest.fixture
+def client(sql_app):
+    return TestClient(sql_app)
+
+
+@pytest_asyncio.fixture
+async def async_db_session():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        await session.close()
+        await engine.dispose()
+
+
+@pytest.fixture
+def seed_orders(db_session):
+    def _seed(count, status=OrderStatus.PLACED, items_per_order=1):
+        start = datetime(2024, 1, 1)
+        for i in range(count):
+            order = OrderModel(
+                customer_id=i % 3 + 1,
+                status=status,
+                payment_status=PaymentStatus.PENDING,
+                total=Decimal("10.00"),
+                # Every two orders share a timestamp to exercise the id tie-breaker
+                created_at=start + timedelta(minutes=i // 2),
+            )
+            order.items = [
+                OrderItemModel(product_id=j + 1, quantity=1) for j in range(items_per_order)
+            ]
+            db_session.add(order)
+        db_session.commit()
+
+    return _seed
+
+
+class StatementCounter:
+    """Records every SQL statement sent to the database through an engine"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_statements(sql_engine):
+    @contextmanager
+    def _count():
+        counter = StatementCounter()
+        event.listen(sql_engine, "before_cursor_execute", counter)
+        try:
+            yield counter
+        finally:
+            event.remove(sql_engine, "before_cursor_execute", counter)
+
+    return _count
@@ -0,0 +1,142 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo import ReturnDocument
+
+from app.adapters.models.nosql.id_allocator import AsyncIdAllocator
+from app.adapters.repositories.async_nosql_order_item_repository import AsyncNoSQLOrderItemRepository
+from app.adapters.repositories.async_nosql_order_repository import AsyncNoSQLOrderRepository
+from app.domain.entities.order import Order, OrderItem, OrderStatus, PaymentStatus
+
+
+def order_doc(order_id, created_at):
+    return {
+        "_id": order_id, "customer_id": 1, "status": OrderStatus.PLACED,
+        "payment_status": PaymentStatus.PENDING, "total": 10.0,
+        "created_at": created_at, "updated_at": created_at
+    }
+
+
+def item_doc(item_id, order_id, created_at):
+    return {
+        "_id": item_id, "order_id": order_id, "product_id": 1, "quantity": 1,
+        "created_at": created_at, "updated_at": created_at
+    }
+
+
+def motor_cursor(documents):
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=documents)
+    return cursor
+
+
+class FakeAsyncCounters:
+    def __init__(self):
+        self.seq = 0
+        self.reservations = 0
+
+    async def find_one_and_update(self, filter, update, upsert, return_document):
+        self.reservations += 1
+        self.seq += update["$inc"]["seq"]
+        return {"_id": filter["_id"], "seq": self.seq}
+
+    async def update_one(self, filter, update, upsert):
+        self.seq = max(self.seq, update["$max"]["seq"])
+
+
+def make_async_allocator(counters, last_id=None, block_size=10):
+    target = MagicMock()
+    target.find_one = AsyncMock(return_value={"_id": last_id} if last_id is not None else None)
+    return AsyncIdAllocator("orders", counters, target, block_size)
+
+
+class TestAsyncNoSQLOrderRepository:
+    def setup_method(self):
+        self.order_collection = MagicMock()
+        self.item_collection = MagicMock()
+        self.counters = FakeAsyncCounters()
+        self.count_collection = MagicMock()
+        self.count_collection.bulk_write = AsyncMock()
+        self.repository = AsyncNoSQLOrderRepository(
+            self.order_collection, self.item_collection, make_async_allocator(self.counters), self.count_collection
+        )
+        self.now = datetime(2024, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_get_page_fetches_items_in_one_query(self):
+        self.order_collection.find.return_value = motor_cursor([order_doc(i, self.now) for i in (1, 2, 3)])
+        self.item_collection.find.return_value = motor_cursor([item_doc(10, 2, self.now)])
+
+        page = await self.repository.get_page(2, status=OrderStatus.PLACED)
+
+        self.order_collection.find.assert_called_once_with({"status": OrderStatus.PLACED})
+        self.item_collection.find.assert_called_once_with({"order_id": {"$in": [1, 2]}})
+        assert [order.id for order in page.items] == [1, 2]
+        assert [len(order.items) for order in page.items] == [0, 1]
+        assert page.next_cursor.id == 2
+
+    @pytest.mark.asyncio
+    async def test_get_all_empty_skips_item_query(self):
+        self.order_collection.find.return_value = motor_cursor([])
+
+        assert await self.repository.get_all() == []
+        self.item_collection.find.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_by_id_missing_returns_none(self):
+        self.order_collection.find_one = AsyncMock(return_value=None)
+
+        assert await self.repository.get_by_id(1) is None
+
+    @pytest.mark.asyncio
+    async def test_create_uses_allocated_id(self):
+        self.order_collection.insert_one = AsyncMock()
+
+        first = await self.repository.create(Order(customer_id=1, items=[]))
+        second = await self.repository.create(Order(customer_id=1, items=[]))
+
+        assert (first.id, second.id) == (1, 2)
+        assert self.counters.reservations == 1
+        assert self.order_collection.insert_one.await_args.args[0]["_id"] == 2
+        [increment] = self.count_collection.bulk_write.await_args.args[0]
+        assert increment._doc == {"$inc": {"count": 1}}
+
+    @pytest.mark.asyncio
+    async def test_update_status_missing_order_returns_none(self):
+        self.order_collection.find_one_and_update = AsyncMock(return_value=None)
+
+        assert await self.repository.update_status(1, OrderStatus.PREPARING) is None
+        self.item_collection.find.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_status_moves_counts_from_the_previous_document(self):
+        self.order_collection.find_one_and_update = AsyncMock(return_value=order_doc(1, self.now))
+        self.item_collection.find.return_value = motor_cursor([item_doc(10, 1, self.now)])
+
+        order = await self.repository.update_status(1, OrderStatus.PREPARING)
+
+        assert order.status == OrderStatus.PREPARING
+        assert [item.id for item in order.items] == [10]
+        assert self.order_collection.find_one_and_update.await_args.kwargs["return_document"] == ReturnDocument.BEFORE
+        [updates] = self.count_collection.bulk_write.await_args.args
+        changes = {update._filter["_id"]: update._doc["$inc"]["count"] for update in updates}
+        assert changes == {OrderStatus.PLACED.value: -1, OrderStatus.PREPARING.value: 1}
+
+
+class TestAsyncNoSQLOrderItemRepository:
+    @pytest.mark.asyncio
+    async def test_create_many_inserts_once_with_preallocated_ids(self):
+        collection = MagicMock()
+        collection.insert_many = AsyncMock()
+        counters = FakeAsyncCounters()
+        repository = AsyncNoSQLOrderItemRepository(collection, make_async_allocator(counters, last_id=5))
+        items = [OrderItem(product_id=i, quantity=1) for i in (1, 2, 3)]
+
+        result = await repository.create_many(7, items)
+
+        assert [item.id for item in result] == [6, 7, 8]
+        assert counters.reservations == 1
+        collection.insert_many.assert_awaited_once()
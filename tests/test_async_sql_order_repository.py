@@ -0,0 +1,115 @@
+import pytest
+from decimal import Decimal
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from app.adapters.api.order_router import get_order_use_cases, router
+from app.adapters.repositories.async_sql_order_item_repository import AsyncSQLOrderItemRepository
+from app.adapters.repositories.async_sql_order_repository import AsyncSQLOrderRepository
+from app.application.use_cases.async_order_use_cases import AsyncOrderUseCases
+from app.domain.entities.order import (
+    AnalyticsGroup, AnalyticsInterval, Order, OrderItem, OrderStatus, PaymentStatus
+)
+
+
+@pytest.fixture
+def use_cases(async_db_session):
+    return AsyncOrderUseCases(
+        AsyncSQLOrderRepository(async_db_session),
+        AsyncSQLOrderItemRepository(async_db_session)
+    )
+
+
+async def create_orders(use_cases, count):
+    order = Order(customer_id=1, items=[OrderItem(product_id=1, quantity=2), OrderItem(product_id=2, quantity=1)])
+    return [
+        await use_cases.create_order(order, {1: Decimal("10.00"), 2: Decimal("5.50")})
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_order_with_items_and_total(use_cases):
+    [created] = await create_orders(use_cases, 1)
+
+    stored = await use_cases.get_order_by_id(created.id)
+
+    assert created.total == Decimal("25.50")
+    assert stored.total == Decimal("25.50")
+    assert [item.product_id for item in stored.items] == [1, 2]
+
+@pytest.mark.asyncio
+async def test_get_orders_page_walks_all_orders(use_cases):
+    created = await create_orders(use_cases, 5)
+
+    first = await use_cases.get_orders_page(3)
+    second = await use_cases.get_orders_page(3, first.next_cursor)
+
+    assert [order.id for order in first.items + second.items] == [order.id for order in created]
+    assert all(len(order.items) == 2 for order in first.items)
+    assert second.next_cursor is None
+
+@pytest.mark.asyncio
+async def test_update_payment_status_confirms_placed_order(use_cases):
+    [created] = await create_orders(use_cases, 1)
+
+    updated = await use_cases.update_payment_status(created.id, PaymentStatus.APPROVED)
+
+    assert updated.status == OrderStatus.CONFIRMED
+    assert updated.payment_status == PaymentStatus.APPROVED
+    assert len(updated.items) == 2
+    assert await use_cases.update_order_status(999, OrderStatus.PREPARING) is None
+
+@pytest.mark.asyncio
+async def test_router_awaits_async_use_cases(use_cases):
+    [created] = await create_orders(use_cases, 1)
+    app = FastAPI()
+    app.include_router(router, prefix="/orders")
+    app.dependency_overrides[get_order_use_cases] = lambda: use_cases
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        listing = await client.get("/orders/")
+        updated = await client.patch(f"/orders/{created.id}/status/{OrderStatus.PREPARING.value}")
+
+    assert [order["id"] for order in listing.json()] == [created.id]
+    assert updated.json()["status"] == OrderStatus.PREPARING.value
+
+
+@pytest.mark.asyncio
+async def test_status_counts_follow_transitions(use_cases):
+    created = await create_orders(use_cases, 3)
+    await use_cases.update_order_status(created[0].id, OrderStatus.CONFIRMED)
+    await use_cases.update_order_status(created[0].id, OrderStatus.CONFIRMED)
+
+    stats = await use_cases.get_order_stats()
+
+    assert stats.total == 3
+    assert stats.counts[OrderStatus.PLACED] == 2
+    assert stats.counts[OrderStatus.CONFIRMED] == 1
+    assert await use_cases.rebuild_order_stats() == stats
+
+
+@pytest.mark.asyncio
+async def test_get_order_analytics_buckets_created_orders(use_cases):
+    created = await create_orders(use_cases, 2)
+    hour = created[0].created_at.replace(minute=0, second=0, microsecond=0)
+
+    buckets = await use_cases.get_order_analytics(
+        hour, hour + AnalyticsInterval.HOUR.length * 2, AnalyticsInterval.HOUR, AnalyticsGroup.STATUS
+    )
+
+    assert sum(bucket.order_count for bucket in buckets) == 2
+    assert sum(bucket.revenue for bucket in buckets) == Decimal("51.00")
+    assert {bucket.group for bucket in buckets} == {OrderStatus.PLACED.value}
+    assert all(bucket.items_per_order == 3 for bucket in buckets)
+
+
+@pytest.mark.asyncio
+async def test_get_orders_summary_page_loads_only_requested_fields(use_cases):
+    await create_orders(use_cases, 3)
+
+    page = await use_cases.get_orders_summary_page(frozenset({"total", "items"}), 2)
+
+    assert [order.model_dump(exclude_unset=True).keys() for order in page.items] == [{"id", "total", "items"}] * 2
+    assert [len(order.items) for order in page.items] == [2, 2]
+    assert page.next_cursor is not None
@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from app.adapters.http.cache import AsyncTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.mark.asyncio
+async def test_hit_after_first_load(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60, clock=clock)
+    loader = AsyncMock(return_value={"id": 1})
+
+    assert await cache.get(1, loader) == {"id": 1}
+    assert await cache.get(1, loader) == {"id": 1}
+
+    loader.assert_awaited_once()
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_reloaded(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60, clock=clock)
+    loader = AsyncMock(side_effect=[{"v": 1}, {"v": 2}])
+
+    await cache.get(1, loader)
+    clock.now = 61
+
+    assert await cache.get(1, loader) == {"v": 2}
+    assert loader.await_count == 2
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted(clock):
+    cache = AsyncTTLCache(maxsize=2, ttl=60, clock=clock)
+    for key in (1, 2):
+        await cache.get(key, AsyncMock(return_value=key))
+    await cache.get(1, AsyncMock())
+    await cache.get(3, AsyncMock(return_value=3))
+
+    assert await cache.get(1, AsyncMock()) == 1
+    assert await cache.get(2, AsyncMock(return_value="reloaded")) == "reloaded"
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60, clock=clock)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get(1, loader) for _ in range(5)))
+
+    assert results == ["value"] * 5
+    assert calls == 1
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_revalidating(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60, stale_ttl=30, clock=clock)
+    await cache.get(1, AsyncMock(return_value="old"))
+    clock.now = 70
+    loader = AsyncMock(return_value="new")
+
+    assert await cache.get(1, loader) == "old"
+    await asyncio.sleep(0)
+    assert await cache.get(1, AsyncMock()) == "new"
+    loader.assert_awaited_once()
+    assert cache.stats()["stale_hits"] == 1
+
+@pytest.mark.asyncio
+async def test_max_age_bounds_staleness(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60, stale_ttl=30, clock=clock)
+    await cache.get(1, AsyncMock(return_value="old"))
+    clock.now = 5
+
+    assert await cache.get(1, AsyncMock(), max_age=10) == "old"
+    assert await cache.get(1, AsyncMock(return_value="fresh"), max_age=2) == "fresh"
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60, clock=clock)
+
+    with pytest.raises(RuntimeError):
+        await cache.get(1, AsyncMock(side_effect=RuntimeError("boom")))
+    assert await cache.get(1, AsyncMock(return_value="ok")) == "ok"
+
+@pytest.mark.asyncio
+async def test_none_cached_only_with_negative_ttl(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60, clock=clock)
+    await cache.get(1, AsyncMock(return_value=None))
+    assert await cache.get(1, AsyncMock(return_value="found")) == "found"
+
+    negative = AsyncTTLCache(maxsize=10, ttl=60, negative_ttl=5, clock=clock)
+    await negative.get(1, AsyncMock(return_value=None))
+    assert await negative.get(1, AsyncMock(return_value="found")) is None
+    clock.now = 6
+    assert await negative.get(1, AsyncMock(return_value="found")) == "found"
+
+@pytest.mark.asyncio
+async def test_load_in_flight_during_invalidate_is_not_stored(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60, clock=clock)
+    release = asyncio.Event()
+
+    async def load_before_update():
+        await release.wait()
+        return "before"
+
+    pending = asyncio.ensure_future(cache.get(1, load_before_update))
+    await asyncio.sleep(0)
+    cache.invalidate(1)
+    # Callers after the invalidation start their own load instead of joining the old one
+    assert await cache.get(1, AsyncMock(return_value="after")) == "after"
+    release.set()
+
+    assert await pending == "before"
+    assert await cache.get(1, AsyncMock()) == "after"
@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock
+
+from app.adapters.models.nosql.id_allocator import IdAllocator
+
+
+class FakeCounters:
+    """Minimal stand-in for the counters collection"""
+
+    def __init__(self):
+        self.sequences = {}
+        self.reservations = 0
+
+    def find_one_and_update(self, filter, update, upsert, return_document):
+        self.reservations += 1
+        name = filter["_id"]
+        self.sequences[name] = self.sequences.get(name, 0) + update["$inc"]["seq"]
+        return {"_id": name, "seq": self.sequences[name]}
+
+    def update_one(self, filter, update, upsert):
+        name = filter["_id"]
+        self.sequences[name] = max(self.sequences.get(name, 0), update["$max"]["seq"])
+
+
+def make_allocator(counters, last_id=None, block_size=10):
+    target = MagicMock()
+    target.find_one.return_value = {"_id": last_id} if last_id is not None else None
+    return IdAllocator("orders", counters, target, block_size)
+
+
+def test_ids_served_from_reserved_block():
+    counters = FakeCounters()
+    allocator = make_allocator(counters)
+
+    ids = [allocator.next_id() for _ in range(10)]
+
+    assert ids == list(range(1, 11))
+    assert counters.reservations == 1
+    assert allocator.next_id() == 11
+    assert counters.reservations == 2
+
+
+def test_seeds_counter_past_existing_documents():
+    counters = FakeCounters()
+    allocator = make_allocator(counters, last_id=41)
+
+    assert allocator.next_id() == 42
+
+
+def test_processes_receive_disjoint_blocks():
+    counters = FakeCounters()
+    first = make_allocator(counters)
+    second = make_allocator(counters)
+
+    first_ids = first.allocate(3)
+    second_ids = second.allocate(3)
+
+    assert first_ids == [1, 2, 3]
+    assert second_ids == [11, 12, 13]
+
+
+def test_allocate_larger_than_block():
+    counters = FakeCounters()
+    allocator = make_allocator(counters, block_size=4)
+    allocator.next_id()
+
+    ids = allocator.allocate(6)
+
+    assert ids == [2, 3, 4, 5, 6, 7]
+    assert counters.reservations == 2
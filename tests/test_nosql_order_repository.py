@@ -0,0 +1,227 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from app.adapters.models.nosql.indexes import INDEXES, ensure_indexes
+from app.adapters.repositories.nosql_order_repository import NoSQLOrderRepository
+from app.domain.entities.order import AnalyticsGroup, AnalyticsInterval, OrderStatus, PaymentStatus
+
+
+def order_doc(order_id, created_at):
+    return {
+        "_id": order_id, "customer_id": 1, "status": OrderStatus.PLACED,
+        "payment_status": PaymentStatus.PENDING, "total": 10.0,
+        "created_at": created_at, "updated_at": created_at
+    }
+
+
+def item_doc(item_id, order_id, created_at):
+    return {
+        "_id": item_id, "order_id": order_id, "product_id": 1, "quantity": 1,
+        "created_at": created_at, "updated_at": created_at
+    }
+
+
+class TestNoSQLOrderRepository:
+    def setup_method(self):
+        self.order_collection = MagicMock()
+        self.item_collection = MagicMock()
+        self.count_collection = MagicMock()
+        self.repository = NoSQLOrderRepository(
+            self.order_collection, self.item_collection, count_collection=self.count_collection
+        )
+        self.now = datetime(2024, 1, 1)
+
+    def test_get_all_fetches_items_in_one_query(self):
+        self.order_collection.find.return_value = [order_doc(i, self.now) for i in (1, 2, 3)]
+        self.item_collection.find.return_value = [
+            item_doc(10, 1, self.now), item_doc(11, 3, self.now), item_doc(12, 1, self.now)
+        ]
+
+        result = self.repository.get_all()
+
+        self.item_collection.find.assert_called_once_with({"order_id": {"$in": [1, 2, 3]}})
+        assert [len(order.items) for order in result] == [2, 0, 1]
+        assert [item.id for item in result[0].items] == [10, 12]
+
+    def test_get_all_empty_skips_item_query(self):
+        self.order_collection.find.return_value = []
+
+        assert self.repository.get_all() == []
+        self.item_collection.find.assert_not_called()
+
+    def test_get_page_fetches_items_in_one_query(self):
+        docs = [order_doc(i, self.now) for i in (1, 2, 3)]
+        self.order_collection.find.return_value.sort.return_value.limit.return_value = docs
+        self.item_collection.find.return_value = [item_doc(10, 2, self.now)]
+
+        page = self.repository.get_page(2, status=OrderStatus.PLACED)
+
+        self.order_collection.find.assert_called_once_with({"status": OrderStatus.PLACED})
+        self.item_collection.find.assert_called_once_with({"order_id": {"$in": [1, 2]}})
+        assert [order.id for order in page.items] == [1, 2]
+        assert page.next_cursor.id == 2
+
+    def test_get_by_customer_queries_the_customer_range(self):
+        docs = [order_doc(i, self.now) for i in (1, 2)]
+        self.order_collection.find.return_value.sort.return_value.limit.return_value = docs
+        self.item_collection.find.return_value = []
+
+        page = self.repository.get_by_customer(1, 2)
+
+        self.order_collection.find.assert_called_once_with({"customer_id": 1})
+        self.order_collection.find.return_value.sort.assert_called_once_with([("created_at", 1), ("_id", 1)])
+        assert [order.id for order in page.items] == [1, 2]
+        assert page.next_cursor is None
+
+    def test_get_summary_page_projects_the_requested_fields(self):
+        docs = [{"_id": i, "status": OrderStatus.PLACED.value, "created_at": self.now} for i in (1, 2, 3)]
+        self.order_collection.find.return_value.sort.return_value.limit.return_value = docs
+
+        page = self.repository.get_summary_page(frozenset({"id", "status"}), 2, status=OrderStatus.PLACED)
+
+        self.order_collection.find.assert_called_once_with(
+            {"status": OrderStatus.PLACED}, {"status": 1, "created_at": 1}
+        )
+        self.item_collection.find.assert_not_called()
+        assert [summary.model_dump(exclude_unset=True) for summary in page.items] == [
+            {"id": 1, "status": OrderStatus.PLACED}, {"id": 2, "status": OrderStatus.PLACED}
+        ]
+        assert page.next_cursor.id == 2
+
+    def test_get_analytics_aggregates_on_the_server(self):
+        self.item_collection.name = "order_items"
+        self.order_collection.aggregate.return_value = [
+            {
+                "_id": {"bucket_start": self.now, "group": PaymentStatus.APPROVED.value},
+                "order_count": 3, "revenue": 30.1, "item_count": 4,
+            },
+        ]
+
+        [bucket] = self.repository.get_analytics(
+            self.now, datetime(2024, 1, 2), AnalyticsInterval.HOUR, AnalyticsGroup.PAYMENT_STATUS
+        )
+
+        [pipeline] = self.order_collection.aggregate.call_args.args
+        assert pipeline[0] == {"$match": {"created_at": {"$gte": self.now, "$lt": datetime(2024, 1, 2)}}}
+        assert pipeline[1]["$lookup"]["from"] == "order_items"
+        assert pipeline[2]["$group"]["_id"] == {
+            "bucket_start": {"$dateTrunc": {"date": "$created_at", "unit": "hour"}},
+            "group": "$payment_status",
+        }
+        self.order_collection.find.assert_not_called()
+        assert (bucket.order_count, str(bucket.revenue), str(bucket.average_ticket)) == (3, "30.10", "10.03")
+        assert bucket.items_per_order == 1.33
+
+    def test_get_by_id_uses_single_order_lookup(self):
+        self.order_collection.find_one.return_value = order_doc(1, self.now)
+        self.item_collection.find.return_value = [item_doc(10, 1, self.now)]
+
+        order = self.repository.get_by_id(1)
+
+        self.item_collection.find.assert_called_once_with({"order_id": 1})
+        assert [item.id for item in order.items] == [10]
+
+    def test_get_version_reads_only_updated_at(self):
+        self.order_collection.find_one.return_value = {"_id": 1, "updated_at": self.now}
+
+        assert self.repository.get_version(1) == self.now
+        self.order_collection.find_one.assert_called_once_with({"_id": 1}, {"updated_at": 1})
+        self.item_collection.find.assert_not_called()
+
+    def status_count_changes(self):
+        [updates] = self.count_collection.bulk_write.call_args.args
+        return {update._filter["_id"]: update._doc["$inc"]["count"] for update in updates}
+
+    def test_update_status_reads_document_from_the_write(self):
+        self.order_collection.find_one_and_update.return_value = order_doc(1, self.now)
+        self.item_collection.find.return_value = []
+
+        order = self.repository.update_status(1, OrderStatus.PREPARING)
+
+        assert order.status == OrderStatus.PREPARING
+        self.order_collection.find_one.assert_not_called()
+        self.order_collection.update_one.assert_not_called()
+        # The document before the write moves one order between the status counters
+        assert self.status_count_changes() == {OrderStatus.PLACED.value: -1, OrderStatus.PREPARING.value: 1}
+
+    def test_update_status_missing_order_returns_none(self):
+        self.order_collection.find_one_and_update.return_value = None
+
+        assert self.repository.update_status(1, OrderStatus.PREPARING) is None
+
+    def test_transition_payment_status_is_one_conditional_write(self):
+        self.order_collection.find_one_and_update.return_value = order_doc(1, self.now)
+        self.item_collection.find.return_value = []
+
+        order = self.repository.transition_payment_status(
+            1, PaymentStatus.APPROVED, [PaymentStatus.PENDING], (OrderStatus.PLACED, OrderStatus.CONFIRMED)
+        )
+
+        filter, pipeline = self.order_collection.find_one_and_update.call_args.args
+        assert filter == {"_id": 1, "payment_status": {"$in": [PaymentStatus.PENDING]}}
+        assert pipeline[0]["$set"]["status"] == {
+            "$cond": [{"$eq": ["$status", OrderStatus.PLACED]}, OrderStatus.CONFIRMED, "$status"]
+        }
+        assert (order.status, order.payment_status) == (OrderStatus.CONFIRMED, PaymentStatus.APPROVED)
+        assert self.status_count_changes() == {OrderStatus.PLACED.value: -1, OrderStatus.CONFIRMED.value: 1}
+
+    def test_update_status_many_is_one_set_based_write(self):
+        self.order_collection.find.return_value = [{"_id": 1}, {"_id": 3}]
+        self.order_collection.update_many.return_value.modified_count = 2
+
+        updated_ids = self.repository.update_status_many([1, 2, 3], OrderStatus.READY_FOR_PICKUP, OrderStatus.PREPARING)
+
+        filter, update = self.order_collection.update_many.call_args.args
+        assert filter == {"_id": {"$in": [1, 2, 3]}, "status": OrderStatus.PREPARING}
+        assert update["$set"]["status"] == OrderStatus.READY_FOR_PICKUP
+        # Ids are read back by the id this write tagged them with, not by its timestamp
+        assert self.order_collection.find.call_args.args[0] == {
+            "_id": {"$in": [1, 2, 3]}, "status_write_id": update["$set"]["status_write_id"]
+        }
+        assert updated_ids == [1, 3]
+        assert self.status_count_changes() == {
+            OrderStatus.PREPARING.value: -2, OrderStatus.READY_FOR_PICKUP.value: 2
+        }
+
+    def test_update_status_many_pins_each_previous_status(self):
+        self.order_collection.find.side_effect = [
+            [{"_id": 1, "status": OrderStatus.PLACED}, {"_id": 2, "status": OrderStatus.CANCELED}],
+            [{"_id": 1}, {"_id": 2}],
+        ]
+        self.order_collection.update_many.return_value.modified_count = 1
+
+        self.repository.update_status_many([1, 2], OrderStatus.CANCELED)
+
+        updates = [call.args[1] for call in self.order_collection.update_many.call_args_list]
+        # Both writes of the call share one tag
+        assert updates[0]["$set"]["status_write_id"] == updates[1]["$set"]["status_write_id"]
+        filters = [call.args[0] for call in self.order_collection.update_many.call_args_list]
+        assert filters == [
+            {"_id": {"$in": [1]}, "status": OrderStatus.PLACED},
+            {"_id": {"$in": [2]}, "status": OrderStatus.CANCELED},
+        ]
+        # Re-setting the current status changes no counter
+        assert self.status_count_changes() == {OrderStatus.PLACED.value: -1, OrderStatus.CANCELED.value: 1}
+
+    def test_rebuild_status_counts_recounts_every_status(self):
+        self.order_collection.aggregate.return_value = [{"_id": OrderStatus.PLACED.value, "count": 3}]
+
+        counts = self.repository.rebuild_status_counts()
+
+        assert counts[OrderStatus.PLACED] == 3
+        assert counts[OrderStatus.DELIVERED] == 0
+        [updates] = self.count_collection.bulk_write.call_args.args
+        assert len(updates) == len(OrderStatus)
+
+
+
+def test_ensure_indexes_covers_the_queried_fields():
+    db = {name: MagicMock() for name in INDEXES}
+
+    ensure_indexes(db)
+
+    created = {name: collection.create_indexes.call_args.args[0] for name, collection in db.items()}
+    keys = {name: [list(index.document["key"]) for index in indexes] for name, indexes in created.items()}
+    assert ["status", "created_at", "_id"] in keys["orders"]
+    assert ["customer_id", "created_at", "_id"] in keys["orders"]
+    assert ["order_id"] in keys["order_items"]
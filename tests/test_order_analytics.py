@@ -0,0 +1,92 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.adapters.models.sql.order_item_model import OrderItemModel
+from app.adapters.models.sql.order_model import OrderModel
+from app.domain.entities.order import OrderStatus, PaymentStatus
+
+
+@pytest.fixture
+def add_order(db_session):
+    def _add(created_at, total, quantities=(1,), status=OrderStatus.PLACED, payment_status=PaymentStatus.PENDING):
+        order = OrderModel(
+            customer_id=1, status=status, payment_status=payment_status, total=total, created_at=created_at
+        )
+        order.items = [
+            OrderItemModel(product_id=i + 1, quantity=quantity) for i, quantity in enumerate(quantities)
+        ]
+        db_session.add(order)
+        db_session.commit()
+
+    return _add
+
+
+RANGE = {"start": "2024-01-01T00:00:00", "end": "2024-01-02T00:00:00"}
+
+
+def test_hourly_buckets_aggregate_in_the_database(client, add_order, count_statements):
+    add_order(datetime(2024, 1, 1, 9, 5), Decimal("10.00"), (1, 2))
+    add_order(datetime(2024, 1, 1, 9, 55), Decimal("25.50"), (1,))
+    add_order(datetime(2024, 1, 1, 11, 0), Decimal("4.00"), (4,))
+    add_order(datetime(2024, 1, 2, 0, 0), Decimal("99.00"))  # end of the range is excluded
+
+    with count_statements() as counter:
+        response = client.get("/orders/analytics", params=RANGE)
+
+    assert response.status_code == 200
+    assert counter.count == 1
+    assert response.json() == [
+        {
+            "bucket_start": "2024-01-01T09:00:00", "group": None, "order_count": 2,
+            "revenue": "35.50", "average_ticket": "17.75", "items_per_order": 2.0,
+        },
+        {
+            "bucket_start": "2024-01-01T11:00:00", "group": None, "order_count": 1,
+            "revenue": "4.00", "average_ticket": "4.00", "items_per_order": 4.0,
+        },
+    ]
+
+
+def test_daily_buckets_split_by_payment_status(client, add_order):
+    add_order(datetime(2024, 1, 1, 9), Decimal("10.00"), payment_status=PaymentStatus.APPROVED)
+    add_order(datetime(2024, 1, 1, 18), Decimal("30.00"), payment_status=PaymentStatus.APPROVED)
+    add_order(datetime(2024, 1, 1, 20), Decimal("5.00"))
+
+    response = client.get(
+        "/orders/analytics", params={**RANGE, "interval": "day", "group_by": "payment_status"}
+    )
+
+    assert [(row["bucket_start"], row["group"], row["order_count"], row["revenue"]) for row in response.json()] == [
+        ("2024-01-01T00:00:00", PaymentStatus.APPROVED.value, 2, "40.00"),
+        ("2024-01-01T00:00:00", PaymentStatus.PENDING.value, 1, "5.00"),
+    ]
+
+
+def test_orders_without_items_count_as_zero_items(client, add_order):
+    add_order(datetime(2024, 1, 1, 9), Decimal("0"), ())
+    add_order(datetime(2024, 1, 1, 9), Decimal("8.00"), (3,))
+
+    [bucket] = client.get("/orders/analytics", params=RANGE).json()
+
+    assert bucket["items_per_order"] == 1.5
+    assert bucket["average_ticket"] == "4.00"
+
+
+def test_aware_bounds_are_compared_in_utc(client, add_order):
+    add_order(datetime(2024, 1, 1, 9, 30), Decimal("10.00"))
+
+    response = client.get(
+        "/orders/analytics", params={"start": "2024-01-01T10:00:00+01:00", "end": "2024-01-01T11:00:00+01:00"}
+    )
+
+    assert [row["bucket_start"] for row in response.json()] == ["2024-01-01T09:00:00"]
+
+
+@pytest.mark.parametrize("params", [
+    {"start": "2024-01-02T00:00:00", "end": "2024-01-01T00:00:00"},
+    {"start": "2024-01-01T00:00:00", "end": "2024-03-01T00:00:00"},
+])
+def test_analytics_range_is_validated(client, params):
+    assert client.get("/orders/analytics", params=params).status_code == 400
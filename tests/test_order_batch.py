@@ -0,0 +1,168 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.adapters.api.order_router import get_service_client
+from app.adapters.models.sql.outbox_model import OutboxModel
+from app.config import settings
+from app.domain.entities.order import OrderStatus
+from app.domain.entities.outbox import OutboxKind
+
+
+@pytest.fixture
+def mock_service_client():
+    client = MagicMock()
+    client.get_customers = AsyncMock(return_value={1: {"id": 1}})
+    client.get_products = AsyncMock(return_value={
+        1: {"id": 1, "name": "Product 1", "price": 10.0, "quantity": 5},
+        2: {"id": 2, "name": "Product 2", "price": 2.5, "quantity": 100},
+    })
+    client.update_product_quantities = AsyncMock(return_value=[True, True])
+    client.notify_payment_service_many = AsyncMock(return_value=[])
+    return client
+
+
+@pytest.fixture
+def sql_app(sql_app, mock_service_client):
+    sql_app.dependency_overrides[get_service_client] = lambda: mock_service_client
+    return sql_app
+
+
+def order(customer_id=1, items=((1, 1), (2, 2))):
+    return {
+        "customer_id": customer_id,
+        "items": [{"product_id": product_id, "quantity": quantity} for product_id, quantity in items],
+    }
+
+
+def test_batch_inserts_orders_and_items_in_bulk(client, db_session, mock_service_client, count_statements):
+    with count_statements() as counter:
+        response = client.post("/orders/batch", json=[order() for _ in range(5)])
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["error"] for result in results] == [None] * 5
+    assert [float(result["order"]["total"]) for result in results] == [15.0] * 5
+    assert all(len(result["order"]["items"]) == 2 for result in results)
+    # Orders and items are inserted with RETURNING in parameter order, which SQLite can
+    # only give row by row (one statement each where insertmanyvalues has a sentinel,
+    # e.g. PostgreSQL): 5 orders and 10 items, then one outbox INSERT and the status counters
+    assert counter.count == 17
+    # Lookups are shared by the batch
+    mock_service_client.get_customers.assert_awaited_once_with([1] * 5)
+    mock_service_client.get_products.assert_awaited_once()
+    # Stock is decremented once per product and payments are left to the outbox worker
+    mock_service_client.update_product_quantities.assert_not_awaited()
+    messages = db_session.query(OutboxModel).order_by(OutboxModel.id).all()
+    assert [message.payload for message in messages if message.kind == OutboxKind.STOCK_UPDATE] == [
+        {"product_id": 1, "quantity_change": -5},
+        {"product_id": 2, "quantity_change": -10},
+    ]
+    assert sum(message.kind == OutboxKind.PAYMENT_NOTIFICATION for message in messages) == 5
+
+
+def test_batch_reports_errors_per_order(client):
+    response = client.post("/orders/batch", json=[
+        order(),
+        order(customer_id=2),
+        order(items=((3, 1),)),
+        order(items=()),
+        order(items=((1, 5),)),
+        order(items=((1, 1),)),
+    ])
+
+    assert response.status_code == 200
+    results = response.json()
+    assert results[0]["order"]["id"] == 1
+    assert results[1]["error"] == "Customer with ID 2 not found"
+    assert results[2]["error"] == "Products with IDs {3} not found"
+    assert results[3]["error"] == "Order must have at least one item"
+    # Stock taken by earlier orders of the batch is not available to later ones
+    assert results[4]["error"] == "Not enough stock for product Product 1 (ID: 1)"
+    assert results[5]["order"]["id"] == 2
+
+
+def test_batch_without_valid_orders_writes_nothing(client, mock_service_client, count_statements):
+    with count_statements() as counter:
+        response = client.post("/orders/batch", json=[order(customer_id=2)])
+
+    assert response.json()[0]["error"] == "Customer with ID 2 not found"
+    assert counter.count == 0
+    mock_service_client.update_product_quantities.assert_not_awaited()
+
+
+@pytest.mark.parametrize("size", [0, settings.ORDERS_BATCH_MAX_SIZE + 1])
+def test_batch_size_is_bounded(client, size):
+    response = client.post("/orders/batch", json=[order() for _ in range(size)])
+
+    assert response.status_code == 422
+
+
+def test_bulk_status_transition_is_one_write(client, seed_orders, count_statements):
+    seed_orders(4, status=OrderStatus.PREPARING)
+    seed_orders(1, status=OrderStatus.PLACED)
+
+    with count_statements() as counter:
+        response = client.patch(
+            f"/orders/status/{OrderStatus.READY_FOR_PICKUP.value}",
+            json={"order_ids": [1, 2, 5, 3, 99, 2], "expected_status": OrderStatus.PREPARING.value}
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"transitioned": [1, 2, 3], "rejected": [5, 99]}
+    # One UPDATE for the orders and one for the status counters
+    assert counter.count == 2
+    ready = client.get(f"/orders/status/{OrderStatus.READY_FOR_PICKUP.value}").json()
+    assert [order["id"] for order in ready] == [1, 2, 3]
+
+
+def test_bulk_status_transition_without_expected_status(client, seed_orders):
+    seed_orders(2, status=OrderStatus.PLACED)
+
+    response = client.patch(f"/orders/status/{OrderStatus.CANCELED.value}", json={"order_ids": [1, 2, 3]})
+
+    assert response.json() == {"transitioned": [1, 2], "rejected": [3]}
+
+
+def test_bulk_status_transition_size_is_bounded(client):
+    order_ids = list(range(1, settings.ORDERS_BATCH_MAX_SIZE + 2))
+
+    response = client.patch(f"/orders/status/{OrderStatus.CANCELED.value}", json={"order_ids": order_ids})
+
+    assert response.status_code == 400
+
+
+
+def test_stats_follow_creation_and_transitions(client, count_statements):
+    client.post("/orders/batch", json=[order() for _ in range(4)])
+    client.patch(
+        f"/orders/status/{OrderStatus.CONFIRMED.value}",
+        json={"order_ids": [1, 2, 3], "expected_status": OrderStatus.PLACED.value},
+    )
+    client.patch(f"/orders/1/status/{OrderStatus.CANCELED.value}")
+
+    with count_statements() as counter:
+        response = client.get("/orders/stats")
+
+    assert response.status_code == 200
+    assert counter.count == 1
+    stats = response.json()
+    assert stats["total"] == 4
+    assert stats["counts"][OrderStatus.PLACED.value] == 1
+    assert stats["counts"][OrderStatus.CONFIRMED.value] == 2
+    assert stats["counts"][OrderStatus.CANCELED.value] == 1
+    assert stats["counts"][OrderStatus.DELIVERED.value] == 0
+
+
+def test_stats_rebuild_counts_orders_written_outside_the_service(client, seed_orders):
+    seed_orders(3)
+    seed_orders(2, status=OrderStatus.DELIVERED)
+
+    assert client.get("/orders/stats").json()["total"] == 0
+
+    response = client.post("/orders/stats/rebuild")
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 5
+    assert response.json()["counts"][OrderStatus.DELIVERED.value] == 2
+    assert client.get("/orders/stats").json() == response.json()
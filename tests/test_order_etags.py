@@ -0,0 +1,77 @@
+from app.adapters.api.etags import etag_matches
+from app.domain.entities.order import OrderStatus
+
+
+def test_unchanged_order_poll_is_one_query_and_no_body(client, seed_orders, count_statements):
+    seed_orders(1, items_per_order=2)
+    etag = client.get("/orders/1").headers["ETag"]
+
+    with count_statements() as counter:
+        response = client.get("/orders/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    [statement] = counter.statements
+    assert "order_items" not in statement
+
+
+def test_order_etag_changes_with_the_order(client, seed_orders):
+    seed_orders(1)
+    etag = client.get("/orders/1").headers["ETag"]
+
+    client.patch(f"/orders/1/status/{OrderStatus.CONFIRMED.value}")
+    response = client.get("/orders/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == OrderStatus.CONFIRMED.value
+    assert response.headers["ETag"] != etag
+
+
+def test_conditional_get_of_a_missing_order_is_not_found(client):
+    response = client.get("/orders/1", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+
+
+def test_unchanged_listing_poll_skips_the_items(client, seed_orders, count_statements):
+    seed_orders(3, items_per_order=2)
+    etag = client.get("/orders/", params={"limit": 2}).headers["ETag"]
+
+    with count_statements() as counter:
+        response = client.get("/orders/", params={"limit": 2}, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    [statement] = counter.statements
+    assert "order_items" not in statement
+
+
+def test_listing_etag_changes_when_an_order_on_the_page_does(client, seed_orders):
+    seed_orders(3)
+    listing = client.get(f"/orders/status/{OrderStatus.PLACED.value}")
+
+    client.patch(f"/orders/2/status/{OrderStatus.CONFIRMED.value}")
+    response = client.get(
+        f"/orders/status/{OrderStatus.PLACED.value}", headers={"If-None-Match": listing.headers["ETag"]}
+    )
+
+    assert response.status_code == 200
+    assert [order["id"] for order in response.json()] == [1, 3]
+    assert response.headers["ETag"] != listing.headers["ETag"]
+
+
+def test_projections_share_the_listing_etag_without_returning_updated_at(client, seed_orders):
+    seed_orders(2)
+    full = client.get("/orders/customer/1")
+    projected = client.get("/orders/customer/1", params={"fields": "status"})
+
+    assert projected.json() == [{"id": 1, "status": OrderStatus.PLACED.value}]
+    assert projected.headers["ETag"] == full.headers["ETag"]
+
+
+def test_etag_matching_follows_if_none_match():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
@@ -0,0 +1,76 @@
+from app.adapters.api.order_router import NEXT_CURSOR_HEADER
+from app.domain.entities.order import OrderStatus
+
+
+def test_fields_are_pushed_down_into_the_select(client, seed_orders, count_statements):
+    seed_orders(3, items_per_order=2)
+
+    with count_statements() as counter:
+        response = client.get("/orders/", params={"fields": "id,status,updated_at"})
+
+    assert response.status_code == 200
+    assert [set(order) for order in response.json()] == [{"id", "status", "updated_at"}] * 3
+    assert response.json()[0]["status"] == OrderStatus.PLACED.value
+    [statement] = counter.statements
+    assert "orders.total" not in statement and "order_items" not in statement
+
+
+def test_listing_without_items_skips_the_items_query(client, seed_orders, count_statements):
+    seed_orders(3, items_per_order=2)
+
+    with count_statements() as counter:
+        response = client.get("/orders/", params={"include_items": "false"})
+
+    assert counter.count == 1
+    assert set(response.json()[0]) == {
+        "id", "customer_id", "status", "payment_status", "total", "created_at", "updated_at"
+    }
+    assert response.json()[0]["total"] == "10.00"
+
+
+def test_projected_items_are_loaded_in_one_query(client, seed_orders, count_statements):
+    seed_orders(3, items_per_order=2)
+
+    with count_statements() as counter:
+        response = client.get("/orders/", params={"fields": "id,items"})
+
+    assert counter.count == 2
+    assert [[item["product_id"] for item in order["items"]] for order in response.json()] == [[1, 2]] * 3
+
+
+def test_projected_pages_keep_the_cursor(client, seed_orders):
+    seed_orders(5)
+
+    first = client.get("/orders/", params={"limit": 3, "fields": "status"})
+    second = client.get(
+        "/orders/", params={"limit": 3, "fields": "status", "cursor": first.headers[NEXT_CURSOR_HEADER]}
+    )
+
+    assert [order["id"] for order in first.json() + second.json()] == [1, 2, 3, 4, 5]
+    assert NEXT_CURSOR_HEADER not in second.headers
+
+
+def test_status_and_customer_listings_accept_projections(client, seed_orders):
+    seed_orders(2, status=OrderStatus.PREPARING)
+    seed_orders(4)
+
+    by_status = client.get(f"/orders/status/{OrderStatus.PREPARING.value}", params={"fields": "id"})
+    by_customer = client.get("/orders/customer/1", params={"include_items": "false", "fields": "id,items"})
+
+    assert by_status.json() == [{"id": 1}, {"id": 2}]
+    assert by_customer.json() == [{"id": 1}, {"id": 3}, {"id": 6}]
+
+
+def test_unknown_fields_are_rejected(client):
+    response = client.get("/orders/", params={"fields": "id,secret"})
+
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
+
+
+def test_listings_are_documented_as_projections(client):
+    paths = client.app.openapi()["paths"]
+
+    for path in ("/orders/", "/orders/status/{status_name}", "/orders/customer/{customer_id}"):
+        schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["items"] == {"$ref": "#/components/schemas/OrderSummary"}
@@ -5,9 +5,10 @@ from fastapi.testclient import TestClient
 from decimal import Decimal
 from datetime import datetime
 
-from app.adapters.api.order_router import router, get_order_use_cases
-from app.domain.entities.order import Order, OrderDb, OrderItem, OrderStatus, PaymentStatus
+from app.adapters.api.order_router import router, get_order_use_cases, get_service_client
+from app.domain.entities.order import Order, OrderCursor, OrderDb, OrderItem, OrderPage, OrderStatus, PaymentStatus
 from app.adapters.repositories import RepositoryType
+from app.config import settings
 
 # Helper to override dependencies
 class UseCasesOverride:
@@ -28,19 +29,19 @@ def mock_order_item_repo():
 
 @pytest.fixture
 def mock_service_client():
-    with patch("app.adapters.api.order_router.ServiceClient") as mock:
-        client = mock.return_value
-        client.get_customer = AsyncMock()
-        client.get_products = AsyncMock()
-        client.update_product_quantity = AsyncMock()
-        client.notify_payment_service = AsyncMock()
-        yield client
+    client = MagicMock()
+    client.get_customer = AsyncMock()
+    client.get_products = AsyncMock()
+    client.update_product_quantities = AsyncMock()
+    client.notify_payment_service = AsyncMock()
+    return client
 
 @pytest.fixture
-def app_with_overrides(mock_order_repo, mock_order_item_repo):
+def app_with_overrides(mock_order_repo, mock_order_item_repo, mock_service_client):
     app = FastAPI()
     app.include_router(router, prefix="/orders", tags=["orders"])
     app.dependency_overrides[get_order_use_cases] = UseCasesOverride(mock_order_repo, mock_order_item_repo)
+    app.dependency_overrides[get_service_client] = lambda: mock_service_client
     return app
 
 @pytest.fixture
@@ -56,11 +57,40 @@ def test_get_all_orders(client, mock_order_repo):
             total=Decimal("25.98"), created_at=now, updated_at=now
         )
     ]
-    mock_order_repo.get_all.return_value = orders
+    mock_order_repo.get_page.return_value = OrderPage(items=orders)
     response = client.get("/orders/")
     assert response.status_code == 200
     assert len(response.json()) == 1
     assert response.json()[0]["id"] == 1
+    assert "X-Next-Cursor" not in response.headers
+    mock_order_repo.get_page.assert_called_once_with(50, None, None)
+
+def test_get_all_orders_next_page(client, mock_order_repo):
+    now = datetime.now()
+    orders = [
+        OrderDb(
+            id=1, customer_id=1, status=OrderStatus.PLACED,
+            payment_status=PaymentStatus.PENDING, items=[],
+            total=Decimal("25.98"), created_at=now, updated_at=now
+        )
+    ]
+    next_cursor = OrderCursor(created_at=now, id=1)
+    mock_order_repo.get_page.return_value = OrderPage(items=orders, next_cursor=next_cursor)
+    cursor = OrderCursor(created_at=now, id=0)
+    response = client.get("/orders/", params={"limit": 1, "cursor": cursor.encode()})
+    assert response.status_code == 200
+    assert response.headers["X-Next-Cursor"] == next_cursor.encode()
+    mock_order_repo.get_page.assert_called_once_with(1, cursor, None)
+
+def test_get_all_orders_invalid_cursor(client, mock_order_repo):
+    response = client.get("/orders/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.json()["detail"]
+    mock_order_repo.get_page.assert_not_called()
+
+def test_get_all_orders_limit_out_of_range(client, mock_order_repo):
+    response = client.get("/orders/", params={"limit": 0})
+    assert response.status_code == 422
 
 def test_get_order_by_id(client, mock_order_repo):
     now = datetime.now().isoformat()
@@ -89,11 +119,20 @@ def test_get_orders_by_status(client, mock_order_repo):
             total=Decimal("25.98"), created_at=now, updated_at=now
         )
     ]
-    mock_order_repo.get_by_status.return_value = orders
+    mock_order_repo.get_page.return_value = OrderPage(items=orders)
     response = client.get(f"/orders/status/{OrderStatus.PLACED.value}")
     assert response.status_code == 200
     assert len(response.json()) == 1
     assert response.json()[0]["id"] == 1
+    mock_order_repo.get_page.assert_called_once_with(50, None, OrderStatus.PLACED)
+
+def test_get_customer_orders(client, mock_order_repo):
+    mock_order_repo.get_by_customer.return_value = OrderPage(items=[])
+    response = client.get("/orders/customer/7", params={"limit": 5})
+    assert response.status_code == 200
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
+    mock_order_repo.get_by_customer.assert_called_once_with(7, 5, None)
 
 @pytest.mark.asyncio
 async def test_create_order_success(client, mock_order_repo, mock_service_client):
@@ -121,9 +160,8 @@ async def test_create_order_success(client, mock_order_repo, mock_service_client
         assert response.json()["id"] == 1
         assert response.json()["total"] == "27.97"
         mock_service_client.get_customer.assert_called_once_with(1)
-        mock_service_client.get_products.assert_called_once_with([1, 2])
-        mock_service_client.update_product_quantity.assert_any_call(1, -2)
-        mock_service_client.update_product_quantity.assert_any_call(2, -1)
+        mock_service_client.get_products.assert_called_once_with([1, 2], max_age=settings.PRODUCT_STOCK_MAX_AGE)
+        mock_service_client.update_product_quantities.assert_called_once_with([(1, -2), (2, -1)])
         mock_service_client.notify_payment_service.assert_called_once_with(1, 27.97)
 
 @pytest.mark.asyncio
@@ -190,13 +228,27 @@ def test_update_payment_status(client, mock_order_repo):
         payment_status=PaymentStatus.APPROVED, items=[],
         total=Decimal("25.98"), created_at=now, updated_at=now
     )
-    mock_order_repo.update_payment_status.return_value = updated_order
+    mock_order_repo.transition_payment_status.return_value = updated_order
     response = client.patch(f"/orders/1/payment-status/{PaymentStatus.APPROVED.value}")
     assert response.status_code == 200
     assert response.json()["payment_status"] == PaymentStatus.APPROVED.value
+    mock_order_repo.get_by_id.assert_not_called()
 
 def test_update_payment_status_not_found(client, mock_order_repo):
-    mock_order_repo.update_payment_status.return_value = None
+    mock_order_repo.transition_payment_status.return_value = None
+    mock_order_repo.get_by_id.return_value = None
     response = client.patch(f"/orders/999/payment-status/{PaymentStatus.APPROVED.value}")
     assert response.status_code == 404
-    assert "Order with ID 999 not found" in response.json()["detail"] 
\ No newline at end of file
+    assert "Order with ID 999 not found" in response.json()["detail"]
+
+def test_update_payment_status_conflict(client, mock_order_repo):
+    now = datetime.now().isoformat()
+    mock_order_repo.transition_payment_status.return_value = None
+    mock_order_repo.get_by_id.return_value = OrderDb(
+        id=1, customer_id=1, status=OrderStatus.CONFIRMED,
+        payment_status=PaymentStatus.APPROVED, items=[],
+        total=Decimal("25.98"), created_at=now, updated_at=now
+    )
+    response = client.patch(f"/orders/1/payment-status/{PaymentStatus.DENIED.value}")
+    assert response.status_code == 409
+    assert "from Approved to Denied" in response.json()["detail"]
@@ -4,19 +4,23 @@ from decimal import Decimal
 from datetime import datetime
 
 from app.application.use_cases.order_use_cases import OrderUseCases
-from app.domain.entities.order import Order, OrderDb, OrderItem, OrderItemDb, OrderStatus, PaymentStatus
+from app.domain.entities.order import InvalidTransitionError, Order, OrderDb, OrderItem, OrderItemDb, OrderStatus, PaymentStatus
 from app.domain.interfaces.order_repository import OrderRepository
 from app.domain.interfaces.order_item_repository import OrderItemRepository
+from app.domain.interfaces.unit_of_work import UnitOfWork
 
 
 class TestOrderUseCases:
     def setup_method(self):
         self.mock_order_repo = MagicMock(spec=OrderRepository)
         self.mock_order_item_repo = MagicMock(spec=OrderItemRepository)
+        self.mock_unit_of_work = MagicMock(spec=UnitOfWork)
+        self.mock_unit_of_work.__enter__.return_value = self.mock_unit_of_work
         
         self.use_cases = OrderUseCases(
             order_repository=self.mock_order_repo,
-            order_item_repository=self.mock_order_item_repo
+            order_item_repository=self.mock_order_item_repo,
+            unit_of_work=self.mock_unit_of_work
         )
 
     def test_get_all_orders(self):
@@ -108,9 +112,22 @@ class TestOrderUseCases:
         
         result = self.use_cases.create_order(order, product_prices)
         
-        self.mock_order_repo.create.assert_called_once_with(order)
+        # The total is computed up front and written with the order in one commit
+        self.mock_order_repo.create.assert_called_once_with(order, Decimal("27.97"))
         self.mock_order_item_repo.create_many.assert_called_once_with(1, order_items)
-        self.mock_order_repo.update_total.assert_called_once()
+        self.mock_order_repo.update_total.assert_not_called()
+        self.mock_unit_of_work.commit.assert_called_once()
+        assert result.items == created_items
+        
+    def test_create_order_failure_is_not_committed(self):
+        order = Order(customer_id=1, items=[OrderItem(product_id=1, quantity=2)])
+        self.mock_order_repo.create.side_effect = RuntimeError("insert failed")
+        
+        with pytest.raises(RuntimeError):
+            self.use_cases.create_order(order, {1: Decimal("10.99")})
+        
+        self.mock_unit_of_work.commit.assert_not_called()
+        self.mock_unit_of_work.__exit__.assert_called_once()
         
     def test_update_order_status(self):
         now = datetime.utcnow()
@@ -135,27 +152,37 @@ class TestOrderUseCases:
         order_id = 1
         new_payment_status = PaymentStatus.APPROVED
         
-        existing_order = OrderDb(
-            id=order_id, customer_id=1, status=OrderStatus.PLACED,
-            payment_status=PaymentStatus.PENDING, items=[],
-            total=Decimal("25.98"), created_at=now, updated_at=now
-        )
-        
         updated_order = OrderDb(
             id=order_id, customer_id=1, status=OrderStatus.CONFIRMED,
             payment_status=new_payment_status, items=[],
             total=Decimal("25.98"), created_at=now, updated_at=now
         )
         
-        self.mock_order_repo.get_by_id.return_value = existing_order
-        self.mock_order_repo.update_payment_status.return_value = updated_order
-        self.mock_order_repo.update_status.return_value = updated_order
+        self.mock_order_repo.transition_payment_status.return_value = updated_order
         
         result = self.use_cases.update_payment_status(order_id, new_payment_status)
         
         assert result.payment_status == new_payment_status
-        self.mock_order_repo.update_status.assert_called_once_with(order_id, OrderStatus.CONFIRMED)
-        self.mock_order_repo.update_payment_status.assert_called_once_with(order_id, new_payment_status)
+        # Both columns change in one conditional write, with no read before it
+        self.mock_order_repo.transition_payment_status.assert_called_once_with(
+            order_id,
+            new_payment_status,
+            [PaymentStatus.PENDING, PaymentStatus.UNKNOWN, PaymentStatus.APPROVED],
+            (OrderStatus.PLACED, OrderStatus.CONFIRMED)
+        )
+        self.mock_order_repo.get_by_id.assert_not_called()
+        
+    def test_update_payment_status_conflict(self):
+        now = datetime.utcnow()
+        self.mock_order_repo.transition_payment_status.return_value = None
+        self.mock_order_repo.get_by_id.return_value = OrderDb(
+            id=1, customer_id=1, status=OrderStatus.CONFIRMED,
+            payment_status=PaymentStatus.APPROVED, items=[],
+            total=Decimal("25.98"), created_at=now, updated_at=now
+        )
+        
+        with pytest.raises(InvalidTransitionError):
+            self.use_cases.update_payment_status(1, PaymentStatus.DENIED)
         
     def test_add_item_to_order(self):
         now = datetime.utcnow()
@@ -0,0 +1,311 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.http.service_client import ServiceClient
+from app.adapters.models.sql.outbox_model import OutboxModel
+from app.adapters.outbox import worker as worker_module
+from app.adapters.outbox.worker import OutboxWorker
+from app.adapters.repositories.async_sql_order_item_repository import AsyncSQLOrderItemRepository
+from app.adapters.repositories.async_sql_order_repository import AsyncSQLOrderRepository
+from app.adapters.repositories.async_sql_outbox_repository import AsyncSQLOutboxRepository
+from app.adapters.repositories.async_sql_unit_of_work import AsyncSQLUnitOfWork
+from app.adapters.repositories.sql_order_item_repository import SQLOrderItemRepository
+from app.adapters.repositories.sql_order_repository import SQLOrderRepository
+from app.adapters.repositories.sql_outbox_repository import SQLOutboxRepository
+from app.adapters.repositories.sql_unit_of_work import SQLUnitOfWork
+from app.application.use_cases.async_order_use_cases import AsyncOrderUseCases
+from app.application.use_cases.order_use_cases import OrderUseCases
+from app.config import settings
+from app.domain.entities.order import Order, OrderItem
+from app.domain.entities.outbox import OutboxKind, OutboxMessage, OutboxStatus
+
+PRICES = {1: Decimal("10.00"), 2: Decimal("5.50")}
+
+
+def stock_message(product_id, quantity_change):
+    return OutboxMessage(
+        kind=OutboxKind.STOCK_UPDATE,
+        payload={"product_id": product_id, "quantity_change": quantity_change}
+    )
+
+
+def payment_message(order_id, total):
+    return OutboxMessage(
+        kind=OutboxKind.PAYMENT_NOTIFICATION,
+        payload={"order_id": order_id, "total": total}
+    )
+
+
+@pytest.fixture
+def outbox(db_session):
+    return SQLOutboxRepository(db_session)
+
+
+@pytest.fixture
+def service_client():
+    client = MagicMock()
+    client.send_product_quantity_change = AsyncMock(return_value=httpx.Response(200))
+    client.send_payment_notification = AsyncMock(return_value=httpx.Response(201))
+    return client
+
+
+@pytest.fixture
+def http_client():
+    return MagicMock()
+
+
+@pytest.fixture
+def http_worker(outbox, http_client):
+    # Delivers through a real ServiceClient, so downstream outcomes are classified as in production
+    @asynccontextmanager
+    async def scope():
+        yield outbox
+
+    return OutboxWorker(ServiceClient(http_client), scope, max_attempts=10, backoff_base=0, backoff_max=0)
+
+
+def sent(send):
+    # The request arguments of each send, without the idempotency key
+    return [send_call.args[:-1] for send_call in send.await_args_list]
+
+
+@pytest.fixture
+def worker(outbox, service_client):
+    @asynccontextmanager
+    async def scope():
+        yield outbox
+
+    return OutboxWorker(service_client, scope, batch_size=10, max_attempts=2, backoff_base=1, backoff_max=10)
+
+
+def test_create_order_stores_side_effects_with_the_order(db_session):
+    use_cases = OrderUseCases(
+        SQLOrderRepository(db_session),
+        SQLOrderItemRepository(db_session),
+        SQLUnitOfWork(db_session),
+        SQLOutboxRepository(db_session)
+    )
+    order = Order(customer_id=1, items=[
+        OrderItem(product_id=1, quantity=2), OrderItem(product_id=2, quantity=1), OrderItem(product_id=1, quantity=1)
+    ])
+
+    created = use_cases.create_order(order, PRICES)
+
+    messages = db_session.query(OutboxModel).order_by(OutboxModel.id).all()
+    assert [(message.kind, message.payload) for message in messages] == [
+        (OutboxKind.STOCK_UPDATE, {"product_id": 1, "quantity_change": -3}),
+        (OutboxKind.STOCK_UPDATE, {"product_id": 2, "quantity_change": -1}),
+        (OutboxKind.PAYMENT_NOTIFICATION, {"order_id": created.id, "total": "35.50"}),
+    ]
+
+
+def test_failed_outbox_write_rolls_back_the_order(db_session):
+    outbox = MagicMock()
+    outbox.add_many.side_effect = RuntimeError("outbox unavailable")
+    use_cases = OrderUseCases(
+        SQLOrderRepository(db_session), SQLOrderItemRepository(db_session), SQLUnitOfWork(db_session), outbox
+    )
+
+    with pytest.raises(RuntimeError):
+        use_cases.create_order(Order(customer_id=1, items=[OrderItem(product_id=1, quantity=1)]), PRICES)
+
+    assert use_cases.get_all_orders() == []
+
+
+def test_claim_leases_due_messages_oldest_first(outbox, db_session):
+    outbox.add_many([stock_message(product_id, -1) for product_id in range(1, 4)])
+
+    first = outbox.claim(2, lease_seconds=60)
+    second = outbox.claim(2, lease_seconds=60)
+
+    assert [message.payload["product_id"] for message in first] == [1, 2]
+    assert [message.attempts for message in first] == [1, 1]
+    # Leased messages are not handed out again while the lease runs
+    assert [message.payload["product_id"] for message in second] == [3]
+    assert outbox.claim(2, lease_seconds=60) == []
+
+
+def test_retry_later_and_mark_failed(outbox, db_session):
+    outbox.add_many([stock_message(1, -1), stock_message(2, -1)])
+    retried, failed = outbox.claim(2, lease_seconds=60)
+
+    outbox.retry_later(retried.id, datetime.utcnow() - timedelta(seconds=1), "timeout")
+    outbox.mark_failed(failed.id, "rejected")
+
+    [claimed] = outbox.claim(2, lease_seconds=60)
+    assert claimed.id == retried.id
+    assert claimed.attempts == 2
+    stored = db_session.get(OutboxModel, failed.id)
+    assert (stored.status, stored.last_error) == (OutboxStatus.FAILED, "rejected")
+
+
+@pytest.mark.asyncio
+async def test_worker_delivers_batch_and_deletes_messages(worker, outbox, service_client, db_session):
+    outbox.add_many([stock_message(1, -2), payment_message(7, "25.50"), stock_message(2, -1)])
+
+    assert await worker.dispatch_once() == 3
+
+    assert sent(service_client.send_product_quantity_change) == [(1, -2), (2, -1)]
+    assert sent(service_client.send_payment_notification) == [(7, 25.5)]
+    assert db_session.query(OutboxModel).count() == 0
+    assert await worker.dispatch_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_sends_the_message_id_as_idempotency_key(http_worker, http_client, outbox, db_session):
+    http_client.patch = AsyncMock(side_effect=[httpx.Response(503), httpx.Response(200)])
+    outbox.add_many([stock_message(1, -2)])
+    message_id = db_session.query(OutboxModel).one().id
+
+    await http_worker.dispatch_once()
+    await http_worker.dispatch_once()
+
+    # A resend carries the key of the first attempt, so the service can recognise it
+    assert [send_call.kwargs["headers"] for send_call in http_client.patch.await_args_list] == [
+        {"Idempotency-Key": f"outbox-{message_id}"}
+    ] * 2
+    assert db_session.query(OutboxModel).count() == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("outcome", [
+    httpx.ReadTimeout("timed out"),
+    httpx.RemoteProtocolError("connection dropped"),
+    httpx.Response(500),
+    httpx.Response(504),
+])
+async def test_worker_does_not_resend_a_stock_update_that_may_have_applied(http_worker, http_client, outbox, db_session, outcome):
+    http_client.patch = AsyncMock(
+        **({"return_value": outcome} if isinstance(outcome, httpx.Response) else {"side_effect": outcome})
+    )
+    outbox.add_many([stock_message(1, -2)])
+
+    await http_worker.dispatch_once()
+    assert await http_worker.dispatch_once() == 0
+
+    http_client.patch.assert_awaited_once()
+    stored = db_session.query(OutboxModel).one()
+    db_session.refresh(stored)
+    assert (stored.status, stored.attempts) == (OutboxStatus.FAILED, 1)
+    assert stored.last_error.startswith("Stock update for product 1 failed")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("outcome", [
+    httpx.ConnectError("connection refused"),
+    httpx.ConnectTimeout("connect timed out"),
+    httpx.Response(503),
+    httpx.Response(409),
+])
+async def test_worker_resends_a_stock_update_that_was_not_applied(http_worker, http_client, outbox, db_session, outcome):
+    http_client.patch = AsyncMock(side_effect=[outcome, httpx.Response(200)])
+    outbox.add_many([stock_message(1, -2)])
+
+    await http_worker.dispatch_once()
+    await http_worker.dispatch_once()
+
+    assert http_client.patch.await_count == 2
+    assert db_session.query(OutboxModel).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_backs_off_then_gives_up(worker, outbox, service_client, db_session):
+    service_client.send_product_quantity_change.return_value = httpx.Response(503)
+    outbox.add_many([stock_message(1, -2)])
+
+    before = datetime.utcnow()
+    await worker.dispatch_once()
+    stored = db_session.query(OutboxModel).one()
+    db_session.refresh(stored)
+    assert stored.status == OutboxStatus.PENDING
+    assert before <= stored.available_at <= before + timedelta(seconds=2)
+    assert stored.last_error == "Stock update for product 1 failed: HTTP 503"
+
+    stored.available_at = before
+    db_session.commit()
+    await worker.dispatch_once()
+    db_session.refresh(stored)
+    # max_attempts reached: kept for inspection, never claimed again
+    assert (stored.status, stored.attempts) == (OutboxStatus.FAILED, 2)
+    assert await worker.dispatch_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_keeps_a_raising_send_to_its_own_message(worker, outbox, service_client, db_session):
+    def send_product_quantity_change(product_id, quantity_change, idempotency_key):
+        if product_id == 2:
+            raise TypeError("bad body")
+        return httpx.Response(200)
+
+    service_client.send_product_quantity_change.side_effect = send_product_quantity_change
+    outbox.add_many([stock_message(1, -2), stock_message(2, -1), payment_message(7, "25.50")])
+
+    await worker.dispatch_once()
+
+    # The others were delivered and deleted; the raising one may have been sent, so it is not resent
+    [stored] = db_session.query(OutboxModel).all()
+    db_session.refresh(stored)
+    assert stored.payload == {"product_id": 2, "quantity_change": -1}
+    assert (stored.status, stored.attempts) == (OutboxStatus.FAILED, 1)
+    assert stored.last_error == "Stock update for product 2 failed: TypeError('bad body')"
+    assert sent(service_client.send_product_quantity_change) == [(1, -2), (2, -1)]
+    assert sent(service_client.send_payment_notification) == [(7, 25.5)]
+    assert await worker.dispatch_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_a_claim_in_progress(sql_engine, service_client, monkeypatch):
+    in_claim, release = threading.Event(), threading.Event()
+
+    def block(conn, cursor, statement, parameters, context, executemany):
+        in_claim.set()
+        release.wait(5)
+
+    monkeypatch.setattr(worker_module, "SessionLocal", sessionmaker(autoflush=False, bind=sql_engine))
+    monkeypatch.setattr(settings, "SQL_ASYNC", False)
+    event.listen(sql_engine, "before_cursor_execute", block)
+    worker = OutboxWorker(service_client)
+    worker.start()
+    try:
+        assert await run_in_threadpool(in_claim.wait, 5)
+        stopping = asyncio.ensure_future(worker.stop())
+        await asyncio.sleep(0.05)
+        # The session is still in use by the claim's thread
+        assert not stopping.done()
+    finally:
+        release.set()
+        event.remove(sql_engine, "before_cursor_execute", block)
+
+    await asyncio.wait_for(stopping, 5)
+    assert worker._task is None
+
+
+@pytest.mark.asyncio
+async def test_async_create_orders_stores_side_effects(async_db_session):
+    outbox = AsyncSQLOutboxRepository(async_db_session)
+    use_cases = AsyncOrderUseCases(
+        AsyncSQLOrderRepository(async_db_session),
+        AsyncSQLOrderItemRepository(async_db_session),
+        AsyncSQLUnitOfWork(async_db_session),
+        outbox
+    )
+    order = Order(customer_id=1, items=[OrderItem(product_id=1, quantity=2)])
+
+    created = await use_cases.create_orders([order, order], PRICES)
+
+    messages = await outbox.claim(10, lease_seconds=60)
+    assert [(message.kind, message.payload) for message in messages] == [
+        (OutboxKind.STOCK_UPDATE, {"product_id": 1, "quantity_change": -4}),
+        (OutboxKind.PAYMENT_NOTIFICATION, {"order_id": created[0].id, "total": "20.00"}),
+        (OutboxKind.PAYMENT_NOTIFICATION, {"order_id": created[1].id, "total": "20.00"}),
+    ]
@@ -0,0 +1,150 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+import httpx
+
+from app.adapters.http.resilience import (
+    CircuitBreaker, CircuitOpenError, CircuitState, Downstream, DownstreamError, RetryBudget
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status_code):
+    result = MagicMock()
+    result.status_code = status_code
+    return result
+
+
+def make_downstream(breaker=None, retry_budget=None, max_retries=2):
+    return Downstream(
+        "products", httpx.Timeout(1.0), breaker=breaker, retry_budget=retry_budget,
+        max_retries=max_retries, backoff_base=0, backoff_max=0
+    )
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker("products", failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allow_request() is False
+
+    clock.now = 10
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request() is True
+    # Only one probe at a time while half-open
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+def test_failed_probe_reopens_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker("products", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    breaker.allow_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allow_request() is False
+    assert breaker.stats()["rejected"] == 1
+
+def test_retry_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, min_tokens=1)
+
+    assert budget.try_withdraw() is True
+    assert budget.try_withdraw() is False
+    budget.deposit()
+    budget.deposit()
+    assert budget.try_withdraw() is True
+
+@pytest.mark.asyncio
+async def test_idempotent_call_retried_on_unavailable():
+    send = AsyncMock(side_effect=[response(503), httpx.ConnectError("down"), response(200)])
+
+    result = await make_downstream().call(send, idempotent=True)
+
+    assert result.status_code == 200
+    assert send.await_count == 3
+
+@pytest.mark.asyncio
+async def test_non_idempotent_call_not_retried():
+    send = AsyncMock(side_effect=[response(503), response(200)])
+
+    result = await make_downstream().call(send)
+
+    assert result.status_code == 503
+    assert send.await_count == 1
+
+@pytest.mark.asyncio
+async def test_transport_error_raised_as_downstream_error_after_retries():
+    send = AsyncMock(side_effect=httpx.ConnectError("down"))
+
+    with pytest.raises(DownstreamError):
+        await make_downstream(retry_budget=RetryBudget(ratio=0, min_tokens=1)).call(send, idempotent=True)
+
+    # One retry allowed by the budget, not the two allowed by max_retries
+    assert send.await_count == 2
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast():
+    breaker = CircuitBreaker("products", failure_threshold=2, reset_timeout=30)
+    downstream = make_downstream(breaker=breaker, max_retries=0)
+    send = AsyncMock(return_value=response(500))
+
+    for _ in range(2):
+        await downstream.call(send, idempotent=True)
+    with pytest.raises(CircuitOpenError):
+        await downstream.call(send, idempotent=True)
+
+    assert send.await_count == 2
+    assert downstream.stats()["circuit"]["state"] == "open"
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker("products", failure_threshold=1, reset_timeout=10, clock=clock)
+    downstream = make_downstream(breaker=breaker, max_retries=0)
+    breaker.record_failure()
+    clock.now = 10
+
+    async def hang(timeout):
+        await asyncio.sleep(1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(downstream.call(hang), timeout=0.01)
+
+    # No outcome was recorded, but the next probe is let through
+    assert breaker.state == CircuitState.HALF_OPEN
+    result = await downstream.call(AsyncMock(return_value=response(200)))
+    assert result.status_code == 200
+    assert breaker.state == CircuitState.CLOSED
+
+@pytest.mark.asyncio
+async def test_cancelled_calls_do_not_open_the_breaker():
+    breaker = CircuitBreaker("products", failure_threshold=2, reset_timeout=30)
+    downstream = make_downstream(breaker=breaker, max_retries=0)
+
+    async def hang(timeout):
+        await asyncio.sleep(1)
+
+    calls = [asyncio.ensure_future(downstream.call(hang)) for _ in range(5)]
+    await asyncio.sleep(0)
+    for call in calls:
+        call.cancel()
+    await asyncio.gather(*calls, return_exceptions=True)
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.stats()["consecutive_failures"] == 0
@@ -0,0 +1,25 @@
+import json
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.adapters.api.serialization import ORDER_ADAPTER, ORDER_LIST_ADAPTER
+from app.adapters.repositories.sql_order_repository import SQLOrderRepository
+
+
+@pytest.mark.parametrize("items_per_order", [0, 2])
+def test_order_list_bytes_match_the_default_encoding(db_session, seed_orders, items_per_order):
+    seed_orders(4, items_per_order=items_per_order)
+    orders = SQLOrderRepository(db_session).get_all()
+
+    assert json.loads(ORDER_LIST_ADAPTER.dump_json(orders)) == jsonable_encoder(orders)
+
+
+def test_order_bytes_keep_decimal_totals_exact(db_session, seed_orders):
+    seed_orders(1)
+    order = SQLOrderRepository(db_session).get_by_id(1)
+
+    payload = json.loads(ORDER_ADAPTER.dump_json(order))
+
+    assert payload["total"] == "10.00"
+    assert payload == jsonable_encoder(order)
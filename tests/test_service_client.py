@@ -1,10 +1,18 @@
+import asyncio
 import pytest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import ANY, patch, AsyncMock
 import httpx
 
-from app.adapters.http.service_client import ServiceClient
+from app.adapters.http.service_client import (
+    ServiceClient, close_http_client, get_http_client, start_http_client
+)
+from app.adapters.http.cache import AsyncTTLCache
 from app.config import settings
 
+def response(status_code, json=None):
+    # Real responses, so the client is exercised against httpx's synchronous json()
+    return httpx.Response(status_code, json=json)
+
 @pytest.fixture
 def service_client():
     return ServiceClient()
@@ -12,9 +20,7 @@ def service_client():
 @pytest.mark.asyncio
 async def test_get_customer_success(service_client):
     customer_data = {"id": 1, "name": "Test Customer"}
-    mock_response = AsyncMock()
-    mock_response.status_code = 200
-    mock_response.json = AsyncMock(return_value=customer_data)
+    mock_response = response(200, customer_data)
     
     with patch("httpx.AsyncClient.get", return_value=mock_response):
         result = await service_client.get_customer(1)
@@ -22,8 +28,7 @@ async def test_get_customer_success(service_client):
 
 @pytest.mark.asyncio
 async def test_get_customer_not_found(service_client):
-    mock_response = AsyncMock()
-    mock_response.status_code = 404
+    mock_response = response(404)
     
     with patch("httpx.AsyncClient.get", return_value=mock_response):
         result = await service_client.get_customer(999)
@@ -31,8 +36,7 @@ async def test_get_customer_not_found(service_client):
 
 @pytest.mark.asyncio
 async def test_get_customer_request_error(service_client):
-    mock_response = AsyncMock()
-    mock_response.status_code = 500
+    mock_response = response(500)
     
     with patch("httpx.AsyncClient.get", return_value=mock_response):
         result = await service_client.get_customer(1)
@@ -41,9 +45,7 @@ async def test_get_customer_request_error(service_client):
 @pytest.mark.asyncio
 async def test_get_product_success(service_client):
     product_data = {"id": 1, "name": "Test Product", "price": 10.99, "quantity": 5}
-    mock_response = AsyncMock()
-    mock_response.status_code = 200
-    mock_response.json = AsyncMock(return_value=product_data)
+    mock_response = response(200, product_data)
     
     with patch("httpx.AsyncClient.get", return_value=mock_response):
         result = await service_client.get_product(1)
@@ -51,8 +53,7 @@ async def test_get_product_success(service_client):
 
 @pytest.mark.asyncio
 async def test_get_product_not_found(service_client):
-    mock_response = AsyncMock()
-    mock_response.status_code = 404
+    mock_response = response(404)
     
     with patch("httpx.AsyncClient.get", return_value=mock_response):
         result = await service_client.get_product(999)
@@ -60,8 +61,7 @@ async def test_get_product_not_found(service_client):
 
 @pytest.mark.asyncio
 async def test_get_product_request_error(service_client):
-    mock_response = AsyncMock()
-    mock_response.status_code = 500
+    mock_response = response(500)
     
     with patch("httpx.AsyncClient.get", return_value=mock_response):
         result = await service_client.get_product(1)
@@ -72,13 +72,9 @@ async def test_get_products_success(service_client):
     product_data_1 = {"id": 1, "name": "Product 1", "price": 10.99, "quantity": 5}
     product_data_2 = {"id": 2, "name": "Product 2", "price": 5.99, "quantity": 3}
     
-    mock_response_1 = AsyncMock()
-    mock_response_1.status_code = 200
-    mock_response_1.json = AsyncMock(return_value=product_data_1)
+    mock_response_1 = response(200, product_data_1)
     
-    mock_response_2 = AsyncMock()
-    mock_response_2.status_code = 200
-    mock_response_2.json = AsyncMock(return_value=product_data_2)
+    mock_response_2 = response(200, product_data_2)
     
     with patch("httpx.AsyncClient.get", side_effect=[mock_response_1, mock_response_2]):
         result = await service_client.get_products([1, 2])
@@ -88,12 +84,9 @@ async def test_get_products_success(service_client):
 async def test_get_products_partial_success(service_client):
     product_data = {"id": 1, "name": "Product 1", "price": 10.99, "quantity": 5}
     
-    mock_response_1 = AsyncMock()
-    mock_response_1.status_code = 200
-    mock_response_1.json = AsyncMock(return_value=product_data)
+    mock_response_1 = response(200, product_data)
     
-    mock_response_2 = AsyncMock()
-    mock_response_2.status_code = 404
+    mock_response_2 = response(404)
     
     with patch("httpx.AsyncClient.get", side_effect=[mock_response_1, mock_response_2]):
         result = await service_client.get_products([1, 2])
@@ -101,11 +94,9 @@ async def test_get_products_partial_success(service_client):
 
 @pytest.mark.asyncio
 async def test_get_products_all_fail(service_client):
-    mock_response_1 = AsyncMock()
-    mock_response_1.status_code = 404
+    mock_response_1 = response(404)
     
-    mock_response_2 = AsyncMock()
-    mock_response_2.status_code = 404
+    mock_response_2 = response(404)
     
     with patch("httpx.AsyncClient.get", side_effect=[mock_response_1, mock_response_2]):
         result = await service_client.get_products([1, 2])
@@ -113,8 +104,7 @@ async def test_get_products_all_fail(service_client):
 
 @pytest.mark.asyncio
 async def test_update_product_quantity_success(service_client):
-    mock_response = AsyncMock()
-    mock_response.status_code = 200
+    mock_response = response(200)
     
     with patch("httpx.AsyncClient.patch", return_value=mock_response):
         result = await service_client.update_product_quantity(1, 5)
@@ -122,8 +112,7 @@ async def test_update_product_quantity_success(service_client):
 
 @pytest.mark.asyncio
 async def test_update_product_quantity_failure(service_client):
-    mock_response = AsyncMock()
-    mock_response.status_code = 400
+    mock_response = response(400)
     
     with patch("httpx.AsyncClient.patch", return_value=mock_response):
         result = await service_client.update_product_quantity(1, 5)
@@ -131,8 +120,7 @@ async def test_update_product_quantity_failure(service_client):
 
 @pytest.mark.asyncio
 async def test_update_product_quantity_request_error(service_client):
-    mock_response = AsyncMock()
-    mock_response.status_code = 500
+    mock_response = response(500)
     
     with patch("httpx.AsyncClient.patch", return_value=mock_response):
         result = await service_client.update_product_quantity(1, 5)
@@ -141,9 +129,7 @@ async def test_update_product_quantity_request_error(service_client):
 @pytest.mark.asyncio
 async def test_notify_payment_service_success(service_client):
     payment_data = {"id": 1, "order_id": 1, "amount": 25.98, "status": "Pending"}
-    mock_response = AsyncMock()
-    mock_response.status_code = 201
-    mock_response.json = AsyncMock(return_value=payment_data)
+    mock_response = response(201, payment_data)
     
     with patch("httpx.AsyncClient.post", return_value=mock_response):
         result = await service_client.notify_payment_service(1, 25.98)
@@ -151,8 +137,7 @@ async def test_notify_payment_service_success(service_client):
 
 @pytest.mark.asyncio
 async def test_notify_payment_service_failure(service_client):
-    mock_response = AsyncMock()
-    mock_response.status_code = 400
+    mock_response = response(400)
     
     with patch("httpx.AsyncClient.post", return_value=mock_response):
         result = await service_client.notify_payment_service(1, 25.98)
@@ -160,9 +145,142 @@ async def test_notify_payment_service_failure(service_client):
 
 @pytest.mark.asyncio
 async def test_notify_payment_service_request_error(service_client):
-    mock_response = AsyncMock()
-    mock_response.status_code = 500
+    mock_response = response(500)
     
     with patch("httpx.AsyncClient.post", return_value=mock_response):
         result = await service_client.notify_payment_service(1, 25.98)
-        assert result is None 
\ No newline at end of file
+        assert result is None 
+
+@pytest.mark.asyncio
+async def test_get_products_runs_concurrently_within_limit(service_client):
+    in_flight = 0
+    peak = 0
+
+    async def slow_get(url, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return response(200, {"id": int(url.rsplit("/", 1)[1])})
+
+    with patch.object(settings, "DOWNSTREAM_CONCURRENCY_LIMIT", 3), \
+            patch("httpx.AsyncClient.get", side_effect=slow_get):
+        result = await service_client.get_products([1, 2, 3, 4, 5, 6, 1])
+
+    assert sorted(result) == [1, 2, 3, 4, 5, 6]
+    assert peak == 3
+
+@pytest.mark.asyncio
+async def test_get_products_drops_timed_out_lookups(service_client):
+    async def get(url, timeout, **kwargs):
+        # The products read timeout is the only bound on a lookup
+        assert timeout.read == settings.PRODUCTS_READ_TIMEOUT
+        if url.endswith("/2"):
+            raise httpx.ReadTimeout("timed out")
+        return response(200, {"id": 1})
+
+    with patch("httpx.AsyncClient.get", side_effect=get):
+        result = await service_client.get_products([1, 2])
+
+    assert list(result) == [1]
+
+@pytest.mark.asyncio
+async def test_update_product_quantities(service_client):
+    success = response(200)
+    failure = response(400)
+
+    with patch("httpx.AsyncClient.patch", side_effect=[success, failure]) as mock_patch:
+        result = await service_client.update_product_quantities([(1, -2), (2, -1)])
+
+    assert result == [True, False]
+    assert mock_patch.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_customers_deduplicates_lookups(service_client):
+    found = response(200, {"id": 1})
+    missing = response(404)
+
+    with patch("httpx.AsyncClient.get", side_effect=[found, missing]) as mock_get:
+        result = await service_client.get_customers([1, 2, 1, 1])
+
+    assert result == {1: {"id": 1}}
+    assert mock_get.call_count == 2
+
+@pytest.mark.asyncio
+async def test_uses_injected_http_client():
+    http_client = AsyncMock(spec=httpx.AsyncClient)
+    mock_response = response(200, {"id": 1})
+    http_client.get.return_value = mock_response
+
+    result = await ServiceClient(http_client).get_customer(1)
+
+    assert result == {"id": 1}
+    http_client.get.assert_called_once_with(
+        f"{settings.CUSTOMERS_SERVICE_URL}/api/v1/customers/1", timeout=ANY
+    )
+
+@pytest.mark.asyncio
+async def test_shared_http_client_lifecycle():
+    await close_http_client()
+    await start_http_client()
+    shared = get_http_client()
+
+    assert ServiceClient().client is shared
+    assert ServiceClient().client is ServiceClient().client
+
+    await close_http_client()
+    assert shared.is_closed
+
+@pytest.mark.asyncio
+async def test_get_products_served_from_cache():
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    client = ServiceClient(product_cache=cache)
+    mock_response = response(200, {"id": 1})
+
+    with patch("httpx.AsyncClient.get", return_value=mock_response) as mock_get:
+        await client.get_products([1])
+        result = await client.get_products([1])
+        assert result == {1: {"id": 1}}
+        assert mock_get.call_count == 1
+
+        await client.get_products([1], max_age=0)
+        assert mock_get.call_count == 2
+
+@pytest.mark.asyncio
+async def test_update_product_quantity_invalidates_cache():
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    client = ServiceClient(product_cache=cache)
+    await cache.get(1, AsyncMock(return_value={"id": 1}))
+    mock_response = response(200)
+
+    with patch("httpx.AsyncClient.patch", return_value=mock_response):
+        await client.update_product_quantity(1, -1)
+
+    assert cache.stats()["size"] == 0
+
+@pytest.mark.asyncio
+async def test_get_customer_cached_including_not_found():
+    cache = AsyncTTLCache(maxsize=10, ttl=60, negative_ttl=30)
+    client = ServiceClient(customer_cache=cache)
+    found = response(200, {"id": 1})
+    not_found = response(404)
+
+    with patch("httpx.AsyncClient.get", side_effect=[found, not_found]) as mock_get:
+        assert await client.get_customer(1) == {"id": 1}
+        assert await client.get_customer(999) is None
+        assert await client.get_customer(1) == {"id": 1}
+        assert await client.get_customer(999) is None
+        assert mock_get.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_customer_errors_not_cached():
+    cache = AsyncTTLCache(maxsize=10, ttl=60, negative_ttl=30)
+    client = ServiceClient(customer_cache=cache)
+    error = response(503)
+    found = response(200, {"id": 1})
+
+    with patch("httpx.AsyncClient.get", side_effect=[httpx.ConnectError("down"), error, found]):
+        assert await client.get_customer(1) is None
+        assert await client.get_customer(1) is None
+        assert await client.get_customer(1) == {"id": 1}
@@ -0,0 +1,189 @@
+from decimal import Decimal
+
+import pytest
+
+from app.adapters.repositories.sql_order_item_repository import SQLOrderItemRepository, insert_order_items
+from app.adapters.repositories.sql_order_repository import SQLOrderRepository, insert_orders
+from app.adapters.repositories.sql_unit_of_work import SQLUnitOfWork
+from app.application.use_cases.order_use_cases import OrderUseCases
+from app.domain.entities.order import InvalidTransitionError, Order, OrderItem, OrderStatus, PaymentStatus
+
+
+def test_get_page_walks_all_orders_in_keyset_order(db_session, seed_orders):
+    seed_orders(7)
+    repository = SQLOrderRepository(db_session)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        page = repository.get_page(3, cursor)
+        pages += 1
+        seen.extend(order.id for order in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert pages == 3
+    assert seen == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_get_page_exact_multiple_has_no_trailing_cursor(db_session, seed_orders):
+    seed_orders(4)
+    repository = SQLOrderRepository(db_session)
+
+    page = repository.get_page(4)
+
+    assert len(page.items) == 4
+    assert page.next_cursor is None
+
+
+def test_get_page_filters_by_status(db_session, seed_orders):
+    seed_orders(3, status=OrderStatus.PLACED)
+    seed_orders(2, status=OrderStatus.PREPARING)
+    repository = SQLOrderRepository(db_session)
+
+    page = repository.get_page(10, status=OrderStatus.PREPARING)
+
+    assert [order.id for order in page.items] == [4, 5]
+    assert all(order.status == OrderStatus.PREPARING for order in page.items)
+
+
+def test_get_by_customer_pages_through_one_customers_orders(db_session, seed_orders):
+    # seed_orders assigns customers 1, 2, 3 in turn
+    seed_orders(9)
+    repository = SQLOrderRepository(db_session)
+
+    first = repository.get_by_customer(2, 2)
+    second = repository.get_by_customer(2, 2, first.next_cursor)
+
+    assert [order.id for order in first.items] == [2, 5]
+    assert [order.id for order in second.items] == [8]
+    assert second.next_cursor is None
+    assert all(order.customer_id == 2 for order in first.items + second.items)
+
+
+def test_create_order_writes_order_items_and_total_together(db_session):
+    use_cases = OrderUseCases(
+        SQLOrderRepository(db_session), SQLOrderItemRepository(db_session), SQLUnitOfWork(db_session)
+    )
+    order = Order(customer_id=1, items=[OrderItem(product_id=1, quantity=2), OrderItem(product_id=2, quantity=1)])
+
+    created = use_cases.create_order(order, {1: Decimal("10.00"), 2: Decimal("5.50")})
+    db_session.expire_all()
+    stored = use_cases.get_order_by_id(created.id)
+
+    assert created.total == stored.total == Decimal("25.50")
+    assert [item.id for item in created.items] == [item.id for item in stored.items]
+
+
+def test_unit_of_work_rolls_back_uncommitted_writes(db_session):
+    repository = SQLOrderRepository(db_session)
+
+    with pytest.raises(RuntimeError):
+        with SQLUnitOfWork(db_session):
+            repository.create(Order(customer_id=1, items=[]), Decimal("10.00"))
+            raise RuntimeError("item insert failed")
+
+    assert repository.get_all() == []
+
+
+def test_create_many_returns_items_in_input_order(db_session, count_statements):
+    order = SQLOrderRepository(db_session).create(Order(customer_id=1, items=[]))
+    items = [OrderItem(product_id=product_id, quantity=product_id) for product_id in range(1, 21)]
+
+    with count_statements() as counter:
+        created = SQLOrderItemRepository(db_session).create_many(order.id, items)
+
+    # SQLite cannot batch an INSERT ... RETURNING in parameter order, so rows go one by one
+    assert counter.count == 20
+    assert all(statement.startswith("INSERT INTO order_items") for statement in counter.statements)
+    assert [item.product_id for item in created] == list(range(1, 21))
+    assert all(item.created_at is not None for item in created)
+
+
+def test_update_status_returns_updated_order_with_items(db_session, seed_orders):
+    seed_orders(1, items_per_order=2)
+    repository = SQLOrderRepository(db_session)
+
+    updated = repository.update_status(1, OrderStatus.PREPARING)
+
+    assert updated.status == OrderStatus.PREPARING
+    assert len(updated.items) == 2
+    assert repository.get_by_id(1).status == OrderStatus.PREPARING
+
+
+def test_writes_that_cannot_move_the_status_skip_the_counters(db_session, seed_orders, count_statements):
+    seed_orders(1, items_per_order=2)
+    repository = SQLOrderRepository(db_session)
+
+    with count_statements() as counter:
+        repository.update_total(1, Decimal("12.00"))
+        repository.update_payment_status(1, PaymentStatus.DENIED)
+    # UPDATE ... RETURNING and the items for each write
+    assert counter.count == 4
+    assert not any("order_status_counts" in statement for statement in counter.statements)
+
+    with count_statements() as counter:
+        repository.update_status(1, OrderStatus.PLACED)
+    # Re-setting the current status locks it but leaves the counters alone
+    assert counter.count == 3
+
+
+def test_guarded_transition_that_cannot_apply_locks_nothing(db_session, seed_orders, count_statements):
+    seed_orders(1)
+    repository = SQLOrderRepository(db_session)
+    repository.update_payment_status(1, PaymentStatus.DENIED)
+
+    with count_statements() as counter:
+        transitioned = repository.transition_payment_status(
+            1, PaymentStatus.APPROVED, [PaymentStatus.PENDING], (OrderStatus.PLACED, OrderStatus.CONFIRMED)
+        )
+    assert transitioned is None
+    # The guard is part of the locking SELECT, which matches no row: no UPDATE follows
+    [statement] = counter.statements
+    assert statement.startswith("SELECT") and "payment_status" in statement
+
+
+def test_update_status_missing_order_returns_none(db_session):
+    assert SQLOrderRepository(db_session).update_status(404, OrderStatus.PREPARING) is None
+
+
+def test_payment_approval_confirms_placed_order_once(db_session, seed_orders):
+    seed_orders(1)
+    use_cases = OrderUseCases(SQLOrderRepository(db_session), SQLOrderItemRepository(db_session))
+
+    approved = use_cases.update_payment_status(1, PaymentStatus.APPROVED)
+    redelivered = use_cases.update_payment_status(1, PaymentStatus.APPROVED)
+
+    assert approved.status == redelivered.status == OrderStatus.CONFIRMED
+    assert redelivered.payment_status == PaymentStatus.APPROVED
+
+
+def test_payment_transition_conflict_leaves_order_unchanged(db_session, seed_orders):
+    seed_orders(1)
+    use_cases = OrderUseCases(SQLOrderRepository(db_session), SQLOrderItemRepository(db_session))
+    use_cases.update_payment_status(1, PaymentStatus.DENIED)
+
+    with pytest.raises(InvalidTransitionError):
+        use_cases.update_payment_status(1, PaymentStatus.APPROVED)
+
+    order = use_cases.get_order_by_id(1)
+    assert (order.status, order.payment_status) == (OrderStatus.PLACED, PaymentStatus.DENIED)
+
+
+def test_payment_approval_keeps_status_past_placed(db_session, seed_orders):
+    seed_orders(1, status=OrderStatus.PREPARING)
+
+    order = SQLOrderRepository(db_session).transition_payment_status(
+        1, PaymentStatus.APPROVED, [PaymentStatus.PENDING], (OrderStatus.PLACED, OrderStatus.CONFIRMED)
+    )
+
+    assert (order.status, order.payment_status) == (OrderStatus.PREPARING, PaymentStatus.APPROVED)
+
+
+
+def test_bulk_inserts_return_rows_in_parameter_order():
+    # Batched as one statement where the dialect can guarantee the order, e.g. PostgreSQL
+    for statement in (insert_orders(), insert_order_items()):
+        assert statement._sort_by_parameter_order
@@ -0,0 +1,112 @@
+"""
+Query plans of the SQL repository methods.
+
+Every statement a repository method sends is run again through SQLite's
+EXPLAIN QUERY PLAN; reads and writes on orders and order_items must go
+through an index instead of scanning the table, and pages must come out of
+an index in order instead of being sorted.
+"""
+import re
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.adapters.repositories.sql_order_item_repository import SQLOrderItemRepository
+from app.adapters.repositories.sql_order_repository import SQLOrderRepository
+from app.adapters.repositories.sql_outbox_repository import SQLOutboxRepository
+from app.domain.entities.order import (
+    AnalyticsGroup, AnalyticsInterval, OrderCursor, OrderStatus, PaymentStatus
+)
+
+# "SCAN orders" reads the whole table; "SCAN orders USING INDEX ..." walks an index in order
+FULL_SCAN = re.compile(r"^SCAN (orders|order_items|outbox)$")
+SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+CURSOR = OrderCursor(created_at=datetime(2024, 1, 1, 0, 10), id=20)
+
+
+@pytest.fixture
+def explain_plans(sql_engine, db_session, seed_orders):
+    seed_orders(50, items_per_order=2)
+
+    def _explain(call):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and not statement.lstrip().upper().startswith("INSERT"):
+                statements.append((statement, parameters))
+
+        event.listen(sql_engine, "before_cursor_execute", record)
+        try:
+            call()
+        finally:
+            event.remove(sql_engine, "before_cursor_execute", record)
+
+        with sql_engine.connect() as connection:
+            return [
+                [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                for statement, parameters in statements
+            ]
+
+    return _explain
+
+
+@pytest.mark.parametrize("name, call", [
+    ("get_by_id", lambda orders, items, outbox: orders.get_by_id(7)),
+    ("get_version", lambda orders, items, outbox: orders.get_version(7)),
+    ("get_by_status", lambda orders, items, outbox: orders.get_by_status(OrderStatus.PLACED)),
+    ("get_page", lambda orders, items, outbox: orders.get_page(10)),
+    ("get_page after cursor", lambda orders, items, outbox: orders.get_page(10, CURSOR)),
+    ("get_page by status", lambda orders, items, outbox: orders.get_page(10, None, OrderStatus.PLACED)),
+    ("get_page by status after cursor", lambda orders, items, outbox: orders.get_page(10, CURSOR, OrderStatus.PLACED)),
+    ("get_by_customer", lambda orders, items, outbox: orders.get_by_customer(2, 10)),
+    ("get_by_customer after cursor", lambda orders, items, outbox: orders.get_by_customer(2, 10, CURSOR)),
+    ("get_summary_page with items", lambda orders, items, outbox: orders.get_summary_page(
+        frozenset({"status", "items"}), 10, CURSOR, OrderStatus.PLACED
+    )),
+    ("get_summary_page by customer", lambda orders, items, outbox: orders.get_summary_page(
+        frozenset({"updated_at"}), 10, None, None, 2
+    )),
+    ("update_status", lambda orders, items, outbox: orders.update_status(7, OrderStatus.CONFIRMED)),
+    ("update_status_many", lambda orders, items, outbox: orders.update_status_many(
+        [3, 4, 5], OrderStatus.CONFIRMED, OrderStatus.PLACED
+    )),
+    ("transition_payment_status", lambda orders, items, outbox: orders.transition_payment_status(
+        7, PaymentStatus.APPROVED, [PaymentStatus.PENDING], (OrderStatus.PLACED, OrderStatus.CONFIRMED)
+    )),
+    ("update_total", lambda orders, items, outbox: orders.update_total(7, 12)),
+    ("items get_by_order_id", lambda orders, items, outbox: items.get_by_order_id(7)),
+    ("items delete", lambda orders, items, outbox: items.delete(5)),
+    ("outbox claim", lambda orders, items, outbox: outbox.claim(10, 60)),
+])
+def test_repository_method_uses_indexes(name, call, db_session, explain_plans):
+    repositories = (
+        SQLOrderRepository(db_session), SQLOrderItemRepository(db_session), SQLOutboxRepository(db_session)
+    )
+
+    plans = explain_plans(lambda: call(*repositories))
+
+    assert plans
+    for plan in plans:
+        assert not [step for step in plan if FULL_SCAN.match(step)], plan
+        assert SORT not in plan, plan
+
+
+def test_get_all_only_scans_orders(db_session, explain_plans):
+    # Listing every order reads the whole table by definition; its items are still found by index
+    orders_plan, items_plan = explain_plans(SQLOrderRepository(db_session).get_all)
+
+    assert orders_plan == ["SCAN orders"]
+    assert not [step for step in items_plan if FULL_SCAN.match(step)], items_plan
+
+
+def test_analytics_reads_an_index_range(db_session, explain_plans):
+    # The temp B-trees group and order the buckets, not the rows of the table
+    [plan] = explain_plans(lambda: SQLOrderRepository(db_session).get_analytics(
+        datetime(2024, 1, 1), datetime(2024, 1, 2), AnalyticsInterval.HOUR, AnalyticsGroup.STATUS
+    ))
+
+    assert plan[0] == "SEARCH orders USING INDEX ix_orders_created_at_id (created_at>? AND created_at<?)"
+    assert "SEARCH order_items USING INDEX ix_order_items_order_id (order_id=?)" in plan
+    assert not [step for step in plan if FULL_SCAN.match(step)], plan
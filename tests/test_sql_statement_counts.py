@@ -0,0 +1,98 @@
+"""
+Statement budgets for the order endpoints on the SQL repositories.
+
+Each test seeds enough orders that an N+1 access pattern would blow the
+budget, then asserts the exact number of statements a request emits.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.adapters.api.order_router import get_service_client
+from app.domain.entities.order import OrderStatus, PaymentStatus
+
+ORDER_COUNT = 20
+
+
+@pytest.fixture
+def mock_service_client():
+    client = MagicMock()
+    client.get_customer = AsyncMock(return_value={"id": 1})
+    client.get_products = AsyncMock(return_value={
+        1: {"id": 1, "name": "Product 1", "price": 10.0, "quantity": 10},
+        2: {"id": 2, "name": "Product 2", "price": 5.0, "quantity": 10},
+    })
+    client.update_product_quantities = AsyncMock(return_value=[True, True])
+    client.notify_payment_service = AsyncMock(return_value={})
+    return client
+
+
+@pytest.fixture
+def sql_app(sql_app, seed_orders, mock_service_client):
+    seed_orders(ORDER_COUNT, items_per_order=3)
+    sql_app.dependency_overrides[get_service_client] = lambda: mock_service_client
+    return sql_app
+
+
+def test_list_orders_statement_count(client, count_statements):
+    with count_statements() as counter:
+        response = client.get("/orders/", params={"limit": ORDER_COUNT})
+    assert response.status_code == 200
+    assert len(response.json()) == ORDER_COUNT
+    # One SELECT for the orders and one SELECT ... IN for all of their items
+    assert counter.count == 2
+
+
+def test_list_orders_by_status_statement_count(client, count_statements):
+    with count_statements() as counter:
+        response = client.get(f"/orders/status/{OrderStatus.PLACED.value}")
+    assert response.status_code == 200
+    assert len(response.json()) == ORDER_COUNT
+    assert counter.count == 2
+
+
+def test_get_order_statement_count(client, count_statements):
+    with count_statements() as counter:
+        response = client.get("/orders/1")
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+    assert counter.count == 2
+
+
+def test_update_order_status_statement_count(client, count_statements):
+    with count_statements() as counter:
+        response = client.patch(f"/orders/1/status/{OrderStatus.PREPARING.value}")
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+    # UPDATE ... RETURNING and SELECT items for the response, plus what a status
+    # change costs for the counters: the current status locked before the write and
+    # one UPDATE moving the order between status counters after it. Writes that
+    # cannot move the status (total, plain payment status) stay at two statements
+    assert counter.count == 4
+
+
+def test_update_payment_status_statement_count(client, count_statements):
+    with count_statements() as counter:
+        response = client.patch(f"/orders/1/payment-status/{PaymentStatus.APPROVED.value}")
+    assert response.status_code == 200
+    assert response.json()["status"] == OrderStatus.CONFIRMED.value
+    # Current status locked for the counters, one conditional UPDATE ... RETURNING
+    # for both columns, SELECT items, then the status counters
+    assert counter.count == 4
+
+
+def test_create_order_statement_count(client, count_statements):
+    order_data = {
+        "customer_id": 1,
+        "items": [
+            {"product_id": 1, "quantity": 2},
+            {"product_id": 2, "quantity": 1},
+        ]
+    }
+    with count_statements() as counter:
+        response = client.post("/orders/", json=order_data)
+    assert response.status_code == 201
+    assert len(response.json()["items"]) == 2
+    # Order insert with its total, status counter, the items (one INSERT each on
+    # SQLite, which cannot batch them in parameter order) and one outbox insert,
+    # committed once
+    assert counter.count == 5